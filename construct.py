@@ -1,27 +1,130 @@
+import time
+_STARTUP_STARTED = time.perf_counter()
 import logging
 import sys
 import os
-import requests
-import validators
-import chardet
 import importlib.util
+import codecs
+import mmap
+import json
+import struct
+import hashlib
+import zlib
+import threading
+import subprocess
+import socket
+import getpass
+import tempfile
+import queue
+import uuid
+from concurrent.futures import ThreadPoolExecutor, wait, FIRST_COMPLETED
+import re
+import bisect
+import heapq
+import itertools
+from array import array
+from collections import Counter
 from functools import partial
 import shutil
 from PyQt5.QtWidgets import (QApplication, QMainWindow, QAction,
                              QFileDialog, QMessageBox, QStatusBar, QDialog, QInputDialog,
                              QVBoxLayout, QLabel, QLineEdit, QPushButton, QHBoxLayout, QComboBox,
-                             QDockWidget, QTreeView, QToolBar, QSizePolicy, QMenu, QWidget, QFileSystemModel, QStyle, QTabWidget, QTextEdit, QScrollBar)
-from PyQt5.QtCore import QThread, pyqtSignal, Qt, QSettings, QSignalBlocker, QSize, QTimer
-from PyQt5.QtGui import QIcon, QFont, QFontDatabase, QTextDocument
-from PyQt5.Qsci import QsciScintilla, QsciScintillaBase
+                             QDockWidget, QTreeView, QToolBar, QSizePolicy, QMenu, QWidget, QFileSystemModel, QStyle, QTabWidget, QTextEdit, QScrollBar, QCheckBox,
+                             QTreeWidget, QTreeWidgetItem)
+from PyQt5.QtCore import QThread, pyqtSignal, Qt, QSettings, QSignalBlocker, QSize, QTimer, QStandardPaths, QIdentityProxyModel, QFileSystemWatcher, QEventLoop, QLockFile, QObject
+from PyQt5.QtGui import QIcon, QFont, QFontDatabase, QTextDocument, QColor
+from PyQt5.QtNetwork import QLocalServer, QLocalSocket
+from PyQt5.Qsci import QsciScintilla, QsciScintillaBase, QsciDocument
 from PyQt5 import Qsci as _Qsci
-import termqt
-from termqt import Terminal
-import urllib.parse
 try:
-    import git as _gitpy
-except Exception:
-    _gitpy = None
+    from PyQt5 import sip
+except ImportError:
+    import sip
+import urllib.parse
+
+
+
+_GIT_MODULE = []
+
+
+def git_module():
+    if not _GIT_MODULE:
+        try:
+            import git
+        except Exception:
+            git = None
+        _GIT_MODULE.append(git)
+    return _GIT_MODULE[0]
+
+
+_ZSTD_MODULE = []
+
+
+def zstd_module():
+    if not _ZSTD_MODULE:
+        try:
+            import zstandard
+        except Exception:
+            zstandard = None
+        _ZSTD_MODULE.append(zstandard)
+    return _ZSTD_MODULE[0]
+
+
+
+class StartupProfiler:
+    def __init__(self, started):
+        self.enabled = False
+        self.started = started
+        self.last = started
+        self.seen = set()
+
+    def mark(self, phase, once=False):
+        if not self.enabled or (once and phase in self.seen):
+            return
+        self.seen.add(phase)
+        now = time.perf_counter()
+        print(f"[startup] {phase:<16} {(now - self.last) * 1000:8.1f} ms  (total {(now - self.started) * 1000:8.1f} ms)")
+        self.last = now
+
+
+STARTUP_PROFILER = StartupProfiler(_STARTUP_STARTED)
+
+
+
+def instance_server_name():
+    try:
+        user = getpass.getuser()
+    except Exception:
+        user = os.environ.get('USERNAME') or os.environ.get('USER') or 'user'
+    tag = hashlib.sha1(user.encode('utf-8', errors='replace')).hexdigest()[:12]
+    if os.name == 'nt':
+        return f"construct-{tag}"
+    return os.path.join(tempfile.gettempdir(), f"construct-{tag}.sock")
+
+
+def parse_file_argument(arg):
+    if os.path.exists(arg):
+        return os.path.abspath(arg), None
+    match = re.match(r'^(.*?):(\d+)(?::\d+)?$', arg)
+    if match and match.group(1):
+        return os.path.abspath(match.group(1)), int(match.group(2))
+    return os.path.abspath(arg), None
+
+
+def forward_to_instance(name, entries):
+    message = (json.dumps({"files": entries}) + "\n").encode('utf-8')
+    try:
+        if os.name == 'nt':
+            with open('\\\\.\\pipe\\' + name, 'wb', buffering=0) as pipe:
+                pipe.write(message)
+        else:
+            with socket.socket(socket.AF_UNIX, socket.SOCK_STREAM) as sock:
+                sock.settimeout(0.5)
+                sock.connect(name)
+                sock.sendall(message)
+        return True
+    except OSError:
+        return False
 
 
 
@@ -84,6 +187,143 @@ QsciLexerYAML        = _qsci_get('QsciLexerYAML', 'QsciLexerYaml')
 
 
 
+class LexerRegistry:
+    MODELINE = re.compile(rb'-\*-\s*(?:.*?mode:\s*)?([\w+#-]+?)\s*(?:;.*?)?-\*-|\b(?:vim?|ex):.*?\b(?:ft|filetype|syntax)=([\w+#-]+)', re.IGNORECASE)
+
+    def __init__(self):
+        self.languages = {"Plain Text": None}
+        self.names = {}
+        self.by_extension = {}
+        self.by_filename = {}
+        self.by_alias = {}
+        self._fonts = {}
+
+    def add(self, name, classes, extensions=(), filenames=(), aliases=()):
+        if not isinstance(classes, tuple):
+            classes = (classes,)
+        cls = next((c for c in classes if c), None)
+        if cls is None:
+            return
+        self.languages[name] = cls
+        self.names.setdefault(cls, name)
+        for ext in extensions:
+            self.by_extension.setdefault(ext, cls)
+        for filename in filenames:
+            self.by_filename.setdefault(filename, cls)
+        for alias in (name.lower(), *(ext.lstrip('.') for ext in extensions), *aliases):
+            self.by_alias.setdefault(alias, cls)
+
+    def language_names(self):
+        return ["Plain Text"] + sorted(n for n in self.languages if n != "Plain Text")
+
+    def name_of(self, lexer):
+        if lexer is None:
+            return "Plain Text"
+        return self.names.get(type(lexer), "Plain Text")
+
+    def for_path(self, path_like):
+        base = os.path.basename(path_like).lower() if path_like else ""
+        stem, ext = os.path.splitext(base)
+        if ext in COMPRESSION_EXTENSIONS:
+            base = stem
+        cls = self.by_filename.get(base)
+        if cls is None and base:
+            cls = self.by_extension.get(os.path.splitext(base)[1])
+        return cls
+
+    def sniff(self, head):
+        if isinstance(head, str):
+            head = head.encode('utf-8', errors='replace')
+        head = head[:1024].lstrip(b'\xef\xbb\xbf')
+        first = head.split(b'\n', 1)[0].strip()
+        if first.startswith(b'#!'):
+            words = first[2:].split()
+            if words and os.path.basename(words[0]) == b'env':
+                words = [w for w in words[1:] if not w.startswith(b'-')]
+            if words:
+                interpreter = os.path.basename(words[0]).decode('ascii', errors='replace').lower()
+                cls = self.by_alias.get(interpreter) or self.by_alias.get(interpreter.rstrip('0123456789.'))
+                if cls is not None:
+                    return cls
+        for line in head.split(b'\n')[:2] + head.split(b'\n')[-3:]:
+            match = self.MODELINE.search(line)
+            if match:
+                alias = (match.group(1) or match.group(2)).decode('ascii', errors='replace').lower()
+                cls = self.by_alias.get(alias)
+                if cls is not None:
+                    return cls
+        if head.lstrip().startswith(b'<?xml'):
+            return self.by_alias.get('xml')
+        return None
+
+    def font_for(self, base):
+        key = base.key()
+        font = self._fonts.get(key)
+        if font is None:
+            font = QFont(base)
+            font.setBold(False)
+            font.setItalic(False)
+            self._fonts[key] = font
+        return font
+
+    def create(self, cls, editor):
+        lexer = cls(editor)
+        font = self.font_for(getattr(editor, 'preferred_font', None) or editor.font())
+        lexer.setDefaultFont(font)
+        lexer.setFont(font)
+        return lexer
+
+
+LEXERS = LexerRegistry()
+LEXERS.add("Python", QsciLexerPython, ('.py', '.pyw'), aliases=('python2', 'python3', 'pypy', 'pypy3'))
+LEXERS.add("C++", QsciLexerCPP, ('.c', '.h', '.cpp', '.hpp', '.cc', '.cxx', '.hh', '.hxx'), aliases=('c', 'c++'))
+LEXERS.add("C#", QsciLexerCSharp, ('.cs',), aliases=('csharp',))
+LEXERS.add("Java", QsciLexerJava, ('.java',))
+LEXERS.add("JavaScript", QsciLexerJavaScript, ('.js', '.jsx', '.ts', '.tsx'), aliases=('node', 'nodejs', 'deno', 'typescript'))
+LEXERS.add("JSON", (QsciLexerJSON, QsciLexerJavaScript), ('.json',))
+LEXERS.add("HTML", QsciLexerHTML, ('.html', '.htm'))
+LEXERS.add("CSS", QsciLexerCSS, ('.css',))
+LEXERS.add("Lua", QsciLexerLua, ('.lua',), aliases=('luajit',))
+LEXERS.add("SQL", QsciLexerSQL, ('.sql',))
+LEXERS.add("Ruby", QsciLexerRuby, ('.rb',))
+LEXERS.add("Pascal", QsciLexerPascal, ('.pas', '.pp'), aliases=('delphi',))
+LEXERS.add("Perl", QsciLexerPerl, ('.pl', '.pm', '.t'), aliases=('cperl',))
+LEXERS.add("Makefile", QsciLexerMakefile, ('.mak',), ('makefile', 'gnumakefile'), aliases=('make',))
+LEXERS.add("CMake", QsciLexerCMake, ('.cmake',), ('cmakelists.txt',))
+LEXERS.add("Markdown", QsciLexerMarkdown, ('.md', '.markdown'))
+LEXERS.add("Bash", QsciLexerBash, ('.sh', '.bash', '.zsh'), aliases=('sh', 'zsh', 'ksh', 'dash', 'shell-script'))
+LEXERS.add("Batch", QsciLexerBatch, ('.bat', '.cmd'), aliases=('dosbatch',))
+LEXERS.add("Diff", QsciLexerDiff, ('.diff', '.patch'))
+LEXERS.add("ASM", QsciLexerASM, ('.asm',))
+LEXERS.add("MASM", QsciLexerMASM, ('.masm',))
+LEXERS.add("NASM", QsciLexerNASM, ('.nasm',))
+LEXERS.add("AVS", QsciLexerAVS, ('.avs',))
+LEXERS.add("CoffeeScript", QsciLexerCoffeeScript, ('.coffee',))
+LEXERS.add("D", QsciLexerD, ('.d',))
+LEXERS.add("EDIFACT", QsciLexerEDIFACT, ('.edi', '.edifact'))
+LEXERS.add("Fortran", QsciLexerFortran, ('.f90', '.f95', '.f03', '.f08'))
+LEXERS.add("Fortran77", (QsciLexerFortran77, QsciLexerFortran), ('.f', '.for', '.f77'))
+LEXERS.add("Hex", QsciLexerHex, ('.hex',))
+LEXERS.add("Intel Hex", QsciLexerIntelHex, ('.ihex', '.ihx'))
+LEXERS.add("S-Record", QsciLexerSRec, ('.srec', '.s19', '.s28', '.s37'))
+LEXERS.add("Tektronix Hex", QsciLexerTekHex, ('.tek', '.tekhex'))
+LEXERS.add("IDL", QsciLexerIDL, ('.idl',))
+LEXERS.add("Matlab", (QsciLexerMatlab, QsciLexerOctave), ('.matlab', '.m'))
+LEXERS.add("Octave", QsciLexerOctave, ('.octave',))
+LEXERS.add("PO", QsciLexerPO, ('.po',))
+LEXERS.add("POV", QsciLexerPOV, ('.pov',))
+LEXERS.add("PostScript", QsciLexerPostScript, ('.ps', '.eps'))
+LEXERS.add("Properties", QsciLexerProperties, ('.properties',), aliases=('conf-javaprop',))
+LEXERS.add("Spice", QsciLexerSpice, ('.sp', '.cir', '.ckt', '.spice'))
+LEXERS.add("TCL", QsciLexerTCL, ('.tcl',), aliases=('tclsh', 'wish'))
+LEXERS.add("TeX", QsciLexerTeX, ('.tex',), aliases=('latex',))
+LEXERS.add("Verilog", QsciLexerVerilog, ('.v', '.sv'))
+LEXERS.add("VHDL", QsciLexerVHDL, ('.vhd', '.vhdl'))
+LEXERS.add("XML", QsciLexerXML, ('.xml',), aliases=('nxml',))
+LEXERS.add("YAML", QsciLexerYAML, ('.yaml', '.yml'))
+
+
+
 def detect_newline(sample: bytes) -> str:
     crlf = sample.count(b"\r\n")
     tmp = sample.replace(b"\r\n", b"")
@@ -99,41 +339,939 @@ def detect_newline(sample: bytes) -> str:
 
 
 
-class FileHandler(QThread):
+COMPRESSION_MAGIC = (
+    (re.compile(rb'\x1f\x8b'), 'gzip'),
+    (re.compile(rb'BZh[1-9](?:1AY&SY|\x17rE8P\x90)'), 'bz2'),
+    (re.compile(rb'\xfd7zXZ\x00'), 'xz'),
+    (re.compile(rb'\x28\xb5\x2f\xfd'), 'zstd'),
+)
+COMPRESSION_EXTENSIONS = {'.gz': 'gzip', '.bz2': 'bz2', '.xz': 'xz', '.zst': 'zstd'}
+
+
+def compression_format(path):
+    try:
+        with open(path, 'rb') as f:
+            head = f.read(10)
+    except OSError:
+        return None
+    for magic, name in COMPRESSION_MAGIC:
+        if magic.match(head):
+            return name
+    return None
+
+
+def compression_for_extension(path):
+    return COMPRESSION_EXTENSIONS.get(os.path.splitext(path)[1].lower())
+
+
+def open_decompressed(file, compression):
+    if compression == 'gzip':
+        import gzip
+        return gzip.GzipFile(fileobj=file, mode='rb')
+    if compression == 'bz2':
+        import bz2
+        return bz2.BZ2File(file, 'rb')
+    if compression == 'xz':
+        import lzma
+        return lzma.LZMAFile(file, 'rb')
+    if compression == 'zstd':
+        zstandard = zstd_module()
+        if zstandard is None:
+            raise RuntimeError("Zstandard support requires the 'zstandard' package.")
+        return zstandard.ZstdDecompressor().stream_reader(file, read_across_frames=True)
+    raise ValueError(f"Unknown compression: {compression}")
+
+
+def open_compressed(file, compression):
+    if compression == 'gzip':
+        import gzip
+        return gzip.GzipFile(fileobj=file, mode='wb')
+    if compression == 'bz2':
+        import bz2
+        return bz2.BZ2File(file, 'wb')
+    if compression == 'xz':
+        import lzma
+        return lzma.LZMAFile(file, 'wb')
+    if compression == 'zstd':
+        zstandard = zstd_module()
+        if zstandard is None:
+            raise RuntimeError("Zstandard support requires the 'zstandard' package.")
+        return zstandard.ZstdCompressor().stream_writer(file, closefd=False)
+    raise ValueError(f"Unknown compression: {compression}")
+
+
+
+ENCODING_BOMS = (
+    (codecs.BOM_UTF32_LE, 'UTF-32'),
+    (codecs.BOM_UTF32_BE, 'UTF-32'),
+    (codecs.BOM_UTF8, 'UTF-8-SIG'),
+    (codecs.BOM_UTF16_LE, 'UTF-16'),
+    (codecs.BOM_UTF16_BE, 'UTF-16'),
+)
+UTF8_SAMPLE_SIZE = 4 * 1024 * 1024
+CHARDET_SAMPLE_SIZE = 64 * 1024
+
+
+def detect_encoding(buf) -> str:
+    head = bytes(buf[:4])
+    for bom, name in ENCODING_BOMS:
+        if head.startswith(bom):
+            return name
+    sample = buf[:utf8_boundary(buf, UTF8_SAMPLE_SIZE)]
+    if sample.isascii():
+        return 'UTF-8'
+    try:
+        sample.decode('utf-8')
+        return 'UTF-8'
+    except UnicodeDecodeError:
+        pass
+    from chardet.universaldetector import UniversalDetector
+    detector = UniversalDetector()
+    limit = min(len(buf), CHARDET_SAMPLE_SIZE)
+    for start in range(0, limit, 1024):
+        detector.feed(buf[start:min(start + 1024, limit)])
+        if detector.done:
+            break
+    detector.close()
+    encoding = detector.result['encoding'] or 'utf-8'
+    if encoding.lower() == 'ascii':
+        encoding = 'UTF-8'
+    return encoding
+
+
+class EncodingCache:
+    max_entries = 4096
+
+    def __init__(self):
+        self.path = None
+        self.entries = None
+        self.dirty = False
+        self._lock = threading.Lock()
+
+    def _load(self):
+        if self.entries is not None:
+            return
+        self.path = os.path.join(cache_dir(), 'encodings.json')
+        try:
+            with open(self.path, 'r', encoding='utf-8') as f:
+                self.entries = dict(json.load(f))
+        except (OSError, ValueError, TypeError):
+            self.entries = {}
+
+    def get(self, path, st):
+        key = os.path.realpath(path)
+        with self._lock:
+            self._load()
+            entry = self.entries.pop(key, None)
+            if entry is None:
+                return None
+            self.entries[key] = entry
+        if entry[0] != st.st_size or entry[1] != st.st_mtime_ns:
+            return None
+        return entry[2], entry[3]
+
+    def put(self, path, st, encoding, newline):
+        key = os.path.realpath(path)
+        with self._lock:
+            self._load()
+            self.entries.pop(key, None)
+            self.entries[key] = [st.st_size, st.st_mtime_ns, encoding, newline]
+            while len(self.entries) > self.max_entries:
+                del self.entries[next(iter(self.entries))]
+            self.dirty = True
+
+    def save(self):
+        with self._lock:
+            if not self.dirty:
+                return
+            data = json.dumps(list(self.entries.items()))
+            self.dirty = False
+        tmp = self.path + '.tmp'
+        try:
+            with open(tmp, 'w', encoding='utf-8') as f:
+                f.write(data)
+            os.replace(tmp, self.path)
+        except OSError as e:
+            logging.warning("Failed to save encoding cache: %s", e)
+
+
+ENCODING_CACHE = EncodingCache()
+
+
+def detect_file_format(path, st, buf, encoding=None, newline=None):
+    if encoding and newline:
+        return encoding, newline
+    cached = ENCODING_CACHE.get(path, st)
+    if cached is not None:
+        return encoding or cached[0], newline or cached[1]
+    detected = (encoding or detect_encoding(buf), newline or detect_newline(buf[:64 * 1024]))
+    ENCODING_CACHE.put(path, st, *detected)
+    return detected
+
+
+
+def utf8_boundary(buf, pos):
+    if pos >= len(buf):
+        return len(buf)
+    back = pos
+    while back > 0 and back > pos - 3 and (buf[back] & 0xC0) == 0x80:
+        back -= 1
+    return back
+
+
+def common_prefix_length(a, b, block=64 * 1024):
+    n = min(len(a), len(b))
+    start = 0
+    while start < n:
+        end = min(start + block, n)
+        if a[start:end] != b[start:end]:
+            while end - start > 1:
+                mid = (start + end) // 2
+                if a[start:mid] == b[start:mid]:
+                    start = mid
+                else:
+                    end = mid
+            return start
+        start = end
+    return n
+
+
+def diff_span(old, new):
+    prefix = common_prefix_length(old, new)
+    if prefix == len(old) == len(new):
+        return None
+    prefix = min(utf8_boundary(old, prefix), utf8_boundary(new, prefix))
+    limit = min(len(old), len(new)) - prefix
+    suffix = min(common_prefix_length(old[prefix:][::-1], new[prefix:][::-1]), limit)
+    while suffix and ((old[len(old) - suffix] & 0xC0) == 0x80 or (new[len(new) - suffix] & 0xC0) == 0x80):
+        suffix -= 1
+    return prefix, len(old) - suffix, new[prefix:len(new) - suffix]
+
+
+
+def compile_search(text, regex=False, case_sensitive=False, whole_word=False):
+    pattern = text if regex else re.escape(text)
+    if whole_word:
+        if isinstance(pattern, bytes):
+            pattern = rb'\b(?:' + pattern + rb')\b'
+        else:
+            pattern = r'\b(?:' + pattern + r')\b'
+    flags = re.MULTILINE | (0 if case_sensitive else re.IGNORECASE)
+    return re.compile(pattern, flags)
+
+
+
+def map_file(file):
+    size = os.fstat(file.fileno()).st_size
+    if size == 0:
+        return b''
+    return mmap.mmap(file.fileno(), 0, access=mmap.ACCESS_READ)
+
+
+
+class LoadCancelled(Exception):
+    pass
+
+
+
+class PoolJob(QObject):
+    finished = pyqtSignal()
+
+    def __init__(self):
+        super().__init__()
+        self.priority = 1
+        self.started = False
+        self.cancelled = False
+        self.done = threading.Event()
+
+    def cancel(self):
+        self.cancelled = True
+
+    def isRunning(self):
+        return not self.done.is_set()
+
+    def wait(self, timeout_ms=None):
+        return self.done.wait(None if timeout_ms is None else timeout_ms / 1000)
+
+    def run(self):
+        try:
+            if not self.cancelled:
+                self._load()
+        except LoadCancelled:
+            pass
+        finally:
+            self.done.set()
+            self.finished.emit()
+
+    def _load(self):
+        pass
+
+
+
+class FileHandler(PoolJob):
     file_content_loaded = pyqtSignal(str, str, object, object)
-    file_load_started = pyqtSignal(str, object, object)
-    file_chunk_loaded = pyqtSignal(str, str, bool)
+    file_load_started = pyqtSignal(str, object, object, object)
+    file_chunk_loaded = pyqtSignal(str, object, bool)
+    file_lines_counted = pyqtSignal(str, object)
+    chunk_size = 1024 * 1024
+    max_chunks_in_flight = 8
 
-    def __init__(self, file_path):
+    def __init__(self, file_path, encoding=None, newline=None, compression=None):
         super().__init__()
         self.file_path = file_path
+        self.encoding = encoding
+        self.newline = newline
+        self.compression = compression
+        self.newlines = 0
+        self._in_flight = threading.Semaphore(self.max_chunks_in_flight)
+
+    def chunk_consumed(self):
+        self._in_flight.release()
+
+    def _load(self):
+        try:
+            with open(self.file_path, 'rb') as file:
+                st = os.fstat(file.fileno())
+                if self.compression:
+                    with open_decompressed(file, self.compression) as stream:
+                        self._stream_compressed(stream, st)
+                    self.file_chunk_loaded.emit(self.file_path, b'', True)
+                    return
+                buf = map_file(file)
+                try:
+                    self._stream(buf, st)
+                finally:
+                    if isinstance(buf, mmap.mmap):
+                        buf.close()
+            self.file_chunk_loaded.emit(self.file_path, b'', True)
+        except LoadCancelled:
+            raise
+        except Exception as e:
+            self.file_content_loaded.emit(self.file_path, f"Error reading file: {e}", None, None)
+
+    def _stream(self, buf, st):
+        encoding, newline = detect_file_format(self.file_path, st, buf, self.encoding, self.newline)
+        self.file_load_started.emit(self.file_path, encoding, newline, len(buf))
+        if codecs.lookup(encoding).name in ('utf-8', 'utf-8-sig'):
+            self._stream_utf8(buf)
+        else:
+            self._stream_decoded(buf, encoding)
+
+    def _stream_compressed(self, stream, st):
+        data = stream.read(self.chunk_size)
+        encoding, newline = detect_file_format(self.file_path, st, data, self.encoding, self.newline)
+        self.file_load_started.emit(self.file_path, encoding, newline, 0)
+        decoder = codecs.getincrementaldecoder(encoding)(errors='replace')
+        while data:
+            if self.cancelled:
+                raise LoadCancelled()
+            chunk = decoder.decode(data)
+            if chunk:
+                self._emit_chunk(chunk, chunk.count('\n'))
+            data = stream.read(self.chunk_size)
+        chunk = decoder.decode(b'', final=True)
+        if chunk:
+            self._emit_chunk(chunk, chunk.count('\n'))
+
+    def _stream_utf8(self, buf):
+        size = len(buf)
+        start = len(codecs.BOM_UTF8) if buf[:len(codecs.BOM_UTF8)] == codecs.BOM_UTF8 else 0
+        while start < size:
+            end = utf8_boundary(buf, min(start + self.chunk_size, size))
+            chunk = buf[start:end]
+            if not chunk.isascii():
+                try:
+                    chunk.decode('utf-8')
+                except UnicodeDecodeError:
+                    chunk = chunk.decode('utf-8', errors='replace').encode('utf-8')
+            self._emit_chunk(chunk, chunk.count(b'\n'))
+            start = end
+
+    def _stream_decoded(self, buf, encoding):
+        decoder = codecs.getincrementaldecoder(encoding)(errors='replace')
+        size = len(buf)
+        for start in range(0, size, self.chunk_size):
+            end = min(start + self.chunk_size, size)
+            chunk = decoder.decode(buf[start:end], final=(end == size))
+            if chunk:
+                self._emit_chunk(chunk, chunk.count('\n'))
+
+    def _emit_chunk(self, chunk, newlines):
+        while not self._in_flight.acquire(timeout=0.1):
+            if self.cancelled:
+                raise LoadCancelled()
+        if self.cancelled:
+            raise LoadCancelled()
+        self.newlines += newlines
+        self.file_chunk_loaded.emit(self.file_path, chunk, False)
+        self.file_lines_counted.emit(self.file_path, self.newlines + 1)
+
+
+
+WORD_RE = re.compile(r'\b[^\W\d]\w{2,63}\b')
+
+
+def count_words(data):
+    if isinstance(data, (bytes, bytearray)):
+        data = data.decode('utf-8', errors='replace')
+    return Counter(WORD_RE.findall(data))
+
+
+class WordIndex:
+    scan_limit = 5000
+    bulk_threshold = 64
+
+    def __init__(self):
+        self.counts = {}
+        self.keys = []
+
+    def __len__(self):
+        return len(self.keys)
+
+    def apply(self, counts, sign=1):
+        added = []
+        removed = set()
+        for word, n in counts.items():
+            old = self.counts.get(word, 0)
+            new = old + sign * n
+            if new:
+                self.counts[word] = new
+            else:
+                self.counts.pop(word, None)
+            if old <= 0 < new:
+                added.append((word.casefold(), word))
+            elif new <= 0 < old:
+                removed.add((word.casefold(), word))
+        if removed:
+            if len(removed) > self.bulk_threshold:
+                self.keys = [key for key in self.keys if key not in removed]
+            else:
+                for key in removed:
+                    i = bisect.bisect_left(self.keys, key)
+                    if i < len(self.keys) and self.keys[i] == key:
+                        del self.keys[i]
+        if added:
+            if len(added) > self.bulk_threshold:
+                self.keys.extend(added)
+                self.keys.sort()
+            else:
+                for key in added:
+                    bisect.insort(self.keys, key)
+
+    def complete(self, prefix, limit=50):
+        folded = prefix.casefold()
+        start = bisect.bisect_left(self.keys, (folded,))
+        matches = []
+        for i in range(start, min(len(self.keys), start + self.scan_limit)):
+            key, word = self.keys[i]
+            if not key.startswith(folded):
+                break
+            if word != prefix:
+                matches.append(word)
+        return heapq.nlargest(limit, matches, key=self.counts.__getitem__)
+
+
+
+class WordCountJob(PoolJob):
+    counted = pyqtSignal(object)
+    max_file_size = 1024 * 1024
+    max_files = 5000
+
+    def __init__(self, data=None, root=None):
+        super().__init__()
+        self.data = data
+        self.root = root
+
+    def _load(self):
+        if self.root is None:
+            counts = count_words(self.data)
+            self.data = None
+        else:
+            counts = Counter()
+            for n, path in enumerate(walk_project(self.root, lambda: self.cancelled)):
+                if n >= self.max_files:
+                    break
+                try:
+                    if os.path.getsize(path) > self.max_file_size:
+                        continue
+                    with open(path, 'rb') as f:
+                        data = f.read()
+                except OSError:
+                    continue
+                if b'\0' in data[:8192]:
+                    continue
+                counts.update(count_words(data))
+        if self.cancelled:
+            raise LoadCancelled()
+        self.counted.emit(counts)
+
+
+
+class LoaderPool(QObject):
+    def __init__(self, size, parent=None):
+        super().__init__(parent)
+        self._heap = []
+        self._running = set()
+        self._seq = itertools.count()
+        self._cond = threading.Condition()
+        self._stopping = False
+        self._threads = [LoaderThread(self) for _ in range(max(1, int(size)))]
+        for thread in self._threads:
+            thread.start()
+
+    def submit(self, job, priority=1):
+        with self._cond:
+            job.priority = priority
+            heapq.heappush(self._heap, (priority, next(self._seq), job))
+            self._cond.notify()
+        return job
+
+    def prioritize(self, job, priority):
+        with self._cond:
+            if job.started or job.cancelled or job.priority == priority:
+                return
+            job.priority = priority
+            heapq.heappush(self._heap, (priority, next(self._seq), job))
+
+    def cancel(self, job):
+        job.cancel()
+        with self._cond:
+            if job.started:
+                return
+            job.started = True
+            self._heap = [entry for entry in self._heap if entry[2] is not job]
+            heapq.heapify(self._heap)
+        job.done.set()
+        job.finished.emit()
+
+    def pending(self):
+        with self._cond:
+            return len({id(entry[2]) for entry in self._heap}) + len(self._running)
+
+    def take(self):
+        with self._cond:
+            while not self._stopping:
+                while self._heap:
+                    priority, _, job = heapq.heappop(self._heap)
+                    if job.started or priority != job.priority:
+                        continue
+                    job.started = True
+                    self._running.add(job)
+                    return job
+                self._cond.wait()
+            return None
+
+    def release(self, job):
+        with self._cond:
+            self._running.discard(job)
+
+    def stop(self):
+        with self._cond:
+            self._stopping = True
+            queued = [entry[2] for entry in self._heap if not entry[2].started]
+            self._heap = []
+            running = list(self._running)
+            self._cond.notify_all()
+        for job in running:
+            job.cancel()
+        for job in queued:
+            job.cancel()
+            job.done.set()
+            job.finished.emit()
+        for thread in self._threads:
+            thread.wait()
+
+
+
+class LoaderThread(QThread):
+    def __init__(self, pool):
+        super().__init__()
+        self.pool = pool
 
     def run(self):
-            detector = chardet.universaldetector.UniversalDetector()
+        while True:
+            job = self.pool.take()
+            if job is None:
+                return
             try:
-                with open(self.file_path, 'rb') as file:
-                    while chunk := file.read(1024):
-                        detector.feed(chunk)
-                        if detector.done:
-                            break
-                    detector.close()
-                encoding = detector.result['encoding'] or 'utf-8'
-                if encoding and encoding.lower() == 'ascii':
-                    encoding = 'UTF-8'
-                with open(self.file_path, 'rb') as fb:
-                    sample = fb.read(64 * 1024)
-                newline = detect_newline(sample)
-                self.file_load_started.emit(self.file_path, encoding, newline)
-                chunk_size = 1024 * 1024
-                with open(self.file_path, 'r', encoding=encoding, errors='replace', newline=None) as file:
-                    while True:
-                        chunk = file.read(chunk_size)
-                        if not chunk:
-                            break
-                        self.file_chunk_loaded.emit(self.file_path, chunk, False)
-                self.file_chunk_loaded.emit(self.file_path, '', True)
-            except Exception as e:
-                self.file_content_loaded.emit(self.file_path, f"Error reading file: {e}", None, None)
+                job.run()
+            finally:
+                self.pool.release(job)
+
+
+
+class FileSaver(QThread):
+    progress = pyqtSignal(object, object)
+    saved = pyqtSignal(str, str)
+    failed = pyqtSignal(str, str, bool)
+    chunk_size = 1024 * 1024
+
+    def __init__(self, file_path, encoding, size, address=None, data=None, compression=None):
+        super().__init__()
+        self.file_path = file_path
+        self.encoding = encoding
+        self.size = size
+        self.address = address
+        self.data = data
+        self.compression = compression
+        self.succeeded = False
+        self.encoding_error = False
+
+    def _chunks(self):
+        for start in range(0, self.size, self.chunk_size):
+            length = min(self.chunk_size, self.size - start)
+            if self.data is not None:
+                yield self.data[start:start + length]
+            else:
+                yield sip.voidptr(self.address + start, length).asstring(length)
+            self.progress.emit(start + length, self.size)
+
+    def _write(self, out):
+        codec = codecs.lookup(self.encoding).name
+        if codec in ('utf-8', 'utf-8-sig'):
+            if codec == 'utf-8-sig':
+                out.write(codecs.BOM_UTF8)
+            for chunk in self._chunks():
+                out.write(chunk)
+            return
+        decoder = codecs.getincrementaldecoder('utf-8')(errors='replace')
+        encoder = codecs.getincrementalencoder(self.encoding)()
+        for chunk in self._chunks():
+            out.write(encoder.encode(decoder.decode(chunk)))
+        out.write(encoder.encode(decoder.decode(b'', final=True), final=True))
+
+    def run(self):
+        target = os.path.realpath(self.file_path)
+        directory = os.path.dirname(target) or '.'
+        tmp = None
+        try:
+            fd, tmp = tempfile.mkstemp(prefix='.' + os.path.basename(target) + '.', suffix='.tmp', dir=directory)
+            with os.fdopen(fd, 'wb') as out:
+                if self.compression:
+                    with open_compressed(out, self.compression) as stream:
+                        self._write(stream)
+                else:
+                    self._write(out)
+                out.flush()
+                os.fsync(out.fileno())
+            if os.path.exists(target):
+                shutil.copymode(target, tmp)
+            os.replace(tmp, target)
+            tmp = None
+            if os.name != 'nt':
+                dir_fd = os.open(directory, os.O_RDONLY)
+                try:
+                    os.fsync(dir_fd)
+                finally:
+                    os.close(dir_fd)
+        except Exception as e:
+            self.encoding_error = isinstance(e, UnicodeEncodeError)
+            self.failed.emit(self.file_path, str(e), self.encoding_error)
+            return
+        finally:
+            if tmp is not None:
+                try:
+                    os.remove(tmp)
+                except OSError:
+                    pass
+        self.succeeded = True
+        self.saved.emit(self.file_path, self.encoding)
+
+
+
+class FileWatcher(QObject):
+    appended = pyqtSignal(str)
+    rewritten = pyqtSignal()
+    interval = 100
+    missing_interval = 1000
+    tail_size = 4096
+    read_limit = 4 * 1024 * 1024
+
+    def __init__(self, parent=None):
+        super().__init__(parent)
+        self.path = None
+        self.size = 0
+        self.mtime = 0
+        self.tail = b''
+        self.decoder = None
+        self.busy = lambda: False
+        self.stale = False
+        self.watcher = QFileSystemWatcher(self)
+        self.watcher.fileChanged.connect(self.schedule)
+        self.timer = QTimer(self)
+        self.timer.setSingleShot(True)
+        self.timer.timeout.connect(self.check)
+
+    def watch(self, path, encoding, size=None, tail=None):
+        self.unwatch()
+        try:
+            st = os.stat(path)
+        except OSError:
+            return
+        self.path = path
+        self.size = st.st_size if size is None else size
+        self.mtime = st.st_mtime_ns
+        self.tail = tail[-self.tail_size:] if tail is not None else self._read(max(0, self.size - self.tail_size), self.size)
+        codec = codecs.lookup(encoding or 'utf-8').name
+        self.decoder = codecs.getincrementaldecoder('utf-8' if codec == 'utf-8-sig' else codec)(errors='replace')
+        self.watcher.addPath(path)
+        if st.st_size != self.size:
+            self.schedule()
+
+    def unwatch(self):
+        self.timer.stop()
+        self.stale = False
+        if self.path is not None:
+            if self.path in self.watcher.files():
+                self.watcher.removePath(self.path)
+            self.path = None
+
+    def schedule(self, *args):
+        if self.path is not None and not self.timer.isActive():
+            self.timer.start(self.interval)
+
+    def _read(self, start, end):
+        with open(self.path, 'rb') as f:
+            f.seek(start)
+            return f.read(end - start)
+
+    def check(self):
+        if self.path is None:
+            return
+        if self.busy():
+            self.stale = True
+            return
+        self.stale = False
+        try:
+            st = os.stat(self.path)
+        except OSError:
+            self.timer.start(self.missing_interval)
+            return
+        if self.path not in self.watcher.files():
+            self.watcher.addPath(self.path)
+        if st.st_size == self.size and st.st_mtime_ns == self.mtime:
+            return
+        try:
+            grown = st.st_size > self.size and self._read(max(0, self.size - len(self.tail)), self.size) == self.tail
+            if not grown:
+                self.mtime = st.st_mtime_ns
+                self.rewritten.emit()
+                return
+            end = min(st.st_size, self.size + self.read_limit)
+            data = self._read(self.size, end)
+        except OSError:
+            self.timer.start(self.missing_interval)
+            return
+        self.size += len(data)
+        self.tail = (self.tail + data)[-self.tail_size:]
+        if self.size >= st.st_size:
+            self.mtime = st.st_mtime_ns
+        else:
+            self.schedule()
+        text = self.decoder.decode(data)
+        if text:
+            self.appended.emit(text)
+
+
+
+class LineIndex:
+    block_size = 64 * 1024
+
+    def __init__(self, buf=None):
+        self.buf = buf
+        self.block_starts = array('Q', [0])
+        self.size = 0
+        self.newlines = 0
+        self.complete = False
+
+    @property
+    def line_count(self):
+        return self.newlines + 1
+
+    def append(self, data):
+        pos = 0
+        while pos < len(data):
+            room = self.block_size - (self.size % self.block_size)
+            part = data[pos:pos + room]
+            self.newlines += part.count(b'\n')
+            self.size += len(part)
+            pos += len(part)
+            if self.size % self.block_size == 0:
+                self.block_starts.append(self.newlines)
+
+    def line_to_offset(self, line):
+        if line <= 0:
+            return 0
+        if line > self.newlines:
+            return self.size
+        block = bisect.bisect_left(self.block_starts, line) - 1
+        pos = block * self.block_size
+        for _ in range(line - self.block_starts[block]):
+            pos = self.buf.find(b'\n', pos) + 1
+        return pos
+
+    def offset_to_line(self, offset):
+        offset = max(0, min(int(offset), self.size))
+        block = min(offset // self.block_size, len(self.block_starts) - 1)
+        start = block * self.block_size
+        return self.block_starts[block] + self.buf[start:offset].count(b'\n')
+
+
+
+class LineIndexer(QThread):
+    progress = pyqtSignal(object, object)
+    chunk_size = 1024 * 1024
+
+    def __init__(self, index, buf):
+        super().__init__()
+        self.index = index
+        self.buf = buf
+        self._cancelled = False
+
+    def cancel(self):
+        self._cancelled = True
+
+    def run(self):
+        size = len(self.buf)
+        reported = 0
+        for start in range(self.index.size, size, self.chunk_size):
+            if self._cancelled:
+                return
+            self.index.append(self.buf[start:start + self.chunk_size])
+            if self.index.size - reported >= 16 * self.chunk_size:
+                reported = self.index.size
+                self.progress.emit(self.index.size, size)
+        self.index.complete = True
+        self.progress.emit(self.index.size, size)
+
+
+
+class LargeFileDocument:
+    window_bytes = 8 * 1024 * 1024
+
+    def __init__(self, path):
+        self.path = path
+        self._file = open(path, 'rb')
+        try:
+            self.buf = map_file(self._file)
+        except Exception:
+            self._file.close()
+            raise
+        self.size = len(self.buf)
+        self.encoding, self.newline = detect_file_format(path, os.fstat(self._file.fileno()), self.buf)
+        self.utf8 = codecs.lookup(self.encoding).name in ('utf-8', 'utf-8-sig')
+        self.index = LineIndex(self.buf)
+
+    def line_addressable(self):
+        try:
+            return '\n'.encode(self.encoding) == b'\n'
+        except Exception:
+            return False
+
+    def close(self):
+        if isinstance(self.buf, mmap.mmap):
+            try:
+                self.buf.close()
+            except BufferError:
+                pass
+        self._file.close()
+
+    def to_utf8(self, data):
+        if self.utf8:
+            return data
+        return data.decode(self.encoding, errors='replace').encode('utf-8')
+
+    def read_lines(self, start, count):
+        begin = self.index.line_to_offset(start)
+        limit = min(self.size, begin + self.window_bytes)
+        end = begin
+        lines = 0
+        while lines < count and end < limit:
+            nl = self.buf.find(b'\n', end, limit)
+            if nl == -1:
+                end = limit
+                break
+            end = nl + 1
+            lines += 1
+        data = self.buf[begin:end]
+        if end < self.size and data.endswith(b'\n'):
+            data = data[:-2] if data.endswith(b'\r\n') else data[:-1]
+        return self.to_utf8(data), end
+
+    def find(self, text, start, backward=False, case_sensitive=False, whole_word=False):
+        needle = text.encode(self.encoding, errors='replace')
+        if not needle:
+            return None
+        pattern = re.escape(needle)
+        if whole_word:
+            pattern = rb'\b' + pattern + rb'\b'
+        regex = re.compile(pattern, 0 if case_sensitive else re.IGNORECASE)
+        if not backward:
+            match = regex.search(self.buf, start) or regex.search(self.buf, 0, start + len(needle) - 1)
+            return (match.start(), match.end() - match.start()) if match else None
+        found = self._find_before(regex, start, len(needle))
+        if found is None:
+            found = self._find_before(regex, self.size, len(needle), stop=start)
+        return found
+
+    def _find_before(self, regex, end, length, stop=0):
+        step = 4 * 1024 * 1024
+        while end > stop:
+            low = max(stop, end - step)
+            last = None
+            for match in regex.finditer(self.buf, low, end):
+                last = match
+            if last is not None:
+                return (last.start(), last.end() - last.start())
+            end = low + length - 1 if low > stop else stop
+        return None
+
+
+
+def measure_line_widths(data, tab_width=4):
+    if b'\r' in data:
+        data = data.replace(b'\r\n', b'\n').replace(b'\r', b'\n')
+    lines = data.split(b'\n')
+    if data.isascii() and b'\t' not in data:
+        return array('I', map(len, lines))
+    widths = array('I')
+    for line in lines:
+        if line.isascii():
+            widths.append(len(line.expandtabs(tab_width)) if b'\t' in line else len(line))
+        else:
+            line = line.decode('utf-8', errors='replace')
+            widths.append(len(line.expandtabs(tab_width)) if '\t' in line else len(line))
+    return widths
+
+
+
+class LineWidthTracker:
+    def __init__(self):
+        self.reset(array('I', [0]))
+
+    def __len__(self):
+        return len(self.widths)
+
+    def reset(self, widths):
+        self.widths = widths if len(widths) else array('I', [0])
+        self.counts = Counter(self.widths)
+        self.maximum = max(self.counts)
+
+    def replace(self, first, count, widths):
+        counts = self.counts
+        for width in self.widths[first:first + count]:
+            left = counts[width] - 1
+            if left:
+                counts[width] = left
+            else:
+                del counts[width]
+        for width in widths:
+            counts[width] += 1
+        self.widths[first:first + count] = widths
+        if widths:
+            self.maximum = max(self.maximum, max(widths))
+        if self.maximum not in counts:
+            self.maximum = max(counts) if counts else 0
 
 
 
@@ -150,6 +1288,7 @@ class WebFetcher(QThread):
 
     def run(self):
         try:
+            import requests
             headers = {
                 'User-Agent': 'Construct/1.0',
                 'Accept': 'text/*, application/json'
@@ -188,6 +1327,7 @@ class WebFetcher(QThread):
                 data = b''.join(chunks)
                 encoding = resp.encoding
                 if not encoding:
+                    import chardet
                     detected = chardet.detect(data)
                     encoding = detected.get('encoding') or 'utf-8'
                 text = data.decode(encoding, errors='replace')
@@ -197,6 +1337,356 @@ class WebFetcher(QThread):
 
 
 
+class GitCancelled(Exception):
+    pass
+
+
+
+class GitJob:
+    def __init__(self, name, func, key=None, on_success=None, failure=None):
+        self.name = name
+        self.func = func
+        self.key = key
+        self.on_success = on_success
+        self.failure = failure or f"Failed: {name}"
+        self.cancelled = False
+        self.process = None
+        self._report = None
+
+    def report(self, text):
+        if self._report is not None:
+            self._report(text)
+
+    def cancel(self):
+        self.cancelled = True
+        proc = self.process
+        if proc is not None:
+            try:
+                proc.terminate()
+            except Exception:
+                pass
+
+
+
+def git_executable():
+    return getattr(getattr(git_module(), 'Git', None), 'GIT_PYTHON_GIT_EXECUTABLE', None) or 'git'
+
+
+
+def git_output(repo, *args):
+    proc = subprocess.run(
+        [git_executable(), '--no-optional-locks', *args],
+        cwd=repo.working_tree_dir,
+        stdin=subprocess.DEVNULL,
+        stdout=subprocess.PIPE,
+        stderr=subprocess.PIPE,
+        creationflags=getattr(subprocess, 'CREATE_NO_WINDOW', 0)
+    )
+    if proc.returncode != 0:
+        raise RuntimeError(proc.stderr.decode('utf-8', errors='replace').strip())
+    return proc.stdout
+
+
+
+def run_git_process(job, repo, *args):
+    proc = subprocess.Popen(
+        [git_executable(), *args],
+        cwd=repo.working_tree_dir,
+        stdin=subprocess.DEVNULL,
+        stdout=subprocess.PIPE,
+        stderr=subprocess.STDOUT,
+        creationflags=getattr(subprocess, 'CREATE_NO_WINDOW', 0)
+    )
+    job.process = proc
+    if job.cancelled:
+        proc.terminate()
+    tail = []
+    pending = b''
+    while True:
+        data = os.read(proc.stdout.fileno(), 4096)
+        if not data:
+            break
+        parts = re.split(rb'[\r\n]', pending + data)
+        pending = parts.pop()
+        for part in parts:
+            line = part.decode('utf-8', errors='replace').strip()
+            if line:
+                job.report(line)
+                tail.append(line)
+        del tail[:-50]
+    proc.stdout.close()
+    code = proc.wait()
+    job.process = None
+    if pending.strip():
+        tail.append(pending.decode('utf-8', errors='replace').strip())
+    if job.cancelled:
+        raise GitCancelled()
+    if code != 0:
+        raise RuntimeError('\n'.join(tail[-10:]) or f"git {args[0]} exited with status {code}")
+    return '\n'.join(tail)
+
+
+
+class GitWorker(QThread):
+    job_started = pyqtSignal(object)
+    job_progress = pyqtSignal(object, str)
+    job_finished = pyqtSignal(object, object)
+    job_failed = pyqtSignal(object, str)
+
+    def __init__(self):
+        super().__init__()
+        self._jobs = []
+        self._current = None
+        self._stopping = False
+        self._cond = threading.Condition()
+
+    def submit(self, job):
+        with self._cond:
+            for i, pending in enumerate(self._jobs):
+                if job.key is not None and pending.key == job.key:
+                    self._jobs[i] = job
+                    break
+            else:
+                self._jobs.append(job)
+            self._cond.notify()
+        if not self.isRunning():
+            self.start()
+        return job
+
+    def pending(self):
+        with self._cond:
+            return len(self._jobs) + (1 if self._current is not None else 0)
+
+    def cancel_all(self):
+        with self._cond:
+            jobs = self._jobs + ([self._current] if self._current is not None else [])
+            self._jobs = []
+        for job in jobs:
+            job.cancel()
+
+    def stop(self):
+        self.cancel_all()
+        with self._cond:
+            self._stopping = True
+            self._cond.notify()
+        self.wait()
+
+    def run(self):
+        while True:
+            with self._cond:
+                while not self._jobs and not self._stopping:
+                    self._cond.wait()
+                if self._stopping:
+                    return
+                job = self._jobs.pop(0)
+                self._current = job
+            job._report = lambda text, job=job: self.job_progress.emit(job, text)
+            self.job_started.emit(job)
+            try:
+                result = job.func(job)
+                if job.cancelled:
+                    raise GitCancelled()
+            except GitCancelled:
+                self.job_failed.emit(job, "")
+            except Exception as e:
+                self.job_failed.emit(job, str(e))
+            else:
+                self.job_finished.emit(job, result)
+            finally:
+                with self._cond:
+                    self._current = None
+
+
+
+class GitStatusSnapshot:
+    STAGED = 1
+    MODIFIED = 2
+    UNTRACKED = 4
+    CONFLICT = 8
+    KINDS = (STAGED, MODIFIED, UNTRACKED, CONFLICT)
+
+    def __init__(self, root):
+        self.root = root.replace(os.sep, '/').rstrip('/') if root else ''
+        self.files = {}
+        self.untracked_dirs = set()
+        self.dirs = {}
+
+    @staticmethod
+    def parse(data):
+        entries = {}
+        fields = data.split(b'\0')
+        i = 0
+        while i < len(fields):
+            field = fields[i]
+            i += 1
+            if not field:
+                continue
+            kind = field[:1]
+            if kind == b'?':
+                entries[os.fsdecode(field[2:])] = GitStatusSnapshot.UNTRACKED
+                continue
+            if kind not in (b'1', b'2', b'u'):
+                continue
+            parts = field.split(b' ', 10 if kind == b'u' else (9 if kind == b'2' else 8))
+            xy = parts[1]
+            if kind == b'u':
+                flags = GitStatusSnapshot.CONFLICT
+            else:
+                flags = 0
+                if xy[:1] != b'.':
+                    flags |= GitStatusSnapshot.STAGED
+                if xy[1:2] != b'.':
+                    flags |= GitStatusSnapshot.MODIFIED
+            entries[os.fsdecode(parts[-1])] = flags
+            if kind == b'2':
+                i += 1
+        return entries
+
+    @staticmethod
+    def query(repo, paths=None):
+        args = ['--literal-pathspecs', 'status', '--porcelain=v2', '-z']
+        if paths:
+            args += ['--', *paths]
+        return GitStatusSnapshot.parse(git_output(repo, *args))
+
+    def _rollup(self, rel, flags, sign):
+        parts = rel.rstrip('/').split('/')[:-1]
+        for depth in range(len(parts) + 1):
+            key = '/'.join(parts[:depth])
+            counts = self.dirs.get(key)
+            if counts is None:
+                counts = self.dirs[key] = [0, 0, 0, 0]
+            for n, kind in enumerate(self.KINDS):
+                if flags & kind:
+                    counts[n] += sign
+            if not any(counts):
+                del self.dirs[key]
+
+    def set(self, rel, flags):
+        old = self.files.pop(rel, 0)
+        if old:
+            self._rollup(rel, old, -1)
+            if rel.endswith('/'):
+                self.untracked_dirs.discard(rel.rstrip('/'))
+        if flags:
+            self.files[rel] = flags
+            self._rollup(rel, flags, 1)
+            if rel.endswith('/'):
+                self.untracked_dirs.add(rel.rstrip('/'))
+
+    def replace(self, entries):
+        self.files.clear()
+        self.untracked_dirs.clear()
+        self.dirs.clear()
+        for rel, flags in entries.items():
+            self.set(rel, flags)
+
+    def update(self, rels, entries):
+        for rel in rels:
+            prefix = rel.rstrip('/') + '/' if rel else ''
+            stale = [p for p in self.files if p == rel or p.startswith(prefix)]
+            for p in stale:
+                if p not in entries:
+                    self.set(p, 0)
+        for rel, flags in entries.items():
+            self.set(rel, flags)
+
+    def relative(self, path):
+        path = path.replace(os.sep, '/')
+        if not self.root:
+            return None
+        if path == self.root:
+            return ''
+        if path.startswith(self.root + '/'):
+            return path[len(self.root) + 1:]
+        return None
+
+    def lookup(self, path, is_dir=False):
+        rel = self.relative(path)
+        if rel is None:
+            return 0, None
+        if is_dir:
+            if rel in self.untracked_dirs or self._untracked_ancestor(rel):
+                return self.UNTRACKED, None
+            counts = self.dirs.get(rel)
+            if counts is None:
+                return 0, None
+            flags = 0
+            for n, kind in enumerate(self.KINDS):
+                if counts[n]:
+                    flags |= kind
+            return flags, counts
+        flags = self.files.get(rel)
+        if flags is None:
+            flags = self.UNTRACKED if self._untracked_ancestor(rel) else 0
+        return flags, None
+
+    def _untracked_ancestor(self, rel):
+        if not self.untracked_dirs:
+            return False
+        parts = rel.split('/')
+        for depth in range(1, len(parts)):
+            if '/'.join(parts[:depth]) in self.untracked_dirs:
+                return True
+        return False
+
+
+
+class GitStatusProxyModel(QIdentityProxyModel):
+    COLORS = (
+        (GitStatusSnapshot.CONFLICT, QColor('#e5534b'), "conflicted"),
+        (GitStatusSnapshot.MODIFIED, QColor('#d29922'), "modified"),
+        (GitStatusSnapshot.STAGED, QColor('#57ab5a'), "staged"),
+        (GitStatusSnapshot.UNTRACKED, QColor('#768390'), "untracked"),
+    )
+
+    def __init__(self, parent=None):
+        super().__init__(parent)
+        self.snapshot = None
+
+    def set_snapshot(self, snapshot):
+        self.snapshot = snapshot
+
+    def filePath(self, index):
+        return self.sourceModel().filePath(self.mapToSource(index))
+
+    def index_for_path(self, path):
+        return self.mapFromSource(self.sourceModel().index(path))
+
+    def refresh_paths(self, paths):
+        seen = set()
+        for path in paths:
+            path = path.replace(os.sep, '/')
+            while path and path not in seen:
+                seen.add(path)
+                index = self.index_for_path(path)
+                if index.isValid():
+                    self.dataChanged.emit(index, index, [Qt.ForegroundRole, Qt.ToolTipRole])
+                parent = os.path.dirname(path)
+                if parent == path:
+                    break
+                path = parent
+
+    def data(self, index, role=Qt.DisplayRole):
+        if role in (Qt.ForegroundRole, Qt.ToolTipRole) and self.snapshot is not None and index.column() == 0:
+            source = self.mapToSource(index)
+            model = self.sourceModel()
+            flags, counts = self.snapshot.lookup(model.filePath(source), model.isDir(source))
+            if flags:
+                if role == Qt.ForegroundRole:
+                    for kind, color, _ in self.COLORS:
+                        if flags & kind:
+                            return color
+                if counts is not None:
+                    labels = dict((kind, label) for kind, _, label in self.COLORS)
+                    text = ", ".join(f"{counts[n]} {labels[kind]}" for n, kind in enumerate(GitStatusSnapshot.KINDS) if counts[n])
+                else:
+                    text = ", ".join(label for kind, _, label in self.COLORS if flags & kind)
+                return f"{model.filePath(source)}\n{text}"
+        return super().data(index, role)
+
+
+
 def load_icon(icon_name):
     icon_path = os.path.join(os.path.dirname(__file__), icon_name)
     if getattr(sys, 'frozen', False):
@@ -273,44 +1763,718 @@ def get_preferred_font():
         return fallback
     return QFont(family, 10)
 
+
+
+class EditorResources:
+    _font = None
+    _features = None
+
+    def __init__(self, settings):
+        self.settings = settings
+        self.values = {}
+
+    @classmethod
+    def font(cls):
+        if cls._font is None:
+            cls._font = get_preferred_font()
+        return cls._font
+
+    @classmethod
+    def features(cls):
+        if cls._features is None:
+            candidates = [
+                ('setAutoIndent', True),
+                ('setTabIndents', True),
+                ('setBackspaceUnindents', True),
+                ('setAutoCompletionSource', getattr(QsciScintilla, 'AcsDocument', None)),
+                ('setAutoCompletionThreshold', 1),
+                ('setAutoCompletionCaseSensitivity', False),
+                ('setAutoCompletionReplaceWord', True),
+                ('setAutoCompletionUseSingle', True),
+                ('setAutoCompletionShowSingle', True),
+            ]
+            cls._features = [(getattr(QsciScintilla, name), value) for name, value in candidates
+                             if value is not None and hasattr(QsciScintilla, name)]
+        return cls._features
+
+    def value(self, key, default, type):
+        if key not in self.values:
+            self.values[key] = self.settings.value(key, default, type=type)
+        return self.values[key]
+
+    def set_value(self, key, value):
+        self.values[key] = value
+        self.settings.setValue(key, value)
+
+
+
+class EditorPool(QObject):
+    def __init__(self, window, size=2):
+        super().__init__(window)
+        self.window = window
+        self.size = max(0, int(size))
+        self.enabled = False
+        self._idle = []
+        self._timer = QTimer(self)
+        self._timer.setSingleShot(True)
+        self._timer.setInterval(50)
+        self._timer.timeout.connect(self._warm)
+
+    def take(self):
+        ed = self._idle.pop() if self._idle else self._build()
+        self.schedule()
+        return ed
+
+    def start(self):
+        self.enabled = True
+        self.schedule()
+
+    def schedule(self):
+        if self.enabled and len(self._idle) < self.size and not self._timer.isActive():
+            self._timer.start()
+
+    def _build(self):
+        ed = Editor(self.window)
+        ed.hide()
+        return ed
+
+    def _warm(self):
+        if len(self._idle) < self.size:
+            self._idle.append(self._build())
+            self.schedule()
+
 class TerminalWidget(QWidget):
     def __init__(self, parent=None):
         super().__init__(parent)
         self.logger = logging.Logger('construct-terminal')
         self.logger.setLevel(logging.CRITICAL)
 
+        from termqt import Terminal, TerminalWinptyIO
         layout = QHBoxLayout()
         self.terminal = Terminal(400, 400, logger=self.logger)
         self.terminal.set_font()
         self.terminal.maximum_line_history = 2000
 
-        scroll = QScrollBar(Qt.Vertical, self.terminal)
-        self.terminal.connect_scroll_bar(scroll)
+        scroll = QScrollBar(Qt.Vertical, self.terminal)
+        self.terminal.connect_scroll_bar(scroll)
+
+        layout.addWidget(self.terminal)
+        layout.addWidget(scroll)
+        layout.setSpacing(0)
+        self.setLayout(layout)
+
+        self.auto_wrap_enabled = True
+        shell_bin = "cmd"
+        self.terminal_io = TerminalWinptyIO(
+            self.terminal.row_len,
+            self.terminal.col_len,
+            shell_bin,
+            logger=self.logger
+        )
+        self.auto_wrap_enabled = False
+        self.terminal_io.stdout_callback = self.terminal.stdout
+        self.terminal.stdin_callback = self.terminal_io.write
+        self.terminal.resize_callback = self.terminal_io.resize
+        self.terminal_io.spawn()
+        QTimer.singleShot(0, self._finalize_wrap)
+    def _finalize_wrap(self):
+        self.terminal.enable_auto_wrap(self.auto_wrap_enabled)
+
+def scan_matches(text, pattern, cancelled=None):
+    starts = array('Q')
+    lengths = array('Q')
+    ascii_only = text.isascii()
+    byte_pos = 0
+    char_pos = 0
+    for count, match in enumerate(pattern.finditer(text)):
+        if cancelled is not None and count % 4096 == 0 and cancelled():
+            return None
+        if match.start() == match.end():
+            continue
+        if ascii_only:
+            starts.append(match.start())
+            lengths.append(match.end() - match.start())
+            continue
+        byte_pos += len(text[char_pos:match.start()].encode('utf-8'))
+        length = len(match.group().encode('utf-8'))
+        starts.append(byte_pos)
+        lengths.append(length)
+        byte_pos += length
+        char_pos = match.end()
+    return starts, lengths
+
+
+
+class SearchWorker(QThread):
+    matches_found = pyqtSignal(object, object, object)
+
+    def __init__(self, data, pattern, generation):
+        super().__init__()
+        self.data = data
+        self.pattern = pattern
+        self.generation = generation
+        self._cancelled = False
+
+    def cancel(self):
+        self._cancelled = True
+
+    def run(self):
+        text = self.data.decode('utf-8', errors='replace')
+        self.data = None
+        result = scan_matches(text, self.pattern, lambda: self._cancelled)
+        if result is not None and not self._cancelled:
+            self.matches_found.emit(self.generation, result[0], result[1])
+
+
+
+class GitIgnore:
+    def __init__(self, root):
+        self.root = root
+        self.rules = []
+
+    def load(self, directory):
+        try:
+            with open(os.path.join(directory, '.gitignore'), 'r', encoding='utf-8', errors='replace') as f:
+                lines = f.read().splitlines()
+        except OSError:
+            return
+        base = os.path.relpath(directory, self.root).replace('\\', '/')
+        base = '' if base == '.' else base
+        for line in lines:
+            line = line.rstrip()
+            if not line or line.startswith('#'):
+                continue
+            negate = line.startswith('!')
+            if negate:
+                line = line[1:]
+            dir_only = line.endswith('/')
+            line = line.rstrip('/')
+            anchored = '/' in line
+            line = line.lstrip('/')
+            if not line:
+                continue
+            body = self._translate(line)
+            regex = re.compile(('^' if anchored else '^(?:.*/)?') + body + '$')
+            self.rules.append((base, regex, negate, dir_only))
+
+    @staticmethod
+    def _translate(pattern):
+        out = []
+        i = 0
+        while i < len(pattern):
+            c = pattern[i]
+            if pattern.startswith('**/', i):
+                out.append('(?:.*/)?')
+                i += 3
+                continue
+            if pattern.startswith('**', i):
+                out.append('.*')
+                i += 2
+                continue
+            if c == '*':
+                out.append('[^/]*')
+            elif c == '?':
+                out.append('[^/]')
+            elif c == '[':
+                end = pattern.find(']', i + 1)
+                if end == -1:
+                    out.append(re.escape(c))
+                else:
+                    out.append('[' + pattern[i + 1:end].replace('!', '^', 1) + ']')
+                    i = end
+            else:
+                out.append(re.escape(c))
+            i += 1
+        return ''.join(out)
+
+    def ignored(self, rel_path, is_dir):
+        result = False
+        for base, regex, negate, dir_only in self.rules:
+            if dir_only and not is_dir:
+                continue
+            if base:
+                if not rel_path.startswith(base + '/'):
+                    continue
+                sub = rel_path[len(base) + 1:]
+            else:
+                sub = rel_path
+            if regex.match(sub):
+                result = not negate
+        return result
+
+
+
+def walk_project(root, cancelled=None):
+    ignore = GitIgnore(root)
+    stack = [root]
+    while stack:
+        if cancelled is not None and cancelled():
+            return
+        directory = stack.pop()
+        ignore.load(directory)
+        try:
+            entries = list(os.scandir(directory))
+        except OSError:
+            continue
+        for entry in entries:
+            if entry.name == '.git':
+                continue
+            try:
+                is_dir = entry.is_dir(follow_symlinks=False)
+                is_file = not is_dir and entry.is_file()
+            except OSError:
+                continue
+            rel = os.path.relpath(entry.path, root).replace('\\', '/')
+            if ignore.ignored(rel, is_dir):
+                continue
+            if is_dir:
+                stack.append(entry.path)
+            elif is_file:
+                yield entry.path
+
+
+
+def search_file(path, pattern, max_hits=1000):
+    hits = []
+    try:
+        with open(path, 'rb') as file:
+            buf = map_file(file)
+            try:
+                if b'\0' in buf[:8192]:
+                    return hits
+                line = 0
+                counted = 0
+                for match in pattern.finditer(buf):
+                    start = match.start()
+                    line += buf[counted:start].count(b'\n')
+                    counted = start
+                    line_start = buf.rfind(b'\n', 0, start) + 1
+                    line_end = buf.find(b'\n', start)
+                    if line_end == -1:
+                        line_end = len(buf)
+                    text = buf[line_start:min(line_end, line_start + 500)].decode('utf-8', errors='replace').rstrip('\r')
+                    hits.append((line, text))
+                    if len(hits) >= max_hits:
+                        break
+            finally:
+                if isinstance(buf, mmap.mmap):
+                    buf.close()
+    except (OSError, ValueError):
+        pass
+    return hits
+
+
+
+def cache_dir(*parts):
+    base = QStandardPaths.writableLocation(QStandardPaths.CacheLocation)
+    if not base:
+        base = os.path.join(os.path.expanduser("~"), ".construct-cache")
+    path = os.path.join(base, *parts)
+    os.makedirs(path, exist_ok=True)
+    return path
+
+
+
+def data_dir(*parts):
+    base = QStandardPaths.writableLocation(QStandardPaths.AppDataLocation)
+    if not base:
+        base = os.path.join(os.path.expanduser("~"), ".construct")
+    path = os.path.join(base, *parts)
+    os.makedirs(path, exist_ok=True)
+    return path
+
+
+
+def query_trigrams(text, regex=False):
+    if regex:
+        runs = []
+        current = []
+        groups = []
+        i = 0
+        while i < len(text):
+            c = text[i]
+            if c == '|':
+                return None
+            if c == '\\' and i + 1 < len(text):
+                e = text[i + 1]
+                if e.isalnum():
+                    runs.append(''.join(current))
+                    current = []
+                    i += 2
+                    if e in 'xuU':
+                        i = min(len(text), i + {'x': 2, 'u': 4, 'U': 8}[e])
+                    elif e == 'N' and text.startswith('{', i):
+                        end = text.find('}', i)
+                        i = len(text) if end == -1 else end + 1
+                    elif e.isdigit():
+                        stop = min(len(text), i + 2)
+                        while i < stop and text[i].isdigit():
+                            i += 1
+                else:
+                    current.append(e)
+                    i += 2
+                continue
+            if c in '*?{':
+                if current:
+                    current.pop()
+            if c in '.^$[](){}+*?':
+                runs.append(''.join(current))
+                current = []
+                closer = {'[': ']', '{': '}'}.get(c)
+                if c == '(' and text.startswith('?', i + 1):
+                    closer = ':' if text.startswith('?:', i + 1) else ')'
+                if c == '(' and closer != ')':
+                    groups.append(len(runs))
+                elif c == ')' and groups:
+                    start = groups.pop()
+                    if text.startswith(('?', '*', '{0', '{,'), i + 1):
+                        del runs[start:]
+                if closer:
+                    end = text.find(closer, i + 1)
+                    i = len(text) if end == -1 else end
+            else:
+                current.append(c)
+            i += 1
+        runs.append(''.join(current))
+    else:
+        runs = [text]
+    result = set()
+    for run in runs:
+        data = run.encode('utf-8').lower()
+        result.update(data[i:i + 3] for i in range(len(data) - 2))
+    return {(t[0] << 16) | (t[1] << 8) | t[2] for t in result} or None
+
+
+
+class TrigramIndex:
+    magic = b'CTRI1'
+    max_file_size = 4 * 1024 * 1024
+
+    def __init__(self, root):
+        self.root = os.path.realpath(root)
+        key = hashlib.sha1(self.root.encode('utf-8')).hexdigest()
+        self.path = os.path.join(cache_dir('trigrams'), key + '.idx')
+        self.files = []
+        self.by_path = {}
+        self.unindexed = set()
+        self.postings = {}
+        self.dead = 0
+        self.build_time = 0.0
+        self.last_refresh = 0.0
+        self.dirty = False
+        self._lock = threading.Lock()
+
+    def stats(self):
+        try:
+            size = os.path.getsize(self.path)
+        except OSError:
+            size = 0
+        return {
+            'files': len(self.by_path),
+            'trigrams': len(self.postings),
+            'bytes': size,
+            'build_time': self.build_time,
+        }
+
+    def load(self):
+        try:
+            with open(self.path, 'rb') as f:
+                if f.read(len(self.magic)) != self.magic:
+                    return False
+                (meta_len,) = struct.unpack('<Q', f.read(8))
+                meta = json.loads(f.read(meta_len).decode('utf-8'))
+                (count,) = struct.unpack('<Q', f.read(8))
+                keys = array('I')
+                keys.frombytes(f.read(count * keys.itemsize))
+                offsets = array('Q')
+                offsets.frombytes(f.read((count + 1) * offsets.itemsize))
+                ids = array('I')
+                ids.frombytes(f.read(offsets[-1] * ids.itemsize) if count else b'')
+        except (OSError, ValueError, struct.error, IndexError):
+            return False
+        with self._lock:
+            self.files = [tuple(entry) if entry else None for entry in meta['files']]
+            self.by_path = {entry[0]: i for i, entry in enumerate(self.files) if entry}
+            self.unindexed = set(meta.get('unindexed', []))
+            self.build_time = meta.get('build_time', 0.0)
+            self.dead = len(self.files) - len(self.by_path)
+            self.postings = {keys[i]: ids[offsets[i]:offsets[i + 1]] for i in range(count)}
+        return True
+
+    def save(self):
+        with self._lock:
+            if self.dead and self.dead * 5 > len(self.files):
+                self._compact()
+            keys = array('I', sorted(self.postings))
+            offsets = array('Q', [0])
+            chunks = []
+            total = 0
+            for key in keys:
+                ids = self.postings[key]
+                chunks.append(ids.tobytes())
+                total += len(ids)
+                offsets.append(total)
+            meta = json.dumps({
+                'root': self.root,
+                'files': [list(entry) if entry else None for entry in self.files],
+                'unindexed': sorted(self.unindexed),
+                'build_time': self.build_time,
+            }).encode('utf-8')
+            self.dirty = False
+        tmp = self.path + '.tmp'
+        with open(tmp, 'wb') as f:
+            f.write(self.magic)
+            f.write(struct.pack('<Q', len(meta)))
+            f.write(meta)
+            f.write(struct.pack('<Q', len(keys)))
+            f.write(keys.tobytes())
+            f.write(offsets.tobytes())
+            for chunk in chunks:
+                f.write(chunk)
+        os.replace(tmp, self.path)
+
+    def _compact(self):
+        remap = {}
+        files = []
+        for i, entry in enumerate(self.files):
+            if entry is not None:
+                remap[i] = len(files)
+                files.append(entry)
+        postings = {}
+        for key, ids in self.postings.items():
+            kept = array('I', [remap[i] for i in ids if i in remap])
+            if kept:
+                postings[key] = kept
+        self.files = files
+        self.by_path = {entry[0]: i for i, entry in enumerate(files)}
+        self.postings = postings
+        self.dead = 0
+
+    def _list_files(self, repo=None, cancelled=None):
+        if repo is not None:
+            try:
+                out = repo.git.ls_files('-z', '-co', '--exclude-standard')
+                work_tree = os.path.realpath(repo.working_tree_dir)
+                for rel in out.split('\0'):
+                    if rel:
+                        yield os.path.join(work_tree, rel)
+                return
+            except Exception:
+                pass
+        yield from walk_project(self.root, cancelled)
+
+    def refresh(self, repo=None, cancelled=None):
+        started = time.perf_counter()
+        seen = set()
+        changed = False
+        for path in self._list_files(repo, cancelled):
+            if cancelled is not None and cancelled():
+                return False
+            rel = os.path.relpath(path, self.root).replace('\\', '/')
+            seen.add(rel)
+            changed |= self._update_file(rel, path)
+        with self._lock:
+            for rel in list(self.by_path):
+                if rel not in seen:
+                    self._drop(rel)
+                    changed = True
+            self.unindexed &= seen
+        self.last_refresh = time.time()
+        if changed:
+            self.build_time = time.perf_counter() - started
+        return changed
+
+    def update_paths(self, paths):
+        changed = False
+        for path in paths:
+            real = os.path.realpath(path)
+            if not real.startswith(self.root + os.sep):
+                continue
+            rel = os.path.relpath(real, self.root).replace('\\', '/')
+            if os.path.isfile(real):
+                changed |= self._update_file(rel, real)
+            elif rel in self.by_path:
+                with self._lock:
+                    self._drop(rel)
+                changed = True
+        return changed
+
+    def _update_file(self, rel, path):
+        try:
+            st = os.stat(path)
+        except OSError:
+            return False
+        with self._lock:
+            current = self.by_path.get(rel)
+            if current is not None:
+                entry = self.files[current]
+                if entry[1] == st.st_size and entry[2] == st.st_mtime_ns:
+                    return False
+            elif rel in self.unindexed:
+                return False
+        trigrams = self._file_trigrams(path, st.st_size)
+        with self._lock:
+            self._drop(rel)
+            self.unindexed.discard(rel)
+            if trigrams is None:
+                self.unindexed.add(rel)
+                return True
+            file_id = len(self.files)
+            self.files.append((rel, st.st_size, st.st_mtime_ns))
+            self.by_path[rel] = file_id
+            for key in trigrams:
+                ids = self.postings.get(key)
+                if ids is None:
+                    self.postings[key] = array('I', [file_id])
+                else:
+                    ids.append(file_id)
+        return True
+
+    def _drop(self, rel):
+        file_id = self.by_path.pop(rel, None)
+        if file_id is not None:
+            self.files[file_id] = None
+            self.dead += 1
+
+    def _file_trigrams(self, path, size):
+        if size > self.max_file_size:
+            return None
+        try:
+            with open(path, 'rb') as f:
+                data = f.read()
+        except OSError:
+            return set()
+        if b'\0' in data[:8192]:
+            return set()
+        data = data.lower()
+        return {(a << 16) | (b << 8) | c for a, b, c in set(zip(data, data[1:], data[2:]))}
+
+    def candidates(self, trigrams):
+        with self._lock:
+            extra = [os.path.join(self.root, rel) for rel in self.unindexed]
+            if not trigrams:
+                return [os.path.join(self.root, entry[0]) for entry in self.files if entry] + extra
+            lists = []
+            for key in trigrams:
+                ids = self.postings.get(key)
+                if ids is None:
+                    return extra
+                lists.append(ids)
+            lists.sort(key=len)
+            result = set(lists[0])
+            for ids in lists[1:]:
+                result.intersection_update(ids)
+                if not result:
+                    break
+            files = self.files
+            return [os.path.join(self.root, files[i][0]) for i in sorted(result) if files[i] is not None] + extra
+
+
+
+class TrigramIndexWorker(QThread):
+    index_ready = pyqtSignal(object, object)
+
+    def __init__(self, index, repo=None, paths=None):
+        super().__init__()
+        self.index = index
+        self.repo = repo
+        self.paths = paths
+        self._cancelled = False
+
+    def cancel(self):
+        self._cancelled = True
+
+    def run(self):
+        index = self.index
+        try:
+            if self.paths is not None:
+                index.dirty |= index.update_paths(self.paths)
+            else:
+                if not index.files:
+                    index.load()
+                if index.refresh(self.repo, lambda: self._cancelled) or index.dirty:
+                    index.save()
+        except Exception:
+            return
+        if not self._cancelled:
+            self.index_ready.emit(index, index.stats())
+
+
+
+class FindInFilesWorker(QThread):
+    results_found = pyqtSignal(object)
+    search_finished = pyqtSignal(object, object, object, bool)
+
+    def __init__(self, root, pattern, max_hits=20000, index=None, trigrams=None):
+        super().__init__()
+        self.root = root
+        self.pattern = pattern
+        self.max_hits = max_hits
+        self.index = index
+        self.trigrams = trigrams
+        self.query_time = None
+        self.workers = min(32, (os.cpu_count() or 1) + 4)
+        self._cancelled = False
+
+    def cancel(self):
+        self._cancelled = True
+
+    def run(self):
+        started = time.perf_counter()
+        self.files = 0
+        self.hits = 0
+        self._batch = []
+        self._last_emit = started
+        pending = set()
+        if self.index is not None:
+            paths = self.index.candidates(self.trigrams)
+            self.query_time = time.perf_counter() - started
+        else:
+            paths = walk_project(self.root, lambda: self._cancelled)
+        with ThreadPoolExecutor(max_workers=self.workers) as pool:
+            for path in paths:
+                if self._cancelled or self.hits >= self.max_hits:
+                    break
+                pending.add(pool.submit(self._search, path))
+                self.files += 1
+                if len(pending) >= self.workers * 4:
+                    done, pending = wait(pending, return_when=FIRST_COMPLETED)
+                    self._collect(done)
+            while pending and not self._cancelled and self.hits < self.max_hits:
+                done, pending = wait(pending, return_when=FIRST_COMPLETED)
+                self._collect(done)
+            for future in pending:
+                future.cancel()
+        self._flush()
+        self.search_finished.emit(self.files, self.hits, time.perf_counter() - started, self._cancelled)
+
+    def _search(self, path):
+        return path, search_file(path, self.pattern)
+
+    def _collect(self, done):
+        for future in done:
+            try:
+                path, hits = future.result()
+            except Exception:
+                continue
+            if hits:
+                self.hits += len(hits)
+                self._batch.append((path, hits))
+        if self._batch and time.perf_counter() - self._last_emit > 0.1:
+            self._flush()
+
+    def _flush(self):
+        if self._batch:
+            self.results_found.emit(self._batch)
+            self._batch = []
+        self._last_emit = time.perf_counter()
 
-        layout.addWidget(self.terminal)
-        layout.addWidget(scroll)
-        layout.setSpacing(0)
-        self.setLayout(layout)
 
-        self.auto_wrap_enabled = True
-        shell_bin = "cmd"
-        from termqt import TerminalWinptyIO
-        self.terminal_io = TerminalWinptyIO(
-            self.terminal.row_len,
-            self.terminal.col_len,
-            shell_bin,
-            logger=self.logger
-        )
-        self.auto_wrap_enabled = False
-        self.terminal_io.stdout_callback = self.terminal.stdout
-        self.terminal.stdin_callback = self.terminal_io.write
-        self.terminal.resize_callback = self.terminal_io.resize
-        self.terminal_io.spawn()
-        QTimer.singleShot(0, self._finalize_wrap)
-    def _finalize_wrap(self):
-        self.terminal.enable_auto_wrap(self.auto_wrap_enabled)
 
 class FindReplaceDialog(QDialog):
+    indicator = 8
+    max_painted = 2000
+
     def __init__(self, text_edit):
         super().__init__()
         self.text_edit = text_edit
@@ -325,53 +2489,450 @@ class FindReplaceDialog(QDialog):
         self.replace_input = QLineEdit(self)
         self.layout.addWidget(self.replace_label)
         self.layout.addWidget(self.replace_input)
+        self.options_layout = QHBoxLayout()
+        self.regex_check = QCheckBox("Regex", self)
+        self.case_check = QCheckBox("Match case", self)
+        self.word_check = QCheckBox("Whole word", self)
+        self.options_layout.addWidget(self.regex_check)
+        self.options_layout.addWidget(self.case_check)
+        self.options_layout.addWidget(self.word_check)
+        self.layout.addLayout(self.options_layout)
+        self.match_label = QLabel("", self)
+        self.layout.addWidget(self.match_label)
         self.button_layout = QHBoxLayout()
+        self.find_prev_button = QPushButton("Find Previous", self)
         self.find_button = QPushButton("Find Next", self)
         self.replace_button = QPushButton("Replace", self)
         self.replace_all_button = QPushButton("Replace All", self)
+        self.button_layout.addWidget(self.find_prev_button)
         self.button_layout.addWidget(self.find_button)
         self.button_layout.addWidget(self.replace_button)
         self.button_layout.addWidget(self.replace_all_button)
         self.layout.addLayout(self.button_layout)
+        self.find_prev_button.clicked.connect(self.find_previous)
         self.find_button.clicked.connect(self.find_next)
         self.replace_button.clicked.connect(self.replace)
         self.replace_all_button.clicked.connect(self.replace_all)
         self.setLayout(self.layout)
         self.current_index = 0
+        self._generation = 0
+        self._result_generation = -1
+        self._pattern = None
+        self._starts = array('Q')
+        self._lengths = array('Q')
+        self._worker = None
+        self._running = set()
+        self._scan_timer = QTimer(self)
+        self._scan_timer.setSingleShot(True)
+        self._scan_timer.setInterval(150)
+        self._scan_timer.timeout.connect(self.start_scan)
+        self.find_input.textChanged.connect(self.schedule_scan)
+        self.regex_check.toggled.connect(self.schedule_scan)
+        self.case_check.toggled.connect(self.schedule_scan)
+        self.word_check.toggled.connect(self.schedule_scan)
+        self.text_edit.textChanged.connect(self.schedule_scan)
+        self.text_edit.verticalScrollBar().valueChanged.connect(self._paint_matches)
+        self._pending_step = None
+        if self._large():
+            self.regex_check.setEnabled(False)
+            self.regex_check.setToolTip("Regular expressions are not available for large files.")
+            self.match_label.setText("Large file: plain text search only")
+        self._setup_indicator()
+
+    def _setup_indicator(self):
+        ed = self.text_edit
+        try:
+            ed.SendScintilla(QsciScintillaBase.SCI_INDICSETSTYLE, self.indicator, QsciScintillaBase.INDIC_ROUNDBOX)
+            ed.SendScintilla(QsciScintillaBase.SCI_INDICSETFORE, self.indicator, 0x00A5FF)
+            ed.SendScintilla(QsciScintillaBase.SCI_INDICSETALPHA, self.indicator, 90)
+        except Exception:
+            pass
 
-    def find_next(self):
-        text_to_find = self.find_input.text().strip()
-        if text_to_find:
-            options = QTextDocument.FindFlags()
-            found = self.text_edit.find(text_to_find, options)
-            if not found:
-                QMessageBox.information(self, "Not Found", "No more occurrences found.")
+    def _large(self):
+        return getattr(self.text_edit, 'large_document', None) is not None
+
+    def _compile(self):
+        text = self.find_input.text()
+        if not text:
+            return None
+        try:
+            return compile_search(text, self.regex_check.isChecked(), self.case_check.isChecked(), self.word_check.isChecked())
+        except re.error:
+            return False
+
+    def schedule_scan(self, *args):
+        self._generation += 1
+        self._cancel_worker()
+        self._scan_timer.start()
+
+    def _cancel_worker(self):
+        if self._worker is not None:
+            self._worker.cancel()
+            self._worker = None
+
+    def start_scan(self):
+        self._cancel_worker()
+        pattern = self._compile()
+        self._pattern = pattern
+        if not pattern or self._large():
+            self._set_matches(self._generation, array('Q'), array('Q'))
+            if pattern is False:
+                self.match_label.setText("Invalid pattern")
+            return
+        self.match_label.setText("Searching...")
+        worker = SearchWorker(bytes(self.text_edit.bytes(0, self.text_edit.length())), pattern, self._generation)
+        worker.matches_found.connect(self._set_matches)
+        worker.finished.connect(lambda w=worker: self._running.discard(w))
+        worker.finished.connect(worker.deleteLater)
+        self._worker = worker
+        self._running.add(worker)
+        worker.start()
+
+    def _set_matches(self, generation, starts, lengths):
+        if generation != self._generation:
+            return
+        self._worker = None
+        self._result_generation = generation
+        self._starts = starts
+        self._lengths = lengths
+        self._paint_matches()
+        self._update_label()
+        step, self._pending_step = self._pending_step, None
+        if step is not None:
+            step()
+
+    def _paint_matches(self, *args):
+        ed = self.text_edit
+        ed.SendScintilla(QsciScintillaBase.SCI_SETINDICATORCURRENT, self.indicator)
+        ed.SendScintilla(QsciScintillaBase.SCI_INDICATORCLEARRANGE, 0, ed.length())
+        if not self._starts:
+            return
+        first = int(ed.SendScintilla(QsciScintillaBase.SCI_DOCLINEFROMVISIBLE, ed.firstVisibleLine()))
+        last = min(ed.lines() - 1, first + int(ed.SendScintilla(QsciScintillaBase.SCI_LINESONSCREEN)) + 1)
+        start = int(ed.SendScintilla(QsciScintillaBase.SCI_POSITIONFROMLINE, first))
+        end = int(ed.SendScintilla(QsciScintillaBase.SCI_GETLINEENDPOSITION, last))
+        index = max(0, bisect.bisect_left(self._starts, start) - 1)
+        stop = min(bisect.bisect_right(self._starts, end), index + self.max_painted)
+        for i in range(index, stop):
+            ed.SendScintilla(QsciScintillaBase.SCI_INDICATORFILLRANGE, self._starts[i], self._lengths[i])
+
+    def _update_label(self, current=None):
+        if self._pattern is False:
+            self.match_label.setText("Invalid pattern")
+        elif not self._pattern or self._large():
+            self.match_label.setText("")
+        elif not self._starts:
+            self.match_label.setText("No matches")
+        elif current is None:
+            self.match_label.setText(f"{len(self._starts)} matches")
         else:
-            QMessageBox.warning(self, "Empty Search", "Please enter text to find.")
+            self.match_label.setText(f"{current + 1} of {len(self._starts)}")
+
+    def _ensure_matches(self, step=None):
+        if self._result_generation == self._generation:
+            return True
+        self._pending_step = step
+        if self._worker is None:
+            self._scan_timer.stop()
+            self.start_scan()
+        return False
+
+    def _select_match(self, index):
+        ed = self.text_edit
+        start = self._starts[index]
+        ed.SendScintilla(QsciScintillaBase.SCI_SETSEL, start, start + self._lengths[index])
+        self.current_index = index
+        self._update_label(index)
+
+    def _find_large(self, backward):
+        options = QTextDocument.FindFlags()
+        if self.case_check.isChecked():
+            options |= QTextDocument.FindCaseSensitively
+        if self.word_check.isChecked():
+            options |= QTextDocument.FindWholeWords
+        if backward:
+            options |= QTextDocument.FindBackward
+        found = self.text_edit.find(self.find_input.text(), options)
+        self.match_label.setText("" if found else "No matches")
+        return found
+
+    def find_next(self):
+        if not self.find_input.text():
+            self.match_label.setText("Please enter text to find.")
+            return False
+        if self._large():
+            return self._find_large(False)
+        if not self._ensure_matches(self.find_next) or not self._starts:
+            return False
+        position = int(self.text_edit.SendScintilla(QsciScintillaBase.SCI_GETSELECTIONEND))
+        index = bisect.bisect_left(self._starts, position)
+        self._select_match(index if index < len(self._starts) else 0)
+        return True
+
+    def find_previous(self):
+        if not self.find_input.text():
+            self.match_label.setText("Please enter text to find.")
+            return False
+        if self._large():
+            return self._find_large(True)
+        if not self._ensure_matches(self.find_previous) or not self._starts:
+            return False
+        position = int(self.text_edit.SendScintilla(QsciScintillaBase.SCI_GETSELECTIONSTART))
+        index = bisect.bisect_left(self._starts, position) - 1
+        self._select_match(index if index >= 0 else len(self._starts) - 1)
+        return True
 
     def replace(self):
         text_to_find = self.find_input.text()
         text_to_replace = self.replace_input.text()
-        if text_to_find and text_to_replace:
+        if text_to_find and text_to_replace and not self._large():
             editor = self.text_edit
-            found = editor.findFirst(text_to_find, False, False, False, True, True)
-            if found:
-                editor.replaceSelectedText(text_to_replace)
+            if not self._ensure_matches(self.replace):
+                return
+            if self._starts:
+                start = int(editor.SendScintilla(QsciScintillaBase.SCI_GETSELECTIONSTART))
+                end = int(editor.SendScintilla(QsciScintillaBase.SCI_GETSELECTIONEND))
+                index = bisect.bisect_left(self._starts, start)
+                if index < len(self._starts) and self._starts[index] == start and self._lengths[index] == end - start:
+                    replacement = text_to_replace
+                    if self.regex_check.isChecked():
+                        match = self._pattern.fullmatch(editor.selectedText())
+                        replacement = match.expand(text_to_replace) if match else text_to_replace
+                    editor.replaceSelectedText(replacement)
+            self.find_next()
 
     def replace_all(self):
         text_to_find = self.find_input.text()
         text_to_replace = self.replace_input.text()
         if text_to_find and text_to_replace:
             editor = self.text_edit
-            editor.setCursorPosition(0, 0)
-            replaced = 0
-            if editor.findFirst(text_to_find, False, False, False, True, True):
-                while True:
-                    editor.replaceSelectedText(text_to_replace)
-                    replaced += 1
-                    if not getattr(editor, 'findNext')():
-                        break
-            QMessageBox.information(self, "Replace All", f"Replaced {replaced} occurrence(s).")
+            if self._large():
+                self.match_label.setText("Large files are opened read-only.")
+                return
+            pattern = self._compile()
+            if not pattern:
+                self._update_label()
+                return
+            started = time.perf_counter()
+            replaced = editor.replace_all(pattern, text_to_replace, expand=self.regex_check.isChecked())
+            elapsed = time.perf_counter() - started
+            self.match_label.setText(f"Replaced {replaced} occurrence(s) in {elapsed:.3f} s.")
+
+    def done(self, result):
+        self._scan_timer.stop()
+        self._cancel_worker()
+        self._pending_step = None
+        for worker in list(self._running):
+            worker.cancel()
+            worker.wait()
+        try:
+            self.text_edit.textChanged.disconnect(self.schedule_scan)
+            self.text_edit.verticalScrollBar().valueChanged.disconnect(self._paint_matches)
+        except Exception:
+            pass
+        try:
+            self.text_edit.SendScintilla(QsciScintillaBase.SCI_SETINDICATORCURRENT, self.indicator)
+            self.text_edit.SendScintilla(QsciScintillaBase.SCI_INDICATORCLEARRANGE, 0, self.text_edit.length())
+        except Exception:
+            pass
+        super().done(result)
+
+
+
+class FindInFilesPanel(QWidget):
+    open_requested = pyqtSignal(str, int)
+    refresh_interval = 60
+
+    def __init__(self, parent=None, settings=None):
+        super().__init__(parent)
+        self.root = None
+        self.repo = None
+        self.settings = settings
+        self.index = None
+        self.index_stats = None
+        self._index_worker = None
+        self._worker = None
+        self._running = set()
+        layout = QVBoxLayout(self)
+        layout.setContentsMargins(0, 0, 0, 0)
+        search_layout = QHBoxLayout()
+        self.query_input = QLineEdit(self)
+        self.query_input.setPlaceholderText("Search in folder")
+        self.search_button = QPushButton("Search", self)
+        self.stop_button = QPushButton("Stop", self)
+        self.stop_button.setEnabled(False)
+        search_layout.addWidget(self.query_input)
+        search_layout.addWidget(self.search_button)
+        search_layout.addWidget(self.stop_button)
+        layout.addLayout(search_layout)
+        options_layout = QHBoxLayout()
+        self.regex_check = QCheckBox("Regex", self)
+        self.case_check = QCheckBox("Match case", self)
+        self.word_check = QCheckBox("Whole word", self)
+        options_layout.addWidget(self.regex_check)
+        options_layout.addWidget(self.case_check)
+        options_layout.addWidget(self.word_check)
+        self.index_check = QCheckBox("Use index", self)
+        if settings is not None:
+            self.index_check.setChecked(settings.value("search/trigramIndex", False, type=bool))
+        options_layout.addWidget(self.index_check)
+        layout.addLayout(options_layout)
+        self.status_label = QLabel("", self)
+        layout.addWidget(self.status_label)
+        self.index_label = QLabel("", self)
+        layout.addWidget(self.index_label)
+        self.results = QTreeWidget(self)
+        self.results.setHeaderHidden(True)
+        layout.addWidget(self.results)
+        self.query_input.returnPressed.connect(self.search)
+        self.search_button.clicked.connect(self.search)
+        self.stop_button.clicked.connect(self.stop)
+        self.results.itemActivated.connect(self._on_item_activated)
+        self.index_check.toggled.connect(self._on_index_toggled)
+
+    def set_root(self, root, repo=None):
+        self.repo = repo
+        if root != self.root:
+            self.cancel()
+            self._cancel_index()
+            self.root = root
+            self.index = None
+            self.index_stats = None
+            self.results.clear()
+            self.status_label.setText(root or "")
+            self.index_label.setText("")
+            if root and self.index_check.isChecked():
+                self.refresh_index()
+
+    def _on_index_toggled(self, checked):
+        if self.settings is not None:
+            self.settings.setValue("search/trigramIndex", bool(checked))
+        if checked and self.root:
+            self.refresh_index()
+        elif not checked:
+            self._cancel_index()
+            self.index_label.setText("")
+
+    def _cancel_index(self):
+        if self._index_worker is not None:
+            self._index_worker.cancel()
+            self._index_worker = None
+
+    def _start_index_worker(self, worker):
+        worker.index_ready.connect(lambda index, stats, w=worker: self._on_index_ready(w, index, stats))
+        worker.finished.connect(lambda w=worker: self._running.discard(w))
+        worker.finished.connect(worker.deleteLater)
+        self._running.add(worker)
+        worker.start()
+
+    def refresh_index(self):
+        if not self.root or self._index_worker is not None:
+            return
+        if self.index is None:
+            self.index = TrigramIndex(self.root)
+            self.index_label.setText("Building index...")
+        worker = TrigramIndexWorker(self.index, self.repo)
+        self._index_worker = worker
+        self._start_index_worker(worker)
+
+    def notify_saved(self, path):
+        if self.index is not None and self.index_check.isChecked():
+            self._start_index_worker(TrigramIndexWorker(self.index, paths=[path]))
+
+    def _on_index_ready(self, worker, index, stats):
+        if worker is self._index_worker:
+            self._index_worker = None
+        if index is not self.index:
+            return
+        self.index_stats = stats
+        self.index_label.setText(f"Index: {stats['files']} file(s), {stats['trigrams']} trigrams, {stats['bytes'] / 1024:.0f} KB, built in {stats['build_time']:.2f} s")
+
+    def _index_ready(self):
+        return self.index_check.isChecked() and self.index is not None and self.index_stats is not None
+
+    def _compile(self):
+        text = self.query_input.text()
+        if not text:
+            return None
+        return compile_search(text.encode('utf-8'), self.regex_check.isChecked(), self.case_check.isChecked(), self.word_check.isChecked())
+
+    def search(self):
+        if not self.root:
+            return
+        try:
+            pattern = self._compile()
+        except re.error as e:
+            self.status_label.setText(f"Invalid pattern: {e}")
+            return
+        if pattern is None:
+            return
+        self.cancel()
+        self.results.clear()
+        self.status_label.setText("Searching...")
+        if self._index_ready():
+            worker = FindInFilesWorker(self.root, pattern, index=self.index, trigrams=query_trigrams(self.query_input.text(), self.regex_check.isChecked()))
+            if time.time() - self.index.last_refresh > self.refresh_interval:
+                self.refresh_index()
+        else:
+            worker = FindInFilesWorker(self.root, pattern)
+        worker.results_found.connect(lambda batch, w=worker: self._on_results(w, batch))
+        worker.search_finished.connect(lambda files, hits, elapsed, cancelled, w=worker: self._on_finished(w, files, hits, elapsed, cancelled))
+        worker.finished.connect(lambda w=worker: self._running.discard(w))
+        worker.finished.connect(worker.deleteLater)
+        self._worker = worker
+        self._running.add(worker)
+        self.stop_button.setEnabled(True)
+        worker.start()
+
+    def stop(self):
+        if self._worker is not None:
+            self._worker.cancel()
+        self.stop_button.setEnabled(False)
+
+    def cancel(self):
+        if self._worker is not None:
+            self._worker.cancel()
+            self._worker = None
+        self.stop_button.setEnabled(False)
+
+    def shutdown(self):
+        self.cancel()
+        self._cancel_index()
+        for worker in list(self._running):
+            worker.cancel()
+            worker.wait()
+
+    def _on_results(self, worker, batch):
+        if worker is not self._worker:
+            return
+        self.results.setUpdatesEnabled(False)
+        try:
+            for path, hits in batch:
+                rel = os.path.relpath(path, self.root)
+                file_item = QTreeWidgetItem(self.results, [f"{rel} ({len(hits)})"])
+                file_item.setData(0, Qt.UserRole, path)
+                file_item.setData(0, Qt.UserRole + 1, hits[0][0])
+                for line, text in hits:
+                    item = QTreeWidgetItem(file_item, [f"{line + 1}: {text.strip()}"])
+                    item.setData(0, Qt.UserRole, path)
+                    item.setData(0, Qt.UserRole + 1, line)
+        finally:
+            self.results.setUpdatesEnabled(True)
+
+    def _on_finished(self, worker, files, hits, elapsed, cancelled):
+        if worker is not self._worker:
+            return
+        self._worker = None
+        self.stop_button.setEnabled(False)
+        state = "Stopped" if cancelled else "Done"
+        query = f", index lookup {worker.query_time * 1000:.1f} ms" if worker.query_time is not None else ""
+        self.status_label.setText(f"{state}: {hits} match(es) in {self.results.topLevelItemCount()} file(s), {files} file(s) searched in {elapsed:.2f} s{query}")
+
+    def _on_item_activated(self, item, column):
+        path = item.data(0, Qt.UserRole)
+        line = item.data(0, Qt.UserRole + 1)
+        if path:
+            self.open_requested.emit(path, int(line or 0))
 
 
 
@@ -467,6 +3028,7 @@ class ImportFromWebDialog(QDialog):
                 self._fetcher = None
 
     def is_valid_url(self, url):
+        import validators
         return validators.url(url) and url.startswith("https://")
 
 
@@ -497,11 +3059,218 @@ class UnsavedWorkDialog(QDialog):
 
 
 
+JOURNAL_RECORD = struct.Struct('<cQQ')
+
+
+def journal_record(kind, position, payload=b'', length=None):
+    return JOURNAL_RECORD.pack(kind, position, len(payload) if length is None else length) + payload
+
+
+def decode_journal_base(meta):
+    path = meta.get("path")
+    if not path or not os.path.isfile(path):
+        return b'', not path
+    with open(path, 'rb') as f:
+        if meta.get("compression"):
+            with open_decompressed(f, meta["compression"]) as stream:
+                raw = stream.read()
+        else:
+            raw = f.read()
+    st = os.stat(path)
+    unchanged = st.st_mtime_ns == meta.get("mtime") and st.st_size == meta.get("size")
+    encoding = codecs.lookup(meta.get("encoding") or 'utf-8').name
+    if encoding in ('utf-8', 'utf-8-sig'):
+        if raw[:len(codecs.BOM_UTF8)] == codecs.BOM_UTF8:
+            raw = raw[len(codecs.BOM_UTF8):]
+        return raw.decode('utf-8', errors='replace').encode('utf-8'), unchanged
+    return raw.decode(encoding, errors='replace').encode('utf-8'), unchanged
+
+
+def read_journal(path):
+    with open(path, 'rb') as f:
+        raw = f.read()
+    meta, data, base_ok = {}, None, True
+    pos = 0
+    while pos + JOURNAL_RECORD.size <= len(raw):
+        kind, position, length = JOURNAL_RECORD.unpack_from(raw, pos)
+        pos += JOURNAL_RECORD.size
+        payload = b''
+        if kind != b'D':
+            payload = raw[pos:pos + length]
+            if len(payload) < length:
+                break
+            pos += length
+        if kind == b'B':
+            meta, data, base_ok = json.loads(payload.decode('utf-8')), None, True
+        elif kind == b'S':
+            data = bytearray(payload)
+        else:
+            if data is None:
+                base, base_ok = decode_journal_base(meta)
+                data = bytearray(base)
+            if kind == b'I':
+                data[position:position] = payload
+            elif kind == b'D':
+                del data[position:position + length]
+    return meta, (bytes(data) if data is not None else None), base_ok
+
+
+
+class JournalWriter(QThread):
+    sync_interval = 1.0
+
+    def __init__(self):
+        super().__init__()
+        self._ops = queue.Queue()
+        self._files = {}
+
+    def append(self, path, data):
+        self._ops.put(('append', path, data))
+
+    def rewrite(self, path, data):
+        self._ops.put(('rewrite', path, data))
+
+    def remove(self, path):
+        self._ops.put(('remove', path, None))
+
+    def stop(self):
+        self._ops.put(None)
+        self.wait()
+
+    def _close(self, path):
+        f = self._files.pop(path, None)
+        if f is not None:
+            f.close()
+
+    def run(self):
+        dirty = set()
+        while True:
+            try:
+                op = self._ops.get(timeout=self.sync_interval if dirty else None)
+            except queue.Empty:
+                op = ()
+            if not op:
+                for path in dirty:
+                    f = self._files.get(path)
+                    if f is not None:
+                        os.fsync(f.fileno())
+                dirty.clear()
+                if op is None:
+                    for path in list(self._files):
+                        self._close(path)
+                    return
+                continue
+            kind, path, data = op
+            try:
+                if kind == 'append':
+                    f = self._files.get(path)
+                    if f is None:
+                        f = self._files[path] = open(path, 'ab')
+                    f.write(data)
+                    f.flush()
+                    dirty.add(path)
+                elif kind == 'rewrite':
+                    self._close(path)
+                    dirty.discard(path)
+                    with open(path + '.tmp', 'wb') as f:
+                        f.write(data)
+                        f.flush()
+                        os.fsync(f.fileno())
+                    os.replace(path + '.tmp', path)
+                elif kind == 'remove':
+                    self._close(path)
+                    dirty.discard(path)
+                    if os.path.exists(path):
+                        os.remove(path)
+            except OSError as e:
+                logging.warning("Journal write failed for %s: %s", path, e)
+
+
+
+class EditJournal:
+    compact_threshold = 4 * 1024 * 1024
+
+    def __init__(self, writer, path, editor, meta, snapshot, during_edit=False):
+        self.writer = writer
+        self.path = path
+        self.editor = editor
+        self.meta = meta
+        self.pending = 0
+        self.includes_current_edit = snapshot and during_edit
+        if snapshot:
+            self.compact()
+        else:
+            writer.rewrite(path, journal_record(b'B', 0, json.dumps(meta).encode('utf-8')))
+
+    def record(self, position, deleted, inserted):
+        if self.includes_current_edit:
+            self.includes_current_edit = False
+            return
+        records = b''
+        if deleted:
+            records += journal_record(b'D', position, length=deleted)
+        if inserted:
+            records += journal_record(b'I', position, inserted)
+        self.writer.append(self.path, records)
+        self.pending += len(records)
+        if self.pending > max(self.compact_threshold, int(self.editor.SendScintilla(QsciScintillaBase.SCI_GETLENGTH))):
+            self.compact()
+
+    def compact(self):
+        length = int(self.editor.SendScintilla(QsciScintillaBase.SCI_GETLENGTH))
+        data = bytes(self.editor.bytes(0, length))
+        self.writer.rewrite(self.path, journal_record(b'B', 0, json.dumps(self.meta).encode('utf-8')) + journal_record(b'S', 0, data))
+        self.pending = 0
+
+    def discard(self):
+        self.writer.remove(self.path)
+
+
+
+class TabSnapshot:
+    def __init__(self, data, size, cursor, first_line):
+        self.data = data
+        self.size = size
+        self.cursor = cursor
+        self.first_line = first_line
+        self.created = time.monotonic()
+
+
+
 class Editor(QsciScintilla):
     zoomChanged = pyqtSignal(int)
+    largeIndexProgress = pyqtSignal()
+    SCI_SETIDLESTYLING = getattr(QsciScintillaBase, 'SCI_SETIDLESTYLING', 2692)
+    SCI_AUTOCSETORDER = getattr(QsciScintillaBase, 'SCI_AUTOCSETORDER', 2660)
+    SC_ORDER_CUSTOM = 2
+    IDLESTYLING_NONE = 0
+    IDLESTYLING_AFTERVISIBLE = 2
     def __init__(self, parent=None):
         super().__init__(parent)
-        self.preferred_font = get_preferred_font()
+        self.large_document = None
+        self.line_indexer = None
+        self.large_window_lines = 20000
+        self.window_start = 0
+        self.window_end_offset = 0
+        self._window_loading = False
+        self.line_widths = LineWidthTracker()
+        self.lexer_cache = {}
+        self.background_highlighting = True
+        self.cheap_highlighting_threshold = 64 * 1024 * 1024
+        self.cheap_highlighting = False
+        self._highlight_loading = False
+        self.hibernated = None
+        self.last_active = time.monotonic()
+        self.file_watcher = None
+        self.follow_tail = False
+        self.journal = None
+        self.journal_factory = None
+        self.word_index = None
+        self.word_counts = None
+        self._bulk_edit = False
+        self.SCN_MODIFIED.connect(self._on_modified)
+        self.SCN_CHARADDED.connect(self._on_char_added)
+        self.preferred_font = EditorResources.font()
         self.setFont(self.preferred_font)
         self.setMarginsFont(self.preferred_font)
         self.setMarginWidth(0, 0)
@@ -514,54 +3283,305 @@ class Editor(QsciScintilla):
         self.setIndentationGuides(False)
         self.setTabWidth(4)
         self.setIndentationsUseTabs(False)
-        try:
-            self.setAutoIndent(True)
-        except Exception:
-            pass
-        try:
-            self.setTabIndents(True)
-        except Exception:
-            pass
-        try:
-            self.setBackspaceUnindents(True)
-        except Exception:
-            pass
-        try:
-            if hasattr(QsciScintilla, 'AcsDocument') and hasattr(self, 'setAutoCompletionSource'):
-                self.setAutoCompletionSource(QsciScintilla.AcsDocument)
-            if hasattr(self, 'setAutoCompletionThreshold'):
-                self.setAutoCompletionThreshold(1)
-            if hasattr(self, 'setAutoCompletionCaseSensitivity'):
-                self.setAutoCompletionCaseSensitivity(False)
-            if hasattr(self, 'setAutoCompletionReplaceWord'):
-                self.setAutoCompletionReplaceWord(True)
-            if hasattr(self, 'setAutoCompletionUseSingle'):
-                self.setAutoCompletionUseSingle(True)
-            if hasattr(self, 'setAutoCompletionShowSingle'):
-                self.setAutoCompletionShowSingle(True)
-        except Exception:
-            pass
+        for setter, value in EditorResources.features():
+            try:
+                setter(self, value)
+            except Exception:
+                pass
         self.setEolMode(QsciScintilla.EolWindows)
         self._zoom = 0
         self.setUtf8(True) if hasattr(self, 'setUtf8') else None
-
-    def append_text(self, text: str):
+        self.verticalScrollBar().valueChanged.connect(self._check_large_window)
+        self.verticalScrollBar().valueChanged.connect(self._style_visible)
+        self.zoomChanged.connect(lambda _: self.adjust_scroll_bar_policy())
+
+    def append_text(self, text):
+        data = bytes(text) if isinstance(text, (bytes, bytearray)) else text.encode('utf-8', errors='replace')
+        last = len(self.line_widths) - 1
+        length = int(self.SendScintilla(QsciScintillaBase.SCI_GETLENGTH))
+        joins_crlf = data[:1] == b'\n' and length and int(self.SendScintilla(QsciScintillaBase.SCI_GETCHARAT, length - 1)) == 13
+        self._index_words(length, length, -1)
+        self._bulk_edit = True
         try:
-            data = text.encode('utf-8', errors='replace')
             self.SendScintilla(QsciScintillaBase.SCI_APPENDTEXT, len(data), data)
         except Exception:
             self.SendScintilla(QsciScintillaBase.SCI_DOCUMENTEND)
             try:
-                self.insert(text)
+                self.insert(data.decode('utf-8', errors='replace'))
             except Exception:
-                self.setText(self.text() + text)
+                super().setText(self.text() + data.decode('utf-8', errors='replace'))
+        finally:
+            self._bulk_edit = False
+        self._index_words(length, length + len(data), 1)
+        widths = measure_line_widths(data[1:] if joins_crlf else data, self.tabWidth())
+        widths[0] = self._measure_lines(last, last)[0]
+        self.line_widths.replace(last, 1, widths)
+        if len(self.line_widths) != self.lines():
+            self.rebuild_line_widths()
+
+    def replace_all(self, pattern, replacement, expand=False):
+        text = self.text()
+        pieces = []
+        first = None
+        prev = 0
+        count = 0
+        for match in pattern.finditer(text):
+            if first is None:
+                first = match.start()
+            else:
+                pieces.append(text[prev:match.start()])
+            pieces.append(match.expand(replacement) if expand else replacement)
+            prev = match.end()
+            count += 1
+        if not count:
+            return 0
+        data = ''.join(pieces).encode('utf-8')
+        start = len(text[:first].encode('utf-8'))
+        end = start + len(text[first:prev].encode('utf-8'))
+        del text, pieces
+        first_line = self._local_line(start)
+        old_lines = self._local_line(end) - first_line + 1
+        self._index_words(start, end, -1)
+        with QSignalBlocker(self):
+            self.beginUndoAction()
+            try:
+                self.SendScintilla(QsciScintillaBase.SCI_SETTARGETSTART, start)
+                self.SendScintilla(QsciScintillaBase.SCI_SETTARGETEND, end)
+                self.SendScintilla(QsciScintillaBase.SCI_REPLACETARGET, len(data), data)
+            finally:
+                self.endUndoAction()
+        self._index_words(start, start + len(data), 1)
+        self.line_widths.replace(first_line, old_lines, self._measure_lines(first_line, self._local_line(start + len(data))))
+        self._journal_change(start, end - start, data)
+        self.adjust_scroll_bar_policy()
+        self.textChanged.emit()
+        return count
+
+    def reserve(self, size):
+        try:
+            self.SendScintilla(QsciScintillaBase.SCI_ALLOCATE, int(size) + 1)
+        except Exception:
+            pass
 
     def resizeEvent(self, event):
         super().resizeEvent(event)
         self.adjust_scroll_bar_policy()
+        self._style_visible()
+
+    def setLexer(self, lexer=None):
+        super().setLexer(lexer)
+        self.update_highlighting()
+
+    def configure_highlighting(self, background, cheap_threshold):
+        self.background_highlighting = bool(background)
+        self.cheap_highlighting_threshold = max(0, int(cheap_threshold))
+        self.update_highlighting()
+
+    def set_highlight_loading(self, loading):
+        self._highlight_loading = bool(loading)
+        self.update_highlighting()
+
+    def update_highlighting(self):
+        length = int(self.SendScintilla(QsciScintillaBase.SCI_GETLENGTH))
+        self.cheap_highlighting = self.lexer() is not None and length > self.cheap_highlighting_threshold
+        if self.background_highlighting and not (self.cheap_highlighting or self._highlight_loading):
+            mode = self.IDLESTYLING_AFTERVISIBLE
+        else:
+            mode = self.IDLESTYLING_NONE
+        self.SendScintilla(self.SCI_SETIDLESTYLING, mode)
+        self._style_visible()
+
+    def _style_visible(self, *args):
+        if not self.cheap_highlighting:
+            return
+        first = int(self.SendScintilla(QsciScintillaBase.SCI_DOCLINEFROMVISIBLE, self.firstVisibleLine()))
+        last = min(self.lines() - 1, first + int(self.SendScintilla(QsciScintillaBase.SCI_LINESONSCREEN)) + 1)
+        start = int(self.SendScintilla(QsciScintillaBase.SCI_POSITIONFROMLINE, first))
+        end = int(self.SendScintilla(QsciScintillaBase.SCI_GETLINEENDPOSITION, last))
+        self.SendScintilla(QsciScintillaBase.SCI_COLOURISE, start, end)
+
+    def setText(self, text):
+        self.clear_word_counts()
+        self._bulk_edit = True
+        try:
+            super().setText(text)
+        finally:
+            self._bulk_edit = False
+        self.line_widths.reset(measure_line_widths(text.encode('utf-8', errors='replace'), self.tabWidth()))
+        if self.journal is not None:
+            self.journal.compact()
+
+    def sync_bytes(self, data):
+        length = int(self.SendScintilla(QsciScintillaBase.SCI_GETLENGTH))
+        span = diff_span(bytes(self.bytes(0, length)), data)
+        if span is None:
+            return False
+        start, end, middle = span
+        first_line = self._local_line(start)
+        old_lines = self._local_line(end) - first_line + 1
+        self._index_words(start, end, -1)
+        with QSignalBlocker(self):
+            self.beginUndoAction()
+            try:
+                self.SendScintilla(QsciScintillaBase.SCI_SETTARGETSTART, start)
+                self.SendScintilla(QsciScintillaBase.SCI_SETTARGETEND, end)
+                self.SendScintilla(QsciScintillaBase.SCI_REPLACETARGET, len(middle), middle)
+            finally:
+                self.endUndoAction()
+        self._index_words(start, start + len(middle), 1)
+        self.line_widths.replace(first_line, old_lines, self._measure_lines(first_line, self._local_line(start + len(middle))))
+        if self.journal is not None:
+            self.journal.record(start, end - start, middle)
+        self.adjust_scroll_bar_policy()
+        self.update_highlighting()
+        return True
+
+    def discard_journal(self):
+        if self.journal is not None:
+            self.journal.discard()
+            self.journal = None
+
+    def _journal_change(self, position, deleted, inserted):
+        if self.journal is None and self.journal_factory is not None:
+            self.journal = self.journal_factory(self, during_edit=True)
+        if self.journal is not None:
+            self.journal.record(position, deleted, inserted)
 
     def setPlainText(self, text):
-        super().setText(text)
+        self.setText(text)
+
+    def memory_estimate(self):
+        if self.hibernated is not None:
+            return len(self.hibernated.data)
+        return 2 * int(self.SendScintilla(QsciScintillaBase.SCI_GETLENGTH))
+
+    def hibernate(self):
+        if self.hibernated is not None:
+            return self.hibernated
+        length = int(self.SendScintilla(QsciScintillaBase.SCI_GETLENGTH))
+        snapshot = TabSnapshot(zlib.compress(bytes(self.bytes(0, length)), 1), length,
+                               self.getCursorPosition(), self.firstVisibleLine())
+        eol, tab_width, use_tabs = self.eolMode(), self.tabWidth(), self.indentationsUseTabs()
+        with QSignalBlocker(self):
+            self.setDocument(QsciDocument())
+            self.setUtf8(True)
+            self.setEolMode(eol)
+            self.setTabWidth(tab_width)
+            self.setIndentationsUseTabs(use_tabs)
+        self.line_widths.reset(array('I', [0]))
+        self.hibernated = snapshot
+        return snapshot
+
+    def wake(self):
+        snapshot = self.hibernated
+        if snapshot is None:
+            return
+        self.hibernated = None
+        lexer = self.lexer()
+        counts, self.word_counts = self.word_counts, None
+        with QSignalBlocker(self):
+            if lexer is not None:
+                super().setLexer(None)
+                self.setLexer(lexer)
+            self.append_text(zlib.decompress(snapshot.data))
+            self.SendScintilla(QsciScintillaBase.SCI_EMPTYUNDOBUFFER)
+            self.setModified(False)
+            self.setCursorPosition(*snapshot.cursor)
+            self.setFirstVisibleLine(snapshot.first_line)
+        self.word_counts = counts
+        self.adjust_scroll_bar_policy()
+
+    def _on_modified(self, position, mtype, text, length, lines_added, line, *args):
+        if self.word_counts is not None and not self._bulk_edit:
+            if mtype & QsciScintillaBase.SC_MOD_BEFOREINSERT:
+                self._index_words(position, position, -1)
+            elif mtype & QsciScintillaBase.SC_MOD_BEFOREDELETE:
+                self._index_words(position, position + length, -1)
+            elif mtype & QsciScintillaBase.SC_MOD_INSERTTEXT:
+                self._index_words(position, position + length, 1)
+            elif mtype & QsciScintillaBase.SC_MOD_DELETETEXT:
+                self._index_words(position, position, 1)
+        if self._bulk_edit or not mtype & (QsciScintillaBase.SC_MOD_INSERTTEXT | QsciScintillaBase.SC_MOD_DELETETEXT):
+            return
+        if mtype & QsciScintillaBase.SC_MOD_INSERTTEXT:
+            self._journal_change(position, 0, bytes(self.bytes(position, position + length)))
+        else:
+            self._journal_change(position, length, b'')
+        first = self._local_line(position)
+        maximum = self.line_widths.maximum
+        if mtype & QsciScintillaBase.SC_MOD_INSERTTEXT:
+            self.line_widths.replace(first, 1, self._measure_lines(first, first + lines_added))
+        else:
+            self.line_widths.replace(first, 1 - lines_added, self._measure_lines(first, first))
+        if self.line_widths.maximum != maximum:
+            self.adjust_scroll_bar_policy()
+
+    def use_word_index(self, index):
+        self.word_index = index
+
+    def start_word_counts(self):
+        self.word_counts = Counter()
+        self.setAutoCompletionSource(QsciScintilla.AcsNone)
+
+    def clear_word_counts(self):
+        if self.word_counts is not None and self.word_index is not None:
+            self.word_index.apply(self.word_counts, -1)
+        self.word_counts = None
+        self.setAutoCompletionSource(QsciScintilla.AcsDocument)
+
+    def _index_words(self, start, end, sign):
+        if self.word_counts is None:
+            return
+        start = int(self.SendScintilla(QsciScintillaBase.SCI_WORDSTARTPOSITION, start, 1))
+        end = int(self.SendScintilla(QsciScintillaBase.SCI_WORDENDPOSITION, end, 1))
+        if start >= end:
+            return
+        counts = count_words(bytes(self.bytes(start, end)))
+        if not counts:
+            return
+        if sign > 0:
+            self.word_counts.update(counts)
+        else:
+            self.word_counts.subtract(counts)
+            for word in counts:
+                if not self.word_counts[word]:
+                    del self.word_counts[word]
+        self.word_index.apply(counts, sign)
+
+    def _on_char_added(self, ch):
+        if self.word_index is None or self.word_counts is None or self.large_document is not None:
+            return
+        pos = int(self.SendScintilla(QsciScintillaBase.SCI_GETCURRENTPOS))
+        start = int(self.SendScintilla(QsciScintillaBase.SCI_WORDSTARTPOSITION, pos, 1))
+        if pos - start < max(1, self.autoCompletionThreshold()):
+            return
+        prefix = bytes(self.bytes(start, pos)).decode('utf-8', errors='replace')
+        words = self.word_index.complete(prefix)
+        if not words:
+            if self.SendScintilla(QsciScintillaBase.SCI_AUTOCACTIVE):
+                self.SendScintilla(QsciScintillaBase.SCI_AUTOCCANCEL)
+            return
+        separator = chr(int(self.SendScintilla(QsciScintillaBase.SCI_AUTOCGETSEPARATOR)))
+        self.SendScintilla(self.SCI_AUTOCSETORDER, self.SC_ORDER_CUSTOM)
+        self.SendScintilla(QsciScintillaBase.SCI_AUTOCSETIGNORECASE, 1)
+        self.SendScintilla(QsciScintillaBase.SCI_AUTOCSETDROPRESTOFWORD, 1)
+        self.SendScintilla(QsciScintillaBase.SCI_AUTOCSHOW, pos - start, separator.join(words).encode('utf-8'))
+
+    def _local_line(self, position):
+        return int(self.SendScintilla(QsciScintillaBase.SCI_LINEFROMPOSITION, position))
+
+    def _measure_lines(self, first, last):
+        if last - first < 64:
+            return array('I', (int(self.SendScintilla(QsciScintillaBase.SCI_GETCOLUMN,
+                                                      self.SendScintilla(QsciScintillaBase.SCI_GETLINEENDPOSITION, line)))
+                               for line in range(first, last + 1)))
+        start = int(self.SendScintilla(QsciScintillaBase.SCI_POSITIONFROMLINE, first))
+        end = int(self.SendScintilla(QsciScintillaBase.SCI_GETLINEENDPOSITION, last))
+        return measure_line_widths(bytes(self.bytes(start, end)), self.tabWidth())
+
+    def rebuild_line_widths(self):
+        length = int(self.SendScintilla(QsciScintillaBase.SCI_GETLENGTH))
+        self.line_widths.reset(measure_line_widths(bytes(self.bytes(0, length)), self.tabWidth()))
 
     def toPlainText(self):
         return super().text()
@@ -594,10 +3614,144 @@ class Editor(QsciScintilla):
         case_sensitive = bool(options & QTextDocument.FindCaseSensitively)
         backward = bool(options & QTextDocument.FindBackward)
         whole_word = bool(options & QTextDocument.FindWholeWords)
+        if self.large_document is not None:
+            return self._find_large(text, case_sensitive, whole_word, backward)
         return self.findFirst(text, False, case_sensitive, whole_word, True, not backward)
 
+    def open_large_document(self, document):
+        self.close_large_document()
+        self.large_document = document
+        self.setWrapMode(QsciScintilla.WrapNone)
+        self.setReadOnly(True)
+        self.load_window(0)
+        indexer = LineIndexer(document.index, document.buf)
+        indexer.progress.connect(lambda done, total: self._on_large_index_progress())
+        self.line_indexer = indexer
+        indexer.start()
+
+    def close_large_document(self):
+        indexer = self.line_indexer
+        if indexer is not None:
+            try:
+                indexer.cancel()
+                indexer.wait()
+            except RuntimeError:
+                pass
+            self.line_indexer = None
+        if self.large_document is not None:
+            self.large_document.close()
+            self.large_document = None
+            self.setReadOnly(False)
+
+    def _on_large_index_progress(self):
+        self._check_large_window()
+        self.largeIndexProgress.emit()
+
+    def load_window(self, line):
+        doc = self.large_document
+        start = max(0, min(line - self.large_window_lines // 2, doc.index.newlines))
+        data, end = doc.read_lines(start, self.large_window_lines)
+        self._window_loading = True
+        try:
+            with QSignalBlocker(self):
+                self.setReadOnly(False)
+                self.SendScintilla(QsciScintillaBase.SCI_CLEARALL)
+                self.SendScintilla(QsciScintillaBase.SCI_APPENDTEXT, len(data), data)
+                self.SendScintilla(QsciScintillaBase.SCI_EMPTYUNDOBUFFER)
+                self.setReadOnly(True)
+                self.setModified(False)
+        finally:
+            self._window_loading = False
+        self.line_widths.reset(measure_line_widths(data, self.tabWidth()))
+        self.adjust_scroll_bar_policy()
+        self.window_start = start
+        self.window_end_offset = end
+
+    def _check_large_window(self, *args):
+        doc = self.large_document
+        if doc is None or self._window_loading:
+            return
+        first = int(self.SendScintilla(QsciScintillaBase.SCI_DOCLINEFROMVISIBLE, self.firstVisibleLine()))
+        visible = max(1, int(self.SendScintilla(QsciScintillaBase.SCI_LINESONSCREEN)))
+        loaded = self.lines()
+        above = self.window_start > 0 and first < visible
+        below = self.window_end_offset < doc.size and first + 2 * visible > loaded
+        if not (above or below):
+            return
+        cursor_line, cursor_index = self.getCursorPosition()
+        cursor_line += self.window_start
+        top = self.window_start + first
+        self.load_window(top)
+        self._place_window_cursor(cursor_line, cursor_index, top)
+
+    def _place_window_cursor(self, line, index, top):
+        local = line - self.window_start
+        if 0 <= local < self.lines():
+            self.setCursorPosition(local, index)
+        self.setFirstVisibleLine(max(0, top - self.window_start))
+
+    def line_count(self):
+        doc = self.large_document
+        if doc is not None:
+            return doc.index.line_count
+        return int(self.SendScintilla(QsciScintillaBase.SCI_GETLINECOUNT))
+
+    def line_to_position(self, line):
+        doc = self.large_document
+        if doc is not None:
+            return doc.index.line_to_offset(line)
+        return int(self.SendScintilla(QsciScintillaBase.SCI_POSITIONFROMLINE, line))
+
+    def position_to_line(self, position):
+        doc = self.large_document
+        if doc is not None:
+            return doc.index.offset_to_line(position)
+        return int(self.SendScintilla(QsciScintillaBase.SCI_LINEFROMPOSITION, position))
+
+    def go_to_line(self, line):
+        doc = self.large_document
+        if doc is None:
+            line = max(0, min(int(line), self.line_count() - 1))
+            self.SendScintilla(QsciScintillaBase.SCI_GOTOLINE, line)
+            self.SendScintilla(QsciScintillaBase.SCI_VERTICALCENTRECARET)
+            return
+        line = max(0, min(int(line), doc.index.line_count - 1))
+        local = line - self.window_start
+        if not (0 <= local < self.lines()) or (self.window_start > 0 and local < self.large_window_lines // 4) or (self.window_end_offset < doc.size and local > self.lines() - self.large_window_lines // 4):
+            self.load_window(line)
+        local = line - self.window_start
+        self.setCursorPosition(local, 0)
+        self.ensureLineVisible(local)
+
+    def _file_offset(self, local_line, index):
+        doc = self.large_document
+        prefix = self.text(local_line)[:index]
+        return doc.index.line_to_offset(self.window_start + local_line) + len(prefix.encode(doc.encoding, errors='replace'))
+
+    def _find_large(self, text, case_sensitive, whole_word, backward):
+        doc = self.large_document
+        if self.hasSelectedText():
+            line_from, index_from, line_to, index_to = self.getSelection()
+        else:
+            line_from, index_from = self.getCursorPosition()
+            line_to, index_to = line_from, index_from
+        origin = self._file_offset(line_from, index_from) if backward else self._file_offset(line_to, index_to)
+        found = doc.find(text, origin, backward, case_sensitive, whole_word)
+        if found is None:
+            return False
+        offset, length = found
+        line = doc.index.offset_to_line(offset)
+        self.go_to_line(line)
+        line_start = doc.index.line_to_offset(line)
+        column = len(doc.buf[line_start:offset].decode(doc.encoding, errors='replace'))
+        width = len(doc.buf[offset:offset + length].decode(doc.encoding, errors='replace'))
+        local = line - self.window_start
+        self.setSelection(local, column, local, column + width)
+        return True
+
     def textCursor(self):
         line, index = self.getCursorPosition()
+        line += self.window_start if self.large_document is not None else 0
         class CursorWrapper:
             def __init__(self, line, index):
                 self._line = line
@@ -609,12 +3763,13 @@ class Editor(QsciScintilla):
         return CursorWrapper(line, index)
 
     def adjust_scroll_bar_policy(self):
-        text = self.text()
-        if not text:
+        if len(self.line_widths) != self.lines():
+            self.rebuild_line_widths()
+        columns = self.line_widths.maximum
+        if not columns:
             self.setHorizontalScrollBarPolicy(Qt.ScrollBarAlwaysOff)
             return
-        fm = self.fontMetrics()
-        max_width = max(fm.horizontalAdvance(line) for line in text.split('\n'))
+        max_width = columns * int(self.SendScintilla(QsciScintillaBase.SCI_TEXTWIDTH, QsciScintillaBase.STYLE_DEFAULT, b'M'))
         if max_width > self.viewport().width():
             self.setHorizontalScrollBarPolicy(Qt.ScrollBarAsNeeded)
         else:
@@ -644,297 +3799,184 @@ class Construct(QMainWindow):
         super().__init__()
         self.current_file = file_to_open
         self.file_handler = None
+        self.loaderPool = None
+        self.wordIndex = WordIndex()
+        self.projectWords = None
+        self.projectWordJob = None
+        self._pending_opens = []
         self._open_generation = 0
         self.unsaved_changes = False
         self._lexer = None
         self.fileTreeDock = None
+        self.findInFilesDock = None
+        self.findInFilesPanel = None
         self.fileModel = None
         self.fileTreeView = None
         self.current_folder = None
         self.repo = None
+        self.gitWorker = None
+        self.gitStatusWorker = None
+        self.gitSnapshot = None
+        self.gitDirWatcher = None
+        self.fileProxy = None
+        self._loaded_dirs = set()
+        self._git_status_paths = set()
+        self._git_status_full = False
+        self.gitStatusTimer = QTimer(self)
+        self.gitStatusTimer.setSingleShot(True)
+        self.gitStatusTimer.setInterval(300)
+        self.gitStatusTimer.timeout.connect(self._flush_git_status)
+        self.hibernateTimer = QTimer(self)
+        self.hibernateTimer.setInterval(60 * 1000)
+        self.hibernateTimer.timeout.connect(self.hibernateInactiveTabs)
+        self.hibernateTimer.start()
+        self.session_enabled = False
+        self._restoring_session = False
+        self.journalWriter = None
+        self.journalDir = None
+        self.journalLock = None
         self.loadRecentFiles()
+        self.editorResources = EditorResources(self.settings)
+        self.editorPool = EditorPool(self, self.settings.value("tabs/prewarmedEditors", 2, type=int))
         self.initUI()
+        STARTUP_PROFILER.mark("initUI")
         if file_to_open:
             self.load_file_on_startup(file_to_open)
         self.app_context = {"main_window": self}
-        self.plugins = load_plugins(self.app_context)
-
-    def _available_language_lexers(self):
-        mapping = {"Plain Text": None}
-        if QsciLexerPython: mapping["Python"] = QsciLexerPython
-        if QsciLexerCPP: mapping["C++"] = QsciLexerCPP
-        if QsciLexerCSharp: mapping["C#"] = QsciLexerCSharp
-        if QsciLexerJava: mapping["Java"] = QsciLexerJava
-        if QsciLexerJavaScript: mapping["JavaScript"] = QsciLexerJavaScript
-        if QsciLexerJSON or QsciLexerJavaScript: mapping["JSON"] = QsciLexerJSON or QsciLexerJavaScript
-        if QsciLexerHTML: mapping["HTML"] = QsciLexerHTML
-        if QsciLexerCSS: mapping["CSS"] = QsciLexerCSS
-        if QsciLexerLua: mapping["Lua"] = QsciLexerLua
-        if QsciLexerSQL: mapping["SQL"] = QsciLexerSQL
-        if QsciLexerRuby: mapping["Ruby"] = QsciLexerRuby
-        if QsciLexerPascal: mapping["Pascal"] = QsciLexerPascal
-        if QsciLexerPerl: mapping["Perl"] = QsciLexerPerl
-        if QsciLexerMakefile: mapping["Makefile"] = QsciLexerMakefile
-        if QsciLexerCMake: mapping["CMake"] = QsciLexerCMake
-        if QsciLexerMarkdown: mapping["Markdown"] = QsciLexerMarkdown
-        if QsciLexerBash: mapping["Bash"] = QsciLexerBash
-        if QsciLexerBatch: mapping["Batch"] = QsciLexerBatch
-        if QsciLexerDiff: mapping["Diff"] = QsciLexerDiff
-        if QsciLexerASM: mapping["ASM"] = QsciLexerASM
-        if QsciLexerMASM: mapping["MASM"] = QsciLexerMASM
-        if QsciLexerNASM: mapping["NASM"] = QsciLexerNASM
-        if QsciLexerAVS: mapping["AVS"] = QsciLexerAVS
-        if QsciLexerCoffeeScript: mapping["CoffeeScript"] = QsciLexerCoffeeScript
-        if QsciLexerD: mapping["D"] = QsciLexerD
-        if QsciLexerEDIFACT: mapping["EDIFACT"] = QsciLexerEDIFACT
-        if QsciLexerFortran: mapping["Fortran"] = QsciLexerFortran
-        if QsciLexerFortran77: mapping["Fortran77"] = QsciLexerFortran77
-        if QsciLexerHex: mapping["Hex"] = QsciLexerHex
-        if QsciLexerIntelHex: mapping["Intel Hex"] = QsciLexerIntelHex
-        if QsciLexerSRec: mapping["S-Record"] = QsciLexerSRec
-        if QsciLexerTekHex: mapping["Tektronix Hex"] = QsciLexerTekHex
-        if QsciLexerIDL: mapping["IDL"] = QsciLexerIDL
-        if QsciLexerOctave: mapping["Octave"] = QsciLexerOctave
-        if QsciLexerMatlab: mapping["Matlab"] = QsciLexerMatlab
-        if QsciLexerPO: mapping["PO"] = QsciLexerPO
-        if QsciLexerPOV: mapping["POV"] = QsciLexerPOV
-        if QsciLexerPostScript: mapping["PostScript"] = QsciLexerPostScript
-        if QsciLexerProperties: mapping["Properties"] = QsciLexerProperties
-        if QsciLexerSpice: mapping["Spice"] = QsciLexerSpice
-        if QsciLexerTCL: mapping["TCL"] = QsciLexerTCL
-        if QsciLexerTeX: mapping["TeX"] = QsciLexerTeX
-        if QsciLexerVerilog: mapping["Verilog"] = QsciLexerVerilog
-        if QsciLexerVHDL: mapping["VHDL"] = QsciLexerVHDL
-        if QsciLexerXML: mapping["XML"] = QsciLexerXML
-        if QsciLexerYAML: mapping["YAML"] = QsciLexerYAML
-        return mapping
+        self.plugins = []
+        self._plugins_scheduled = False
+        self.instanceServer = None
+
+    def listen_for_instances(self, name):
+        server = QLocalServer(self)
+        server.setSocketOptions(QLocalServer.UserAccessOption)
+        if not server.listen(name):
+            probe = QLocalSocket()
+            probe.connectToServer(name)
+            if probe.waitForConnected(500):
+                probe.disconnectFromServer()
+                logging.warning("Single-instance server %s is held by another running instance", name)
+                return False
+            QLocalServer.removeServer(name)
+            if not server.listen(name):
+                logging.warning("Single-instance server unavailable: %s", server.errorString())
+                return False
+        server.newConnection.connect(self._on_instance_connection)
+        self.instanceServer = server
+        return True
 
-    def _current_language_name(self):
-        if not self._lexer:
-            return "Plain Text"
-        mapping = self._available_language_lexers()
-        for name, cls in mapping.items():
-            if not cls:
-                continue
+    def _on_instance_connection(self):
+        server = self.instanceServer
+        while server.hasPendingConnections():
+            sock = server.nextPendingConnection()
+            sock.setProperty('buffer', b'')
+            sock.readyRead.connect(partial(self._on_instance_data, sock))
+            sock.disconnected.connect(sock.deleteLater)
+            self._on_instance_data(sock)
+
+    def _on_instance_data(self, sock):
+        buffer = bytes(sock.property('buffer') or b'') + bytes(sock.readAll())
+        *lines, rest = buffer.split(b'\n')
+        sock.setProperty('buffer', rest)
+        for line in lines:
             try:
-                if isinstance(self._lexer, cls):
-                    return name
+                entries = json.loads(line.decode('utf-8')).get("files", [])
             except Exception:
                 continue
-        return "Plain Text"
+            self.open_files(entries)
+            if self.isMinimized():
+                self.showNormal()
+            self.raise_()
+            self.activateWindow()
+
+    def open_files(self, entries):
+        for path, line in entries:
+            ed = self._find_open_editor(path)
+            if ed is not None:
+                self.tabWidget.setCurrentWidget(ed)
+            else:
+                ed = self.load_file_on_startup(path)
+            if ed is not None and line:
+                self._go_to_line(ed, max(0, int(line) - 1))
+
+    def showEvent(self, event):
+        super().showEvent(event)
+        if not self._plugins_scheduled:
+            self._plugins_scheduled = True
+            QTimer.singleShot(0, self._load_plugins)
+
+    def _load_plugins(self):
+        STARTUP_PROFILER.mark("first paint")
+        self.editorPool.start()
+        self.plugins = load_plugins(self.app_context)
+        STARTUP_PROFILER.mark("plugins")
 
-    def setLexerByLanguageName(self, language_name):
+    def _current_language_name(self):
         ed = self.currentEditor()
+        return LEXERS.name_of(ed.lexer() if ed is not None else None)
+
+    def setLexerByLanguageName(self, language_name, ed=None):
+        if ed is None:
+            ed = self.currentEditor()
         if ed is None:
             return False
         if not language_name or language_name == "Plain Text":
-            ed.setLexer(None)
-            self._lexer = None
+            self._set_editor_lexer(ed, None)
             return True
-        mapping = self._available_language_lexers()
-        cls = mapping.get(language_name)
+        cls = LEXERS.languages.get(language_name)
         if not cls:
             return False
         try:
-            lexer = cls(ed)
-            self._apply_uniform_lexer_font(lexer)
-            ed.setLexer(lexer)
-            self._lexer = lexer
+            self._set_editor_lexer(ed, cls)
             return True
         except Exception:
             return False
 
-    def _applySavedSyntaxOrDetect(self, path_like):
+    def _set_editor_lexer(self, ed, cls):
+        current = ed.lexer()
+        if cls is None:
+            if current is not None:
+                ed.setLexer(None)
+        elif type(current) is not cls:
+            lexer = ed.lexer_cache.get(cls)
+            if lexer is None:
+                lexer = ed.lexer_cache[cls] = LEXERS.create(cls, ed)
+            ed.setLexer(lexer)
+        if ed is self.currentEditor():
+            self._lexer = ed.lexer()
+
+    def _applySavedSyntaxOrDetect(self, path_like, ed=None):
         base = os.path.realpath(path_like).replace('\\','/') if path_like else None
         if base:
             key = f"syntax/overrides/{base}"
             saved = self.settings.value(key, None, type=str)
-            if saved and self.setLexerByLanguageName(saved):
+            if saved and self.setLexerByLanguageName(saved, ed):
                 return
-        self.setLexerForFilePath(path_like)
+        self.setLexerForFilePath(path_like, ed)
 
-    def setLexerForFilePath(self, path_like):
-        ed = self.currentEditor()
+    def setLexerForFilePath(self, path_like, ed=None):
+        if ed is None:
+            ed = self.currentEditor()
         if ed is None:
             return
-        base = os.path.basename(path_like) if path_like else ""
-        base_lower = base.lower()
-        ext = os.path.splitext(base_lower)[1].lower() if base_lower else ""
-        lexer = None
-        if base_lower in {"cmakelists.txt"} and QsciLexerCMake:
-            lexer = QsciLexerCMake(ed)
-        elif base_lower in {"makefile", "gnumakefile"} and QsciLexerMakefile:
-            lexer = QsciLexerMakefile(ed)
-        elif ext in {".py", ".pyw"} and QsciLexerPython:
-            lexer = QsciLexerPython(ed)
-        elif ext in {".c", ".h", ".cpp", ".hpp", ".cc", ".cxx", ".hh", ".hxx"} and QsciLexerCPP:
-            lexer = QsciLexerCPP(ed)
-        elif ext in {".cs"} and QsciLexerCSharp:
-            lexer = QsciLexerCSharp(ed)
-        elif ext in {".js", ".jsx", ".ts", ".tsx"} and QsciLexerJavaScript:
-            lexer = QsciLexerJavaScript(ed)
-        elif ext in {".json"}:
-            if QsciLexerJSON:
-                lexer = QsciLexerJSON(ed)
-            elif QsciLexerJavaScript:
-                lexer = QsciLexerJavaScript(ed)
-        elif ext in {".css"} and QsciLexerCSS:
-            lexer = QsciLexerCSS(ed)
-        elif ext in {".html", ".htm"} and QsciLexerHTML:
-            lexer = QsciLexerHTML(ed)
-        elif ext in {".java"} and QsciLexerJava:
-            lexer = QsciLexerJava(ed)
-        elif ext in {".asm"} and QsciLexerASM:
-            lexer = QsciLexerASM(ed)
-        elif ext in {".avs"} and QsciLexerAVS:
-            lexer = QsciLexerAVS(ed)
-        elif ext in {".sh", ".bash", ".zsh"} and QsciLexerBash:
-            lexer = QsciLexerBash(ed)
-        elif ext in {".bat", ".cmd"} and QsciLexerBatch:
-            lexer = QsciLexerBatch(ed)
-        elif ext in {".cmake"} and QsciLexerCMake:
-            lexer = QsciLexerCMake(ed)
-        elif ext in {".coffee"} and QsciLexerCoffeeScript:
-            lexer = QsciLexerCoffeeScript(ed)
-        elif ext in {".d"} and QsciLexerD:
-            lexer = QsciLexerD(ed)
-        elif ext in {".diff", ".patch"} and QsciLexerDiff:
-            lexer = QsciLexerDiff(ed)
-        elif ext in {".edi", ".edifact"} and QsciLexerEDIFACT:
-            lexer = QsciLexerEDIFACT(ed)
-        elif ext in {".f90", ".f95", ".f03", ".f08"} and QsciLexerFortran:
-            lexer = QsciLexerFortran(ed)
-        elif ext in {".f", ".for", ".f77"} and (QsciLexerFortran77 or QsciLexerFortran):
-            lexer = (QsciLexerFortran77 or QsciLexerFortran)(ed)
-        elif ext in {".hex"} and QsciLexerHex:
-            lexer = QsciLexerHex(ed)
-        elif ext in {".idl"} and QsciLexerIDL:
-            lexer = QsciLexerIDL(ed)
-        elif ext in {".ihex", ".ihx"} and QsciLexerIntelHex:
-            lexer = QsciLexerIntelHex(ed)
-        elif ext in {".xml"} and QsciLexerXML:
-            lexer = QsciLexerXML(ed)
-        elif ext in {".md", ".markdown"} and QsciLexerMarkdown:
-            lexer = QsciLexerMarkdown(ed)
-        elif ext in {".rb"} and QsciLexerRuby:
-            lexer = QsciLexerRuby(ed)
-        elif ext in {".sql"} and QsciLexerSQL:
-            lexer = QsciLexerSQL(ed)
-        elif ext in {".lua"} and QsciLexerLua:
-            lexer = QsciLexerLua(ed)
-        elif ext in {".mak"} and QsciLexerMakefile:
-            lexer = QsciLexerMakefile(ed)
-        elif ext in {".masm"} and QsciLexerMASM:
-            lexer = QsciLexerMASM(ed)
-        elif ext in {".matlab"} and QsciLexerMatlab:
-            lexer = QsciLexerMatlab(ed)
-        elif ext in {".nasm"} and QsciLexerNASM:
-            lexer = QsciLexerNASM(ed)
-        elif ext in {".m"} and (QsciLexerMatlab or QsciLexerOctave):
-            preferred = QsciLexerMatlab or QsciLexerOctave
-            lexer = preferred(ed)
-        elif ext in {".octave"} and QsciLexerOctave:
-            lexer = QsciLexerOctave(ed)
-        elif ext in {".pas", ".pp"} and QsciLexerPascal:
-            lexer = QsciLexerPascal(ed)
-        elif ext in {".pl", ".pm", ".t"} and QsciLexerPerl:
-            lexer = QsciLexerPerl(ed)
-        elif ext in {".po"} and QsciLexerPO:
-            lexer = QsciLexerPO(ed)
-        elif ext in {".ps", ".eps"} and QsciLexerPostScript:
-            lexer = QsciLexerPostScript(ed)
-        elif ext in {".pov"} and QsciLexerPOV:
-            lexer = QsciLexerPOV(ed)
-        elif ext in {".properties"} and QsciLexerProperties:
-            lexer = QsciLexerProperties(ed)
-        elif ext in {".sp", ".cir", ".ckt", ".spice"} and QsciLexerSpice:
-            lexer = QsciLexerSpice(ed)
-        elif ext in {".srec", ".s19", ".s28", ".s37"} and QsciLexerSRec:
-            lexer = QsciLexerSRec(ed)
-        elif ext in {".tek", ".tekhex"} and QsciLexerTekHex:
-            lexer = QsciLexerTekHex(ed)
-        elif ext in {".tcl"} and QsciLexerTCL:
-            lexer = QsciLexerTCL(ed)
-        elif ext in {".tex"} and QsciLexerTeX:
-            lexer = QsciLexerTeX(ed)
-        elif ext in {".v", ".sv"} and QsciLexerVerilog:
-            lexer = QsciLexerVerilog(ed)
-        elif ext in {".vhd", ".vhdl"} and QsciLexerVHDL:
-            lexer = QsciLexerVHDL(ed)
-        elif ext in {".yaml", ".yml"} and QsciLexerYAML:
-            lexer = QsciLexerYAML(ed)
-        if lexer is not None:
-            self._apply_uniform_lexer_font(lexer)
-            ed.setLexer(lexer)
-            self._lexer = lexer
-        else:
-            ed.setLexer(None)
-            self._lexer = None
+        cls = LEXERS.for_path(path_like)
+        setattr(ed, 'sniff_lexer', cls is None and bool(path_like))
+        self._set_editor_lexer(ed, cls)
 
-    def _apply_uniform_lexer_font(self, lexer):
-        ed = self.currentEditor()
-        base = None
-        if ed is not None:
-            base = getattr(ed, 'preferred_font', None) or ed.font()
-        if base is None:
-            try:
-                base = QFontDatabase.systemFont(QFontDatabase.FixedFont)
-            except Exception:
-                base = QFont('monospace', 10)
-        font = QFont(base)
-        try:
-            font.setBold(False)
-        except Exception:
-            pass
-        try:
-            font.setItalic(False)
-        except Exception:
-            pass
-        try:
-            if hasattr(lexer, 'setDefaultFont'):
-                lexer.setDefaultFont(font)
-        except Exception:
-            pass
-        try:
-            bits = int(lexer.styleBitsNeeded()) if hasattr(lexer, 'styleBitsNeeded') else 7
-            max_styles = (1 << bits) if bits and bits > 0 else 128
-        except Exception:
-            max_styles = 128
-        for style in range(max_styles):
-            try:
-                desc = None
-                try:
-                    desc = lexer.description(style)
-                except Exception:
-                    desc = None
-                if desc is not None:
-                    lexer.setFont(font, style)
-            except Exception:
-                continue
+    def _sniff_lexer(self, ed, head):
+        setattr(ed, 'sniff_lexer', False)
+        cls = LEXERS.sniff(head)
+        if cls is not None:
+            self._set_editor_lexer(ed, cls)
 
     def load_file_on_startup(self, file_path):
         if os.path.exists(file_path):
-            ed = self.currentEditor()
-            reuse = False
-            if ed is not None:
-                idx = self.tabWidget.indexOf(ed)
-                try:
-                    title = self.tabWidget.tabText(idx) if idx != -1 else ""
-                except Exception:
-                    title = ""
-                is_untitled = (title.strip().lower() == 'untitled') and not getattr(ed, 'file_path', None)
-                try:
-                    empty = not bool(ed.text())
-                except Exception:
-                    empty = True
-                reuse = is_untitled and empty
-            if not reuse:
-                ed = Editor(self)
-                ed.setEolMode(QsciScintilla.EolWindows)
-                self._attach_editor(ed, os.path.basename(file_path))
+            ed = self._editor_for_open(os.path.basename(file_path))
             self._start_file_load(ed, file_path)
+            return ed
         else:
             QMessageBox.critical(self, "Error", f"File does not exist: {file_path}")
+            return None
 
     def closeEvent(self, event):
         ed = self.currentEditor()
@@ -943,22 +3985,26 @@ class Construct(QMainWindow):
             dialog = UnsavedWorkDialog(self)
             result = dialog.exec_()
             if result == QDialog.Accepted:
-                success = self.saveFile()
+                success = self.saveFile(wait=True)
                 if success:
-                    self._safe_wait_for_handler()
+                    self.saveSession()
+                    self._shutdown_workers()
                     event.accept()
                 else:
                     event.ignore()
             elif result == QDialog.Rejected:
                 event.ignore()
             elif result == 2:
-                self._safe_wait_for_handler()
+                self.saveSession()
+                self._shutdown_workers()
                 event.accept()
             else:
-                self._safe_wait_for_handler()
+                self.saveSession()
+                self._shutdown_workers()
                 event.accept()
         else:
-            self._safe_wait_for_handler()
+            self.saveSession()
+            self._shutdown_workers()
             event.accept()
 
     def initUI(self):
@@ -976,20 +4022,25 @@ class Construct(QMainWindow):
         self.setCentralWidget(self.tabWidget)
         self.statusBar = QStatusBar(self)
         self.setStatusBar(self.statusBar)
+        self.gitStatusLabel = QLabel("", self)
+        self.statusBar.addPermanentWidget(self.gitStatusLabel)
         self.line = 1
         self.column = 1
         self.char_count = 0
+        self.line_count = 0
         self.createMenu()
         self.terminalDock = QDockWidget("Terminal", self)
         self.terminalDock.setVisible(False)
-        self.terminal = TerminalWidget()
-        self.terminalDock.setWidget(self.terminal)
+        self.terminal = None
         self.terminalDock.setAllowedAreas(Qt.BottomDockWidgetArea)
         self.addDockWidget(Qt.BottomDockWidgetArea, self.terminalDock)
         self.isTerminalVisible = False
         self.newFile()
 
     def toggle_terminal(self):
+        if self.terminal is None:
+            self.terminal = TerminalWidget()
+            self.terminalDock.setWidget(self.terminal)
         state = False if self.isTerminalVisible else True
         self.terminalDock.setVisible(state)
         self.isTerminalVisible = state
@@ -1006,24 +4057,34 @@ class Construct(QMainWindow):
         except Exception:
             return None
 
-    def _attach_editor(self, ed: 'Editor', title: str):
+    def _attach_editor(self, ed: 'Editor', title: str, activate=True):
         setattr(ed, 'file_path', None)
         setattr(ed, 'encoding', 'UTF-8')
         setattr(ed, 'newline', '\r\n')
         setattr(ed, 'unsaved_changes', False)
         setattr(ed, 'file_handler', None)
+        setattr(ed, 'compression', None)
         setattr(ed, 'open_generation', 0)
-        wrapEnabled = self.settings.value("wordWrap", False, type=bool)
+        setattr(ed, 'counted_lines', 0)
+        setattr(ed, 'pending_line', None)
+        ed.journal_factory = self._create_journal
+        ed.use_word_index(self.wordIndex)
+        self._index_editor_words(ed)
+        self._apply_highlighting_settings(ed)
+        wrapEnabled = self.editorResources.value("wordWrap", False, bool)
         ed.setWrapMode(QsciScintilla.WrapWord if wrapEnabled else QsciScintilla.WrapNone)
-        self.zoom_level = self.settings.value("view/zoom", 0, type=int)
+        self.zoom_level = self.editorResources.value("view/zoom", 0, int)
         try:
             ed.zoomTo(int(self.zoom_level))
         except Exception:
             pass
         ed.cursorPositionChanged.connect(self.updateStatusBar)
         ed.zoomChanged.connect(self._on_zoom_changed)
+        ed.largeIndexProgress.connect(partial(self._on_large_index_progress, ed))
         ed.textChanged.connect(self.on_text_changed)
         idx = self.tabWidget.addTab(ed, title)
+        if not activate:
+            return
         self.tabWidget.setCurrentIndex(idx)
         self.textEdit = ed
         self.encoding = 'UTF-8'
@@ -1031,15 +4092,116 @@ class Construct(QMainWindow):
         self.unsaved_changes = False
         self.updateStatusBar(after_save=True)
 
+    def _can_hibernate(self, ed):
+        return (isinstance(ed, Editor) and ed is not self.currentEditor() and ed.hibernated is None
+                and getattr(ed, 'session_entry', None) is None
+                and ed.large_document is None and not self._is_loading(ed)
+                and getattr(ed, 'file_saver', None) is None
+                and not getattr(ed, 'unsaved_changes', False))
+
+    def hibernateInactiveTabs(self, force=False):
+        idle_minutes = self.settings.value("tabs/hibernateAfterMinutes", 30, type=int)
+        budget = self.settings.value("tabs/memoryBudgetMB", 512, type=int) * 1024 * 1024
+        now = time.monotonic()
+        editors = [self.tabWidget.widget(i) for i in range(self.tabWidget.count())]
+        editors = [ed for ed in editors if isinstance(ed, Editor)]
+        candidates = sorted((ed for ed in editors if self._can_hibernate(ed)), key=lambda ed: ed.last_active)
+        resident = sum(ed.memory_estimate() for ed in editors)
+        for ed in candidates:
+            idle = idle_minutes > 0 and now - ed.last_active > idle_minutes * 60
+            over = budget > 0 and resident > budget
+            if not (force or idle or over):
+                continue
+            before = ed.memory_estimate()
+            ed.hibernate()
+            resident -= before - ed.memory_estimate()
+
+    def showTabMemory(self):
+        dlg = QDialog(self)
+        dlg.setWindowTitle("Tab Memory")
+        layout = QVBoxLayout(dlg)
+        tree = QTreeWidget(dlg)
+        tree.setHeaderLabels(["Tab", "State", "Document", "Memory", "Idle"])
+        tree.setRootIsDecorated(False)
+        layout.addWidget(tree)
+        summary = QLabel(dlg)
+        layout.addWidget(summary)
+        buttons = QHBoxLayout()
+        hibernate_button = QPushButton("Hibernate Inactive Tabs", dlg)
+        close_button = QPushButton("Close", dlg)
+        buttons.addStretch(1)
+        buttons.addWidget(hibernate_button)
+        buttons.addWidget(close_button)
+        layout.addLayout(buttons)
+
+        def populate():
+            tree.clear()
+            now = time.monotonic()
+            total = 0
+            for i in range(self.tabWidget.count()):
+                ed = self.tabWidget.widget(i)
+                if not isinstance(ed, Editor):
+                    continue
+                memory = ed.memory_estimate()
+                total += memory
+                if ed.hibernated is not None:
+                    state, size = "Hibernated", ed.hibernated.size
+                elif ed.large_document is not None:
+                    state, size = "Large file", ed.large_document.size
+                else:
+                    state, size = "Active" if ed is self.currentEditor() else "Loaded", int(ed.SendScintilla(QsciScintillaBase.SCI_GETLENGTH))
+                idle = 0 if ed is self.currentEditor() else now - ed.last_active
+                tree.addTopLevelItem(QTreeWidgetItem([
+                    self.tabWidget.tabText(i), state, f"{size / 1024:.0f} KB", f"{memory / 1024:.0f} KB", f"{idle / 60:.0f} min"]))
+            for column in range(tree.columnCount()):
+                tree.resizeColumnToContents(column)
+            budget = self.settings.value("tabs/memoryBudgetMB", 512, type=int)
+            summary.setText(f"Estimated total: {total / (1024 * 1024):.1f} MB of {budget} MB budget")
+
+        hibernate_button.clicked.connect(lambda: (self.hibernateInactiveTabs(force=True), populate()))
+        close_button.clicked.connect(dlg.accept)
+        populate()
+        dlg.resize(640, 400)
+        dlg.exec_()
+
+    def _apply_highlighting_settings(self, ed):
+        background = self.editorResources.value("view/backgroundHighlighting", True, bool)
+        threshold = self.editorResources.value("view/cheapHighlightingThresholdMB", 64, int)
+        ed.configure_highlighting(background, threshold * 1024 * 1024)
+
+    def toggleBackgroundHighlighting(self, checked):
+        self.editorResources.set_value("view/backgroundHighlighting", checked)
+        for i in range(self.tabWidget.count()):
+            ed = self.tabWidget.widget(i)
+            if isinstance(ed, Editor):
+                self._apply_highlighting_settings(ed)
+
     def _on_tab_changed(self, index):
         ed = self.currentEditor()
         if not ed:
             return
+        previous = getattr(self, 'textEdit', None)
+        if isinstance(previous, Editor) and previous is not ed:
+            previous.last_active = time.monotonic()
+            if self._is_loading(previous):
+                self._loader_pool().prioritize(previous.file_handler, 1)
+        if self._is_loading(ed):
+            self._loader_pool().prioritize(ed.file_handler, 0)
         self.textEdit = ed
         self.current_file = getattr(ed, 'file_path', None)
         self.encoding = getattr(ed, 'encoding', 'UTF-8')
         self.newline = getattr(ed, 'newline', '\r\n')
         self.unsaved_changes = getattr(ed, 'unsaved_changes', False)
+        if isinstance(ed, Editor):
+            ed.wake()
+            ed.last_active = time.monotonic()
+            if ed.file_watcher is not None and ed.file_watcher.stale:
+                ed.file_watcher.check()
+            with QSignalBlocker(self.actions['followtail']):
+                self.actions['followtail'].setChecked(ed.follow_tail)
+            if getattr(ed, 'session_entry', None) is not None and not self._restoring_session:
+                self._load_session_tab(ed)
+        self._lexer = ed.lexer()
         title = os.path.basename(self.current_file) if self.current_file else 'Unnamed'
         self.setWindowTitle(f'Construct - {title}')
         self.updateStatusBar(after_save=True)
@@ -1067,6 +4229,10 @@ class Construct(QMainWindow):
         openAction.triggered.connect(self.openFile)
         menu.addAction(openAction)
         self.actions['open'] = openAction
+        openAllAction = QAction('Open All Files in Folder...', self)
+        openAllAction.triggered.connect(self.openFolderFiles)
+        menu.addAction(openAllAction)
+        self.actions['openallinfolder'] = openAllAction
         openFolderAction = QAction('Open Folder...', self)
         openFolderAction.setShortcut('Ctrl+Shift+O')
         openFolderAction.triggered.connect(self.openFolder)
@@ -1074,12 +4240,12 @@ class Construct(QMainWindow):
         self.actions['openfolder'] = openFolderAction
         saveAction = QAction('Save', self)
         saveAction.setShortcut('Ctrl+S')
-        saveAction.triggered.connect(self.saveFile)
+        saveAction.triggered.connect(lambda: self.saveFile())
         menu.addAction(saveAction)
         self.actions['save'] = saveAction
         saveAsAction = QAction('Save As...', self)
         saveAsAction.setShortcut('Ctrl+Shift+S')
-        saveAsAction.triggered.connect(self.saveFileAs)
+        saveAsAction.triggered.connect(lambda: self.saveFileAs())
         menu.addAction(saveAsAction)
         self.actions['saveas'] = saveAsAction
         importFromWebAction = QAction('Import From Web...', self)
@@ -1133,6 +4299,16 @@ class Construct(QMainWindow):
         findReplaceAction.setShortcut('Ctrl+F')
         menu.addAction(findReplaceAction)
         self.actions['findreplace'] = findReplaceAction
+        goToLineAction = QAction('Go To Line...', self)
+        goToLineAction.triggered.connect(self.goToLine)
+        goToLineAction.setShortcut('Ctrl+G')
+        menu.addAction(goToLineAction)
+        self.actions['gotoline'] = goToLineAction
+        findInFilesAction = QAction('Find in Files...', self)
+        findInFilesAction.triggered.connect(self.openFindInFiles)
+        findInFilesAction.setShortcut('Ctrl+Shift+F')
+        menu.addAction(findInFilesAction)
+        self.actions['findinfiles'] = findInFilesAction
 
     def createGitActions(self, menu):
         openRepoAction = QAction('Open Repository...', self)
@@ -1200,6 +4376,13 @@ class Construct(QMainWindow):
         discardFileAction.triggered.connect(self.discardCurrentFileChanges)
         menu.addAction(discardFileAction)
 
+        menu.addSeparator()
+        cancelGitAction = QAction('Cancel Git Operation', self)
+        cancelGitAction.setEnabled(False)
+        cancelGitAction.triggered.connect(self.cancelGitOperation)
+        menu.addAction(cancelGitAction)
+        self.actions['gitcancel'] = cancelGitAction
+
     def createViewActions(self, menu):
         wrapEnabled = self.settings.value("wordWrap", False, type=bool)
         ed = self.currentEditor()
@@ -1209,9 +4392,30 @@ class Construct(QMainWindow):
         wordWrapAction.setShortcut('Ctrl+W')
         wordWrapAction.setCheckable(True)
         wordWrapAction.setChecked(wrapEnabled)
-        wordWrapAction.toggled.connect(lambda checked: (self.currentEditor() and self.currentEditor().setWrapMode(QsciScintilla.WrapWord if checked else QsciScintilla.WrapNone), self.settings.setValue("wordWrap", checked)))
+        wordWrapAction.toggled.connect(lambda checked: (self.currentEditor() and self.currentEditor().setWrapMode(QsciScintilla.WrapWord if checked else QsciScintilla.WrapNone), self.editorResources.set_value("wordWrap", checked)))
         menu.addAction(wordWrapAction)
         self.actions['wordwrap'] = wordWrapAction
+        highlightAction = QAction('Background Highlighting', self)
+        highlightAction.setCheckable(True)
+        highlightAction.setChecked(self.settings.value("view/backgroundHighlighting", True, type=bool))
+        highlightAction.toggled.connect(self.toggleBackgroundHighlighting)
+        menu.addAction(highlightAction)
+        self.actions['backgroundhighlighting'] = highlightAction
+        tabMemoryAction = QAction('Tab Memory...', self)
+        tabMemoryAction.triggered.connect(self.showTabMemory)
+        menu.addAction(tabMemoryAction)
+        self.actions['tabmemory'] = tabMemoryAction
+        followAction = QAction('Follow Tail', self)
+        followAction.setCheckable(True)
+        followAction.toggled.connect(self.toggleFollowTail)
+        menu.addAction(followAction)
+        self.actions['followtail'] = followAction
+        projectCompletionAction = QAction('Complete Words From Project', self)
+        projectCompletionAction.setCheckable(True)
+        projectCompletionAction.setChecked(self.editorResources.value("completion/indexProject", False, bool))
+        projectCompletionAction.toggled.connect(self.toggleProjectCompletion)
+        menu.addAction(projectCompletionAction)
+        self.actions['projectcompletion'] = projectCompletionAction
         termAction = QAction('Terminal', self)
         termAction.setShortcut('Ctrl+`')
         termAction.triggered.connect(self.toggle_terminal)
@@ -1238,26 +4442,106 @@ class Construct(QMainWindow):
         menu.addAction(resetZoomAction)
         self.actions['resetzoom'] = resetZoomAction
 
-    def _safe_wait_for_handler(self, timeout_ms=None):
-        ed = self.currentEditor()
-        handler = getattr(ed, 'file_handler', None) if ed is not None else None
-        if not handler:
-            return
-        try:
-            running = handler.isRunning()
-        except RuntimeError:
-            if ed is not None:
-                setattr(ed, 'file_handler', None)
-            return
-        if running:
+    def _shutdown_workers(self):
+        if self.loaderPool is not None:
+            self.loaderPool.stop()
+        ENCODING_CACHE.save()
+        if self.gitWorker is not None:
+            self.gitWorker.stop()
+        if self.gitStatusWorker is not None:
+            self.gitStatusWorker.stop()
+        if getattr(self, 'findInFilesPanel', None) is not None:
+            self.findInFilesPanel.shutdown()
+        for i in range(self.tabWidget.count()):
+            ed = self.tabWidget.widget(i)
+            if isinstance(ed, Editor):
+                ed.close_large_document()
+                ed.journal = None
+        if self.journalWriter is not None:
+            self.journalWriter.stop()
+            self.journalWriter = None
+            shutil.rmtree(self.journalDir, ignore_errors=True)
+            self.journalLock.unlock()
+
+    def _journal_session(self):
+        if self.journalWriter is None:
+            self.journalDir = data_dir("journal", f"{os.getpid()}-{uuid.uuid4().hex[:8]}")
+            self.journalLock = QLockFile(os.path.join(self.journalDir, "lock"))
+            self.journalLock.tryLock(0)
+            self.journalWriter = JournalWriter()
+            self.journalWriter.start()
+        return self.journalWriter
+
+    def _create_journal(self, ed, during_edit=False):
+        if not self.editorResources.value("autosave/journal", True, bool):
+            return None
+        if ed.large_document is not None or self._is_loading(ed):
+            return None
+        path = getattr(ed, 'file_path', None)
+        meta = {"path": path, "encoding": getattr(ed, 'encoding', None), "newline": getattr(ed, 'newline', None),
+                "compression": getattr(ed, 'compression', None)}
+        snapshot = not path or getattr(ed, 'unsaved_changes', False)
+        if not snapshot:
             try:
-                if timeout_ms is None:
-                    handler.wait()
-                else:
-                    handler.wait(timeout_ms)
-            except RuntimeError:
-                if ed is not None:
-                    setattr(ed, 'file_handler', None)
+                st = os.stat(path)
+                meta["mtime"], meta["size"] = st.st_mtime_ns, st.st_size
+            except OSError:
+                snapshot = True
+        writer = self._journal_session()
+        return EditJournal(writer, os.path.join(self.journalDir, f"{uuid.uuid4().hex}.log"), ed, meta, snapshot, during_edit)
+
+    def recoverJournals(self):
+        root = data_dir("journal")
+        stale, recovered, changed = [], [], []
+        for name in os.listdir(root):
+            directory = os.path.join(root, name)
+            if directory == self.journalDir or not os.path.isdir(directory):
+                continue
+            lock = QLockFile(os.path.join(directory, "lock"))
+            if not lock.tryLock(0):
+                continue
+            stale.append((directory, lock))
+            for entry in sorted(os.listdir(directory)):
+                if not entry.endswith('.log'):
+                    continue
+                try:
+                    meta, data, base_ok = read_journal(os.path.join(directory, entry))
+                except Exception as e:
+                    logging.warning("Unreadable journal %s: %s", entry, e)
+                    continue
+                if data is not None:
+                    recovered.append((meta, data))
+                    if not base_ok:
+                        changed.append(meta.get("path") or "Untitled")
+        if recovered:
+            message = f"Construct did not shut down cleanly. Recover {len(recovered)} unsaved document(s)?"
+            if changed:
+                message += "\n\nThese files changed on disk since editing started, so their recovery may be inaccurate:\n" + "\n".join(changed)
+            reply = QMessageBox.question(self, "Recover Unsaved Work", message, QMessageBox.Yes | QMessageBox.No, QMessageBox.Yes)
+            if reply == QMessageBox.Yes:
+                for meta, data in recovered:
+                    self._open_recovered(meta, data)
+        for directory, lock in stale:
+            lock.unlock()
+            shutil.rmtree(directory, ignore_errors=True)
+
+    def _open_recovered(self, meta, data):
+        path = meta.get("path")
+        ed = self.editorPool.take()
+        self._attach_editor(ed, os.path.basename(path) if path else "Untitled")
+        with QSignalBlocker(ed):
+            ed.setText(data.decode('utf-8', errors='replace'))
+        setattr(ed, 'file_path', path)
+        if meta.get("encoding"):
+            setattr(ed, 'encoding', meta["encoding"])
+        if meta.get("newline"):
+            setattr(ed, 'newline', meta["newline"])
+            self._apply_newline(ed, meta["newline"])
+        self._applySavedSyntaxOrDetect(path, ed)
+        setattr(ed, 'unsaved_changes', True)
+        ed.journal = self._create_journal(ed)
+        self._index_editor_words(ed)
+        self._on_tab_changed(self.tabWidget.currentIndex())
 
     def _on_handler_finished(self, editor_obj, handler_obj):
         if getattr(editor_obj, 'file_handler', None) is handler_obj:
@@ -1281,7 +4565,7 @@ class Construct(QMainWindow):
         else:
             actual = new_level
         self.zoom_level = actual
-        self.settings.setValue("view/zoom", actual)
+        self.editorResources.set_value("view/zoom", actual)
 
     def _set_zoom(self, level):
         level = int(level)
@@ -1293,28 +4577,70 @@ class Construct(QMainWindow):
         else:
             actual = level
         self.zoom_level = actual
-        self.settings.setValue("view/zoom", actual)
+        self.editorResources.set_value("view/zoom", actual)
 
     def _on_zoom_changed(self, level):
         try:
             self.zoom_level = int(level)
         except Exception:
             self.zoom_level = 0
-        self.settings.setValue("view/zoom", self.zoom_level)
+        self.editorResources.set_value("view/zoom", self.zoom_level)
 
     def openFindReplaceDialog(self):
         ed = self.currentEditor()
         dialog = FindReplaceDialog(ed) if ed else FindReplaceDialog(Editor(self))
         dialog.exec_()
 
-    def openLanguageSelector(self):
-        languages_map = self._available_language_lexers()
-        names = [n for n in languages_map.keys()]
-        if 'Plain Text' in names:
-            names.remove('Plain Text')
-            names = ['Plain Text'] + sorted(names)
+    def openFindInFiles(self):
+        if not self.current_folder:
+            QMessageBox.information(self, "Find in Files", "Open a folder first.")
+            return
+        if getattr(self, 'findInFilesDock', None) is None:
+            self.findInFilesDock = QDockWidget("Find in Files", self)
+            self.findInFilesPanel = FindInFilesPanel(self.findInFilesDock, self.settings)
+            self.findInFilesPanel.open_requested.connect(self.openFileAtLine)
+            self.findInFilesDock.setWidget(self.findInFilesPanel)
+            self.addDockWidget(Qt.BottomDockWidgetArea, self.findInFilesDock)
+        self.findInFilesPanel.set_root(self.current_folder, self.repo)
+        ed = self.currentEditor()
+        if ed is not None and ed.hasSelectedText() and '\n' not in ed.selectedText():
+            self.findInFilesPanel.query_input.setText(ed.selectedText())
+        self.findInFilesDock.show()
+        self.findInFilesPanel.query_input.setFocus()
+        self.findInFilesPanel.query_input.selectAll()
+
+    def _find_open_editor(self, file_path):
+        real = os.path.realpath(file_path)
+        for i in range(self.tabWidget.count()):
+            ed = self.tabWidget.widget(i)
+            path = getattr(ed, 'file_path', None)
+            if path and os.path.realpath(path) == real:
+                return ed
+        return None
+
+    def openFileAtLine(self, file_path, line):
+        ed = self._find_open_editor(file_path)
+        if ed is not None:
+            self.tabWidget.setCurrentWidget(ed)
         else:
-            names = sorted(names)
+            ed = self.openFileByPath(file_path)
+        if ed is not None:
+            self._go_to_line(ed, int(line))
+            ed.setFocus()
+
+    def goToLine(self):
+        ed = self.currentEditor()
+        if ed is None:
+            return
+        total = self._total_lines(ed)
+        current = ed.textCursor().blockNumber() + 1
+        line, ok = QInputDialog.getInt(self, "Go To Line", f"Line (1 - {total}):", current, 1, max(1, total))
+        if ok:
+            self._go_to_line(ed, line - 1)
+            ed.setFocus()
+
+    def openLanguageSelector(self):
+        names = LEXERS.language_names()
         current = self._current_language_name()
         dialog = LanguageSelectDialog(self, names, current)
         if dialog.exec_() == QDialog.Accepted:
@@ -1329,8 +4655,7 @@ class Construct(QMainWindow):
     def importFromWeb(self):
         ed = self.currentEditor()
         if ed is None:
-            ed = Editor(self)
-            ed.setEolMode(QsciScintilla.EolWindows)
+            ed = self.editorPool.take()
             self._attach_editor(ed, "Untitled")
         dialog = ImportFromWebDialog(ed, app_context=self.app_context)
         dialog.exec_()
@@ -1345,48 +4670,179 @@ class Construct(QMainWindow):
             result = dialog.exec_()
             if result == QDialog.Accepted:
                 self.tabWidget.setCurrentIndex(index)
-                if not self.saveFile():
+                if not self.saveFile(wait=True):
                     return
             elif result == QDialog.Rejected:
                 return
-        handler = getattr(ed, 'file_handler', None)
-        if handler:
+        self._cancel_load(ed)
+        setattr(ed, 'open_generation', int(getattr(ed, 'open_generation', 0)) + 1)
+        ed.close_large_document()
+        ed.discard_journal()
+        self._drop_editor_words(ed)
+        if ed.file_watcher is not None:
+            ed.file_watcher.unwatch()
+        saver = getattr(ed, 'file_saver', None)
+        if saver is not None:
             try:
-                if handler.isRunning():
-                    handler.wait()
+                saver.wait()
             except RuntimeError:
                 pass
-            setattr(ed, 'file_handler', None)
         self.tabWidget.removeTab(index)
+        ed.deleteLater()
         if self.tabWidget.count() == 0:
             self.newFile()
 
-    def _start_file_load(self, ed, file_path):
+    def _large_file_threshold(self):
+        try:
+            mb = float(self.settings.value("files/largeFileThresholdMB", 256))
+        except (TypeError, ValueError):
+            mb = 256
+        return int(mb * 1024 * 1024)
+
+    def _start_large_file_load(self, ed, file_path):
+        try:
+            document = LargeFileDocument(file_path)
+        except Exception as e:
+            QMessageBox.critical(self, "Error", f"Error reading file: {e}")
+            return True
+        if not document.line_addressable():
+            document.close()
+            return False
+        self._cancel_load(ed)
+        setattr(ed, 'file_path', file_path)
+        setattr(ed, 'open_generation', int(getattr(ed, 'open_generation', 0)) + 1)
+        setattr(ed, 'encoding', document.encoding)
+        setattr(ed, 'newline', document.newline)
+        self._apply_newline(ed, document.newline)
+        self._applySavedSyntaxOrDetect(file_path, ed)
+        ed.large_window_lines = max(1000, self.settings.value("files/largeFileWindowLines", 20000, type=int))
+        self._drop_editor_words(ed)
+        ed.open_large_document(document)
+        idx = self.tabWidget.indexOf(ed)
+        if idx != -1:
+            self.tabWidget.setTabText(idx, os.path.basename(file_path))
+        self.addToRecentFiles(file_path)
+        setattr(ed, 'unsaved_changes', False)
+        if ed is self.currentEditor():
+            self.current_file = file_path
+            self.encoding = document.encoding
+            self.newline = document.newline
+            self.updateStatusBar(after_save=True)
+        return True
+
+    def _on_large_index_progress(self, ed):
+        if ed is self.currentEditor():
+            self.updateStatusBar(after_save=True)
+
+    def _start_file_load(self, ed, file_path, encoding=None, newline=None):
+        ed.discard_journal()
+        self._drop_editor_words(ed)
+        if ed.file_watcher is not None:
+            ed.file_watcher.unwatch()
+        compression = compression_format(file_path)
+        try:
+            large = not compression and os.path.getsize(file_path) > self._large_file_threshold()
+        except OSError:
+            large = False
+        if large and self._start_large_file_load(ed, file_path):
+            return
+        ed.close_large_document()
         setattr(ed, 'file_path', file_path)
-        self._applySavedSyntaxOrDetect(file_path)
+        setattr(ed, 'compression', compression)
+        setattr(ed, 'counted_lines', 0)
+        setattr(ed, 'pending_line', None)
+        self._applySavedSyntaxOrDetect(file_path, ed)
         gen = int(getattr(ed, 'open_generation', 0)) + 1
         setattr(ed, 'open_generation', gen)
-        prev = getattr(ed, 'file_handler', None)
-        if prev is not None:
-            try:
-                prev.file_content_loaded.disconnect()
-            except Exception:
-                pass
-        handler = FileHandler(file_path)
-        handler.file_load_started.connect(lambda path, encoding, newline, ed=ed, gen=gen: self._on_file_load_started(ed, gen, path, encoding, newline))
+        self._cancel_load(ed)
+        handler = FileHandler(file_path, encoding, newline, compression)
+        handler.file_load_started.connect(lambda path, encoding, newline, size, ed=ed, gen=gen: self._on_file_load_started(ed, gen, path, encoding, newline, size))
         handler.file_chunk_loaded.connect(lambda path, chunk, is_last, ed=ed, gen=gen: self._on_file_chunk_loaded(ed, gen, path, chunk, is_last))
+        handler.file_chunk_loaded.connect(lambda *args, handler=handler: handler.chunk_consumed())
         handler.file_content_loaded.connect(lambda path, content, encoding, newline, ed=ed, gen=gen: self._on_file_content_loaded(ed, gen, path, content, encoding, newline))
+        handler.file_lines_counted.connect(lambda path, lines, ed=ed, gen=gen: self._on_file_lines_counted(ed, gen, lines))
         handler.finished.connect(handler.deleteLater)
         handler.finished.connect(partial(self._on_handler_finished, ed, handler))
         try:
             handler.destroyed.connect(partial(self._on_handler_destroyed, ed, handler))
         except Exception:
             pass
-        handler.start()
         setattr(ed, 'file_handler', handler)
+        self._loader_pool().submit(handler, 0 if ed is self.currentEditor() else 1)
+
+    def _index_editor_words(self, ed):
+        self._drop_editor_words(ed)
+        if ed.large_document is not None or not self.editorResources.value("completion/wordIndex", True, bool):
+            return
+        length = int(ed.SendScintilla(QsciScintillaBase.SCI_GETLENGTH))
+        if length > self.editorResources.value("completion/maxIndexedFileMB", 16, int) * 1024 * 1024:
+            return
+        ed.start_word_counts()
+        if not length:
+            return
+        job = WordCountJob(bytes(ed.bytes(0, length)))
+        job.counted.connect(lambda counts, ed=ed, job=job: self._on_editor_words_counted(ed, job, counts))
+        setattr(ed, 'word_job', job)
+        self._loader_pool().submit(job, 2)
+
+    def _on_editor_words_counted(self, ed, job, counts):
+        if getattr(ed, 'word_job', None) is not job or ed.word_counts is None:
+            return
+        setattr(ed, 'word_job', None)
+        ed.word_counts.update(counts)
+        self.wordIndex.apply(counts)
+
+    def _drop_editor_words(self, ed):
+        job = getattr(ed, 'word_job', None)
+        if job is not None:
+            setattr(ed, 'word_job', None)
+            self._loader_pool().cancel(job)
+        ed.clear_word_counts()
+
+    def _index_project_words(self):
+        if self.projectWordJob is not None:
+            self._loader_pool().cancel(self.projectWordJob)
+            self.projectWordJob = None
+        if self.projectWords is not None:
+            self.wordIndex.apply(self.projectWords, -1)
+            self.projectWords = None
+        if not self.current_folder or not self.editorResources.value("completion/indexProject", False, bool):
+            return
+        job = WordCountJob(root=self.current_folder)
+        job.counted.connect(lambda counts, job=job: self._on_project_words_counted(job, counts))
+        self.projectWordJob = job
+        self._loader_pool().submit(job, 3)
+
+    def _on_project_words_counted(self, job, counts):
+        if self.projectWordJob is not job:
+            return
+        self.projectWordJob = None
+        self.projectWords = counts
+        self.wordIndex.apply(counts)
+        self.statusBar.showMessage(f"Indexed {len(counts)} project words for completion", 3000)
+
+    def toggleProjectCompletion(self, checked):
+        self.editorResources.set_value("completion/indexProject", checked)
+        self._index_project_words()
+
+    def _loader_pool(self):
+        if self.loaderPool is None:
+            size = self.settings.value("files/loaderThreads", min(4, os.cpu_count() or 2), type=int)
+            self.loaderPool = LoaderPool(size, self)
+        return self.loaderPool
+
+    def _cancel_load(self, ed):
+        handler = getattr(ed, 'file_handler', None)
+        if handler is None:
+            return
+        setattr(ed, 'file_handler', None)
+        try:
+            self._loader_pool().cancel(handler)
+        except RuntimeError:
+            pass
 
     def _require_git(self):
-        if _gitpy is None:
+        if git_module() is None:
             QMessageBox.critical(self, 'Git', 'Git is not installed. Please install Git to use Git features.')
             return False
         return True
@@ -1406,17 +4862,18 @@ class Construct(QMainWindow):
         if not repo_path:
             return
         try:
-            self.repo = _gitpy.Repo(repo_path)
+            self.repo = git_module().Repo(repo_path)
             self.current_folder = repo_path
             if self.fileTreeDock is None:
                 self.createFileExplorer(repo_path)
             else:
                 try:
                     self.fileModel.setRootPath(repo_path)
-                    self.fileTreeView.setRootIndex(self.fileModel.index(repo_path))
+                    self.fileTreeView.setRootIndex(self.fileProxy.index_for_path(repo_path))
                 except Exception:
                     pass
                 self.fileTreeDock.show()
+            self._on_folder_changed()
             try:
                 self.setWindowTitle(f"Construct - {os.path.basename(repo_path)}")
             except Exception:
@@ -1424,25 +4881,65 @@ class Construct(QMainWindow):
         except Exception as e:
             QMessageBox.critical(self, 'Git', f'Failed to open repository: {e}')
 
-    def gitStatus(self):
-        repo = self._require_repo()
-        if not repo:
-            return
-        try:
-            status = repo.git.status()
-        except Exception as e:
-            QMessageBox.critical(self, 'Git', f'Failed to get status: {e}')
+    def _git_worker(self):
+        if self.gitWorker is None:
+            self.gitWorker = GitWorker()
+            self.gitWorker.job_started.connect(self._on_git_job_started)
+            self.gitWorker.job_progress.connect(self._on_git_job_progress)
+            self.gitWorker.job_finished.connect(self._on_git_job_finished)
+            self.gitWorker.job_failed.connect(self._on_git_job_failed)
+        return self.gitWorker
+
+    def _run_git(self, name, func, on_success=None, failure=None, key=None):
+        return self._git_worker().submit(GitJob(name, func, key, on_success, failure))
+
+    def _on_git_job_started(self, job):
+        self.gitStatusLabel.setText(f"Git: {job.name}...")
+        self.actions['gitcancel'].setEnabled(True)
+
+    def _on_git_job_progress(self, job, text):
+        self.gitStatusLabel.setText(f"Git: {job.name}: {text}")
+
+    def _git_job_done(self):
+        if self.gitWorker is None or self.gitWorker.pending() == 0:
+            self.gitStatusLabel.setText("")
+            self.actions['gitcancel'].setEnabled(False)
+
+    def _on_git_job_finished(self, job, result):
+        self._git_job_done()
+        if job.on_success is not None:
+            job.on_success(result)
+
+    def _on_git_job_failed(self, job, error):
+        self._git_job_done()
+        if job.cancelled or not error:
+            self.statusBar.showMessage(f"Git: {job.name} cancelled.", 5000)
             return
+        QMessageBox.critical(self, 'Git', f'{job.failure}: {error}')
+
+    def cancelGitOperation(self):
+        if self.gitWorker is not None:
+            self.gitWorker.cancel_all()
+
+    def _show_git_text(self, title, text, width, height):
         dlg = QDialog(self)
-        dlg.setWindowTitle('Git Status')
+        dlg.setWindowTitle(title)
         layout = QVBoxLayout(dlg)
         te = QTextEdit(dlg)
         te.setReadOnly(True)
-        te.setPlainText(status)
+        te.setPlainText(text)
         layout.addWidget(te)
-        dlg.resize(700, 500)
+        dlg.resize(width, height)
         dlg.exec_()
 
+    def gitStatus(self):
+        repo = self._require_repo()
+        if not repo:
+            return
+        self._run_git('Status', lambda job: repo.git.status(),
+                      lambda status: self._show_git_text('Git Status', status, 700, 500),
+                      'Failed to get status', key='status')
+
     def stageCurrentFile(self):
         repo = self._require_repo()
         if not repo:
@@ -1452,21 +4949,17 @@ class Construct(QMainWindow):
         if not path:
             QMessageBox.information(self, 'Git', 'No file to stage in the current tab.')
             return
-        try:
-            repo.git.add(path)
-            QMessageBox.information(self, 'Git', f'Staged: {os.path.basename(path)}')
-        except Exception as e:
-            QMessageBox.critical(self, 'Git', f'Failed to stage file: {e}')
+        self._run_git('Stage', lambda job: repo.git.add(path),
+                      lambda result: QMessageBox.information(self, 'Git', f'Staged: {os.path.basename(path)}'),
+                      'Failed to stage file')
 
     def stageAllChanges(self):
         repo = self._require_repo()
         if not repo:
             return
-        try:
-            repo.git.add('--all')
-            QMessageBox.information(self, 'Git', 'All changes staged.')
-        except Exception as e:
-            QMessageBox.critical(self, 'Git', f'Failed to stage changes: {e}')
+        self._run_git('Stage All', lambda job: repo.git.add('--all'),
+                      lambda result: QMessageBox.information(self, 'Git', 'All changes staged.'),
+                      'Failed to stage changes')
 
     def commitChanges(self):
         repo = self._require_repo()
@@ -1475,62 +4968,52 @@ class Construct(QMainWindow):
         message, ok = QInputDialog.getText(self, 'Git Commit', 'Enter commit message:')
         if not ok or not message:
             return
-        try:
-            repo.index.commit(message)
-            QMessageBox.information(self, 'Git', 'Changes committed.')
-        except Exception as e:
-            QMessageBox.critical(self, 'Git', f'Failed to commit: {e}')
+        self._run_git('Commit', lambda job: repo.index.commit(message),
+                      lambda result: QMessageBox.information(self, 'Git', 'Changes committed.'),
+                      'Failed to commit')
 
     def fetchChanges(self):
         repo = self._require_repo()
         if not repo:
             return
-        try:
-            repo.remotes.origin.fetch()
-            QMessageBox.information(self, 'Git', 'Fetched from origin.')
-        except Exception as e:
-            QMessageBox.critical(self, 'Git', f'Failed to fetch: {e}')
+        self._run_git('Fetch', lambda job: run_git_process(job, repo, 'fetch', '--progress', 'origin'),
+                      lambda result: QMessageBox.information(self, 'Git', 'Fetched from origin.'),
+                      'Failed to fetch', key='fetch')
 
     def pullChanges(self):
         repo = self._require_repo()
         if not repo:
             return
-        try:
-            repo.remotes.origin.pull()
-            QMessageBox.information(self, 'Git', 'Pulled latest changes.')
-        except Exception as e:
-            QMessageBox.critical(self, 'Git', f'Failed to pull: {e}')
+        self._run_git('Pull', lambda job: run_git_process(job, repo, 'pull', '--progress', 'origin'),
+                      lambda result: QMessageBox.information(self, 'Git', 'Pulled latest changes.'),
+                      'Failed to pull', key='pull')
 
     def pushChanges(self):
         repo = self._require_repo()
         if not repo:
             return
-        try:
-            repo.remotes.origin.push()
-            QMessageBox.information(self, 'Git', 'Pushed to origin.')
-        except Exception as e:
-            QMessageBox.critical(self, 'Git', f'Failed to push: {e}')
+        self._run_git('Push', lambda job: run_git_process(job, repo, 'push', '--progress', 'origin'),
+                      lambda result: QMessageBox.information(self, 'Git', 'Pushed to origin.'),
+                      'Failed to push', key='push')
 
     def switchBranch(self):
         repo = self._require_repo()
         if not repo:
             return
-        try:
-            branches = [b.name for b in repo.branches]
-        except Exception as e:
-            QMessageBox.critical(self, 'Git', f'Failed to list branches: {e}')
-            return
+        self._run_git('List Branches', lambda job: [b.name for b in repo.branches],
+                      lambda branches: self._choose_branch(repo, branches),
+                      'Failed to list branches', key='branches')
+
+    def _choose_branch(self, repo, branches):
         if not branches:
             QMessageBox.information(self, 'Git', 'No branches found.')
             return
         branch, ok = QInputDialog.getItem(self, 'Switch Branch', 'Select branch:', branches, 0, False)
         if not ok or not branch:
             return
-        try:
-            repo.git.checkout(branch)
-            QMessageBox.information(self, 'Git', f'Switched to {branch}.')
-        except Exception as e:
-            QMessageBox.critical(self, 'Git', f'Failed to switch branch: {e}')
+        self._run_git('Checkout', lambda job: repo.git.checkout(branch),
+                      lambda result: QMessageBox.information(self, 'Git', f'Switched to {branch}.'),
+                      'Failed to switch branch')
 
     def createBranch(self):
         repo = self._require_repo()
@@ -1539,30 +5022,17 @@ class Construct(QMainWindow):
         name, ok = QInputDialog.getText(self, 'Create Branch', 'New branch name:')
         if not ok or not name:
             return
-        try:
-            repo.git.checkout('-b', name)
-            QMessageBox.information(self, 'Git', f'Created and switched to {name}.')
-        except Exception as e:
-            QMessageBox.critical(self, 'Git', f'Failed to create branch: {e}')
+        self._run_git('Create Branch', lambda job: repo.git.checkout('-b', name),
+                      lambda result: QMessageBox.information(self, 'Git', f'Created and switched to {name}.'),
+                      'Failed to create branch')
 
     def showLog(self):
         repo = self._require_repo()
         if not repo:
             return
-        try:
-            log = repo.git.log('--oneline', '--graph', '--decorate', '-n', '200')
-        except Exception as e:
-            QMessageBox.critical(self, 'Git', f'Failed to get log: {e}')
-            return
-        dlg = QDialog(self)
-        dlg.setWindowTitle('Git Log')
-        layout = QVBoxLayout(dlg)
-        te = QTextEdit(dlg)
-        te.setReadOnly(True)
-        te.setPlainText(log)
-        layout.addWidget(te)
-        dlg.resize(800, 600)
-        dlg.exec_()
+        self._run_git('Log', lambda job: repo.git.log('--oneline', '--graph', '--decorate', '-n', '200'),
+                      lambda log: self._show_git_text('Git Log', log, 800, 600),
+                      'Failed to get log', key='log')
 
     def diffCurrentFile(self):
         repo = self._require_repo()
@@ -1573,22 +5043,11 @@ class Construct(QMainWindow):
         if not path:
             QMessageBox.information(self, 'Git', 'No file in the current tab.')
             return
-        try:
-            diff = repo.git.diff('HEAD', '--', path)
-            if not diff:
-                diff = repo.git.diff('--', path)
-        except Exception as e:
-            QMessageBox.critical(self, 'Git', f'Failed to diff: {e}')
-            return
-        dlg = QDialog(self)
-        dlg.setWindowTitle(f'Diff: {os.path.basename(path)}')
-        layout = QVBoxLayout(dlg)
-        te = QTextEdit(dlg)
-        te.setReadOnly(True)
-        te.setPlainText(diff or 'No differences.')
-        layout.addWidget(te)
-        dlg.resize(900, 600)
-        dlg.exec_()
+        def diff(job):
+            return repo.git.diff('HEAD', '--', path) or repo.git.diff('--', path)
+        self._run_git('Diff', diff,
+                      lambda text: self._show_git_text(f'Diff: {os.path.basename(path)}', text or 'No differences.', 900, 600),
+                      'Failed to diff', key=('diff', path))
 
     def discardCurrentFileChanges(self):
         repo = self._require_repo()
@@ -1602,20 +5061,18 @@ class Construct(QMainWindow):
         reply = QMessageBox.question(self, 'Discard Changes', f'Discard uncommitted changes to "{os.path.basename(path)}"?', QMessageBox.Yes | QMessageBox.No, QMessageBox.No)
         if reply != QMessageBox.Yes:
             return
-        try:
-            repo.git.checkout('--', path)
-            QMessageBox.information(self, 'Git', 'Changes discarded.')
-        except Exception as e:
-            QMessageBox.critical(self, 'Git', f'Failed to discard changes: {e}')
+        self._run_git('Discard', lambda job: repo.git.checkout('--', path),
+                      lambda result: QMessageBox.information(self, 'Git', 'Changes discarded.'),
+                      'Failed to discard changes')
 
     def openFolder(self):
         folder = QFileDialog.getExistingDirectory(self, "Open Folder")
         if not folder:
             return
         self.current_folder = folder
-        if _gitpy is not None:
+        if git_module() is not None:
             try:
-                self.repo = _gitpy.Repo(folder)
+                self.repo = git_module().Repo(folder)
             except Exception:
                 self.repo = None
         if self.fileTreeDock is None:
@@ -1623,10 +5080,76 @@ class Construct(QMainWindow):
         else:
             try:
                 self.fileModel.setRootPath(folder)
-                self.fileTreeView.setRootIndex(self.fileModel.index(folder))
+                self.fileTreeView.setRootIndex(self.fileProxy.index_for_path(folder))
             except Exception:
                 pass
             self.fileTreeDock.show()
+        self._on_folder_changed()
+
+    def _on_folder_changed(self):
+        if getattr(self, 'findInFilesPanel', None) is not None:
+            self.findInFilesPanel.set_root(self.current_folder, self.repo)
+        self._reset_git_decorations()
+        self._index_project_words()
+
+    def _reset_git_decorations(self):
+        if self.gitDirWatcher is not None:
+            self.gitDirWatcher.deleteLater()
+            self.gitDirWatcher = None
+        self.gitSnapshot = None
+        self._git_status_paths.clear()
+        self._git_status_full = False
+        if self.repo is not None and self.repo.working_tree_dir:
+            self.gitSnapshot = GitStatusSnapshot(self.repo.working_tree_dir)
+            self.gitDirWatcher = QFileSystemWatcher([self.repo.git_dir], self)
+            self.gitDirWatcher.directoryChanged.connect(lambda _: self._schedule_git_status())
+            self._schedule_git_status()
+        if self.fileProxy is not None:
+            self.fileProxy.set_snapshot(self.gitSnapshot)
+            self.fileTreeView.viewport().update()
+
+    def _schedule_git_status(self, paths=None):
+        if self.gitSnapshot is None:
+            return
+        if paths is None:
+            self._git_status_full = True
+        else:
+            self._git_status_paths.update(p for p in paths if p)
+        self.gitStatusTimer.start()
+
+    def _flush_git_status(self):
+        snapshot, repo = self.gitSnapshot, self.repo
+        if snapshot is None or repo is None:
+            return
+        if self.gitStatusWorker is None:
+            self.gitStatusWorker = GitWorker()
+            self.gitStatusWorker.job_finished.connect(lambda job, result: job.on_success(result))
+            self.gitStatusWorker.job_failed.connect(lambda job, error: logging.debug("git status refresh failed: %s", error))
+        paths, self._git_status_paths = self._git_status_paths, set()
+        rels = [r for r in (snapshot.relative(p) for p in paths) if r is not None]
+        if self._git_status_full or len(rels) > 256 or '' in rels:
+            self._git_status_full = False
+            def apply_full(entries):
+                if snapshot is self.gitSnapshot:
+                    snapshot.replace(entries)
+                    self.fileTreeView.viewport().update()
+            self.gitStatusWorker.submit(GitJob('Status', lambda job: GitStatusSnapshot.query(repo), 'full', apply_full))
+        elif rels:
+            def apply_paths(entries):
+                if snapshot is self.gitSnapshot:
+                    snapshot.update(rels, entries)
+                    self.fileProxy.refresh_paths(paths)
+            self.gitStatusWorker.submit(GitJob('Status', lambda job: GitStatusSnapshot.query(repo, rels), None, apply_paths))
+
+    def _on_file_model_data_changed(self, top_left, bottom_right, roles=None):
+        parent = top_left.parent()
+        self._schedule_git_status(self.fileModel.filePath(self.fileModel.index(row, 0, parent))
+                                  for row in range(top_left.row(), bottom_right.row() + 1))
+
+    def _on_file_model_rows_changed(self, parent, first, last):
+        path = self.fileModel.filePath(parent)
+        if path in self._loaded_dirs:
+            self._schedule_git_status([path])
 
     def createFileExplorer(self, root_path):
         self.fileTreeDock = QDockWidget("File Explorer", self)
@@ -1662,11 +5185,19 @@ class Construct(QMainWindow):
         self.fileTreeView = QTreeView(container)
         self.fileModel = QFileSystemModel()
         self.fileModel.setRootPath(root_path)
-        self.fileTreeView.setModel(self.fileModel)
+        self.fileModel.directoryLoaded.connect(self._loaded_dirs.add)
+        self.fileModel.dataChanged.connect(self._on_file_model_data_changed)
+        self.fileModel.rowsInserted.connect(self._on_file_model_rows_changed)
+        self.fileModel.rowsRemoved.connect(self._on_file_model_rows_changed)
+        self.fileProxy = GitStatusProxyModel(self)
+        self.fileProxy.setSourceModel(self.fileModel)
+        self.fileProxy.set_snapshot(self.gitSnapshot)
+        self.fileTreeView.setModel(self.fileProxy)
         try:
-            self.fileTreeView.setRootIndex(self.fileModel.index(root_path))
+            self.fileTreeView.setRootIndex(self.fileProxy.index_for_path(root_path))
         except Exception:
             pass
+        self.fileTreeView.setSelectionMode(QTreeView.ExtendedSelection)
         self.fileTreeView.doubleClicked.connect(self.onFileTreeDoubleClicked)
         self.setupFileTreeContextMenu()
         layout.addWidget(self.fileTreeView)
@@ -1676,29 +5207,13 @@ class Construct(QMainWindow):
     def openFileByPath(self, file_path):
         if not (file_path and os.path.isfile(file_path)):
             return
-        ed = self.currentEditor()
-        reuse = False
-        if ed is not None:
-            idx = self.tabWidget.indexOf(ed)
-            try:
-                title = self.tabWidget.tabText(idx) if idx != -1 else ""
-            except Exception:
-                title = ""
-            is_untitled = (title.strip().lower() == 'untitled') and not getattr(ed, 'file_path', None)
-            try:
-                empty = not bool(ed.text())
-            except Exception:
-                empty = True
-            reuse = is_untitled and empty
-        if not reuse:
-            ed = Editor(self)
-            ed.setEolMode(QsciScintilla.EolWindows)
-            self._attach_editor(ed, os.path.basename(file_path))
+        ed = self._editor_for_open(os.path.basename(file_path))
         self._start_file_load(ed, file_path)
+        return ed
 
     def onFileTreeDoubleClicked(self, index):
         try:
-            file_path = self.fileModel.filePath(index)
+            file_path = self.fileProxy.filePath(index)
         except Exception:
             return
         if os.path.isfile(file_path):
@@ -1712,9 +5227,12 @@ class Construct(QMainWindow):
         index = self.fileTreeView.indexAt(position)
         context_menu = QMenu(self)
         if index.isValid():
-            file_path = self.fileModel.filePath(index)
+            file_path = self.fileProxy.filePath(index)
+            selected = [self.fileProxy.filePath(i) for i in self.fileTreeView.selectionModel().selectedRows()]
+            if file_path not in selected:
+                selected = [file_path]
             open_action = QAction("Open", self)
-            open_action.triggered.connect(lambda: self.onFileTreeDoubleClicked(index))
+            open_action.triggered.connect(lambda: self.openPaths([path for path in selected if os.path.isfile(path)]))
             context_menu.addAction(open_action)
             context_menu.addSeparator()
             create_submenu = QMenu("Create", context_menu)
@@ -1865,56 +5383,100 @@ class Construct(QMainWindow):
                 pass
 
     def newFile(self):
-        ed = Editor(self)
-        ed.setEolMode(QsciScintilla.EolWindows)
+        ed = self.editorPool.take()
         self._attach_editor(ed, "Untitled")
         self.setLexerForFilePath(None)
 
     def openFile(self):
         options = QFileDialog.Options()
         try:
-            file_name, _ = QFileDialog.getOpenFileName(self, "Open File", "", "Text Files (*.txt);;All Files (*)", options=options)
-            if file_name:
-                ed = self.currentEditor()
-                reuse = False
-                if ed is not None:
-                    idx = self.tabWidget.indexOf(ed)
-                    try:
-                        title = self.tabWidget.tabText(idx) if idx != -1 else ""
-                    except Exception:
-                        title = ""
-                    is_untitled = (title.strip().lower() == 'untitled') and not getattr(ed, 'file_path', None)
-                    try:
-                        empty = not bool(ed.text())
-                    except Exception:
-                        empty = True
-                    reuse = is_untitled and empty
-                if not reuse:
-                    ed = Editor(self)
-                    ed.setEolMode(QsciScintilla.EolWindows)
-                    self._attach_editor(ed, os.path.basename(file_name))
-                self._start_file_load(ed, file_name)
+            file_names, _ = QFileDialog.getOpenFileNames(self, "Open File", "", "Text Files (*.txt);;All Files (*)", options=options)
+            if file_names:
+                self.openPaths(file_names)
         except Exception as e:
             QMessageBox.warning(self, "Error", f"Failed to open file: {e}")
 
-    def _on_file_load_started(self, ed, gen, path, encoding, newline):
+    def openFolderFiles(self):
+        folder = QFileDialog.getExistingDirectory(self, "Open Folder")
+        if not folder:
+            return
+        try:
+            with os.scandir(folder) as entries:
+                paths = sorted(entry.path for entry in entries if not entry.name.startswith('.') and entry.is_file())
+        except OSError as e:
+            QMessageBox.warning(self, "Error", f"Failed to open folder: {e}")
+            return
+        if not paths:
+            QMessageBox.information(self, "Open Folder", "The folder contains no files.")
+            return
+        self.openPaths(paths)
+
+    def openPaths(self, paths):
+        paths = [path for path in paths if path]
+        if not paths:
+            return
+        first = self._find_open_editor(paths[0])
+        if first is not None:
+            self.tabWidget.setCurrentWidget(first)
+        elif os.path.isfile(paths[0]):
+            self._start_file_load(self._editor_for_open(os.path.basename(paths[0])), paths[0])
+        scheduled = bool(self._pending_opens)
+        self._pending_opens.extend(paths[1:])
+        if self._pending_opens and not scheduled:
+            QTimer.singleShot(0, self._open_pending)
+
+    def _open_pending(self):
+        batch, self._pending_opens = self._pending_opens[:16], self._pending_opens[16:]
+        for path in batch:
+            if self._find_open_editor(path) is None and os.path.isfile(path):
+                self._start_file_load(self._editor_for_open(os.path.basename(path), activate=False), path)
+        if self._pending_opens:
+            QTimer.singleShot(0, self._open_pending)
+
+    def _editor_for_open(self, title, activate=True):
+        ed = self.currentEditor()
+        if activate and ed is not None:
+            idx = self.tabWidget.indexOf(ed)
+            try:
+                tab_title = self.tabWidget.tabText(idx) if idx != -1 else ""
+            except Exception:
+                tab_title = ""
+            is_untitled = (tab_title.strip().lower() == 'untitled') and not getattr(ed, 'file_path', None)
+            try:
+                empty = not bool(ed.text())
+            except Exception:
+                empty = True
+            if is_untitled and empty:
+                return ed
+        ed = self.editorPool.take()
+        self._attach_editor(ed, title, activate)
+        return ed
+
+    def _apply_newline(self, ed, newline):
+        if newline == "\r\n":
+            ed.setEolMode(QsciScintilla.EolWindows)
+        elif newline == "\r":
+            ed.setEolMode(QsciScintilla.EolMac)
+        else:
+            ed.setEolMode(QsciScintilla.EolUnix)
+
+    def _on_file_load_started(self, ed, gen, path, encoding, newline, size=0):
         if gen != getattr(ed, 'open_generation', 0):
             return
         if getattr(ed, 'file_path', None) is None or os.path.realpath(path) != os.path.realpath(getattr(ed, 'file_path')):
             return
-        self._applySavedSyntaxOrDetect(path)
+        self._applySavedSyntaxOrDetect(path, ed)
         if encoding:
             setattr(ed, 'encoding', encoding)
         if newline:
             setattr(ed, 'newline', newline)
-            if newline == "\r\n":
-                ed.setEolMode(QsciScintilla.EolWindows)
-            elif newline == "\r":
-                ed.setEolMode(QsciScintilla.EolMac)
-            else:
-                ed.setEolMode(QsciScintilla.EolUnix)
+            self._apply_newline(ed, newline)
         with QSignalBlocker(ed):
             ed.setText("")
+            if size:
+                ed.reserve(size)
+        setattr(ed, 'loaded_size', size)
+        ed.set_highlight_loading(True)
         title = os.path.basename(getattr(ed, 'file_path'))
         idx = self.tabWidget.indexOf(ed)
         if idx != -1:
@@ -1930,32 +5492,77 @@ class Construct(QMainWindow):
         if getattr(ed, 'file_path', None) is None or os.path.realpath(path) != os.path.realpath(getattr(ed, 'file_path')):
             return
         if chunk:
+            if getattr(ed, 'sniff_lexer', False):
+                self._sniff_lexer(ed, chunk[:1024])
             with QSignalBlocker(ed):
                 ed.append_text(chunk)
+        pending = getattr(ed, 'pending_line', None)
+        if pending is not None and (is_last or ed.lines() > pending + 1):
+            setattr(ed, 'pending_line', None)
+            ed.go_to_line(pending)
         if is_last:
+            STARTUP_PROFILER.mark("first file load", once=True)
+            ed.set_highlight_loading(False)
+            self._apply_pending_view(ed)
+            setattr(ed, 'counted_lines', 0)
             setattr(ed, 'unsaved_changes', False)
+            self._watch_file(ed, getattr(ed, 'loaded_size', None))
+            self._index_editor_words(ed)
             if ed is self.currentEditor():
                 self.updateStatusBar(after_save=True)
 
+    def _on_file_lines_counted(self, ed, gen, lines):
+        if gen != getattr(ed, 'open_generation', 0):
+            return
+        setattr(ed, 'counted_lines', int(lines))
+        if ed is self.currentEditor():
+            self.updateStatusBar(after_save=True)
+
+    def _is_loading(self, ed):
+        handler = getattr(ed, 'file_handler', None)
+        try:
+            return handler is not None and handler.isRunning()
+        except RuntimeError:
+            return False
+
+    def _wait_for_load(self, ed):
+        if not self._is_loading(ed):
+            return
+        handler = getattr(ed, 'file_handler')
+        loop = QEventLoop()
+        handler.finished.connect(loop.quit)
+        if handler.isRunning():
+            self.statusBar.showMessage(f"Finishing load of {os.path.basename(getattr(ed, 'file_path', '') or '')}...")
+            loop.exec_()
+        QApplication.processEvents()
+
+    def _total_lines(self, ed):
+        return max(ed.line_count(), int(getattr(ed, 'counted_lines', 0) or 0))
+
+    def _go_to_line(self, ed, line):
+        view = getattr(ed, 'pending_view', None)
+        if view is not None:
+            setattr(ed, 'pending_view', (None, None, None, view[3]))
+        if self._is_loading(ed) and line >= ed.lines() - 1:
+            setattr(ed, 'pending_line', line)
+            return
+        ed.go_to_line(line)
+
     def _on_file_content_loaded(self, ed, gen, path, content, encoding, newline):
         if gen != getattr(ed, 'open_generation', 0):
             return
         if getattr(ed, 'file_path', None) is None or os.path.realpath(path) != os.path.realpath(getattr(ed, 'file_path')):
             return
         if encoding is None:
+            ed.set_highlight_loading(False)
             QMessageBox.critical(self, "Error", content)
             return
-        self._applySavedSyntaxOrDetect(path)
+        self._applySavedSyntaxOrDetect(path, ed)
         if encoding:
             setattr(ed, 'encoding', encoding)
         if newline:
             setattr(ed, 'newline', newline)
-            if newline == "\r\n":
-                ed.setEolMode(QsciScintilla.EolWindows)
-            elif newline == "\r":
-                ed.setEolMode(QsciScintilla.EolMac)
-            else:
-                ed.setEolMode(QsciScintilla.EolUnix)
+            self._apply_newline(ed, newline)
         with QSignalBlocker(ed):
             ed.setPlainText(content)
         title = os.path.basename(getattr(ed, 'file_path'))
@@ -1964,47 +5571,194 @@ class Construct(QMainWindow):
             self.tabWidget.setTabText(idx, title)
         self.addToRecentFiles(getattr(ed, 'file_path'))
         setattr(ed, 'unsaved_changes', False)
+        self._watch_file(ed)
+        self._index_editor_words(ed)
         if ed is self.currentEditor():
             self.updateStatusBar(after_save=True)
 
-    def saveFile(self):
+    def saveFile(self, wait=False):
         ed = self.currentEditor()
         if not ed:
             return False
-        content = ed.toPlainText()
+        if getattr(ed, 'large_document', None) is not None:
+            QMessageBox.information(self, "Large File", "Large files are opened read-only and cannot be saved.")
+            return False
         enc = getattr(ed, 'encoding', None) or 'utf-8'
-        try:
-            content.encode(enc)
-        except UnicodeEncodeError:
-            return self.promptForEncoding(content)
+        if getattr(ed, 'compression', None) and not self.settings.value("files/recompressOnSave", True, type=bool):
+            return self.saveFileAs(None, wait)
         if getattr(ed, 'file_path', None):
-            return self.saveFileWithEncoding(content, enc)
+            return self.saveFileWithEncoding(None, enc, wait)
         else:
-            return self.saveFileAs(content)
+            return self.saveFileAs(None, wait)
 
-    def promptForEncoding(self, content):
+    def promptForEncoding(self, content, wait=False):
         encoding, ok = QInputDialog.getItem(self, "Choose Encoding", "Select Encoding", 
                                              ["UTF-8", "ISO-8859-1", "Windows-1252", "UTF-16"], 0, False)
         if ok:
-            return self.saveFileWithEncoding(content, encoding)
+            return self.saveFileWithEncoding(content, encoding, wait)
         return False
     
-    def saveFileWithEncoding(self, content, encoding):
+    def saveFileWithEncoding(self, content, encoding, wait=False):
         ed = self.currentEditor()
         if ed and getattr(ed, 'file_path', None):
-            try:
-                with open(getattr(ed, 'file_path'), 'w', encoding=encoding, newline='') as file:
-                    file.write(content)
-                setattr(ed, 'encoding', encoding)
-                setattr(ed, 'unsaved_changes', False)
-                self.updateStatusBar(after_save=True)
-                return True
-            except Exception as e:
-                QMessageBox.warning(self, "Error", f"Failed to save file with encoding '{encoding}': {e}")
-                return False
+            return self._start_save(ed, content, encoding, wait)
         return False
 
-    def saveFileAs(self, content=None):
+    def _buffer_address(self, ed):
+        try:
+            return int(ed.SendScintillaPtrResult(QsciScintillaBase.SCI_GETCHARACTERPOINTER))
+        except Exception:
+            return None
+
+    def _start_save(self, ed, content, encoding, wait):
+        self._wait_for_load(ed)
+        previous = getattr(ed, 'file_saver', None)
+        if previous is not None:
+            try:
+                previous.wait()
+            except RuntimeError:
+                pass
+        path = getattr(ed, 'file_path')
+        compression = getattr(ed, 'compression', None)
+        locked = False
+        if content is not None:
+            data = content.encode('utf-8', errors='replace')
+            saver = FileSaver(path, encoding, len(data), data=data, compression=compression)
+        else:
+            size = int(ed.SendScintilla(QsciScintillaBase.SCI_GETLENGTH))
+            address = self._buffer_address(ed)
+            if address:
+                locked = not ed.isReadOnly()
+                ed.setReadOnly(True)
+                saver = FileSaver(path, encoding, size, address=address, compression=compression)
+            else:
+                saver = FileSaver(path, encoding, size, data=bytes(ed.bytes(0, size)), compression=compression)
+        name = os.path.basename(path)
+        saver.progress.connect(lambda done, total: self.statusBar.showMessage(f"Saving {name}: {done * 100 // max(1, total)}%"))
+        saver.saved.connect(lambda path, encoding: self._on_file_saved(ed, path, encoding))
+        saver.failed.connect(lambda path, error, encoding_error: self._on_file_save_failed(ed, encoding, error, encoding_error, wait))
+        saver.finished.connect(lambda: ed.setReadOnly(False) if locked else None)
+        saver.finished.connect(lambda: setattr(ed, 'file_saver', None) if getattr(ed, 'file_saver', None) is saver else None)
+        saver.finished.connect(saver.deleteLater)
+        setattr(ed, 'file_saver', saver)
+        saver.start()
+        if not wait:
+            return True
+        loop = QEventLoop()
+        saver.finished.connect(loop.quit)
+        if not saver.isFinished():
+            loop.exec_()
+        QApplication.processEvents()
+        if saver.encoding_error:
+            self.tabWidget.setCurrentWidget(ed)
+            return self.promptForEncoding(content, wait=True)
+        return saver.succeeded
+
+    def _on_file_saved(self, ed, path, encoding):
+        ed.discard_journal()
+        setattr(ed, 'encoding', encoding)
+        setattr(ed, 'unsaved_changes', False)
+        self._watch_file(ed)
+        if ed is self.currentEditor():
+            self.updateStatusBar(after_save=True)
+        if self.findInFilesPanel is not None:
+            self.findInFilesPanel.notify_saved(path)
+        self._schedule_git_status([path])
+
+    def _watch_file(self, ed, size=None, tail=None):
+        path = getattr(ed, 'file_path', None)
+        if not path or ed.large_document is not None or getattr(ed, 'compression', None) or not self.settings.value("files/watchForChanges", True, type=bool):
+            if ed.file_watcher is not None:
+                ed.file_watcher.unwatch()
+            return
+        watcher = ed.file_watcher
+        if watcher is None:
+            watcher = ed.file_watcher = FileWatcher(ed)
+            watcher.busy = lambda: self._is_loading(ed) or getattr(ed, 'file_saver', None) is not None or ed.hibernated is not None
+            watcher.appended.connect(lambda text: self._on_file_appended(ed, text))
+            watcher.rewritten.connect(lambda: self._on_file_rewritten(ed))
+        watcher.watch(path, getattr(ed, 'encoding', None), size, tail)
+
+    def _on_file_appended(self, ed, text):
+        if getattr(ed, 'unsaved_changes', False):
+            self._on_file_rewritten(ed)
+            return
+        with QSignalBlocker(ed):
+            ed.SendScintilla(QsciScintillaBase.SCI_SETUNDOCOLLECTION, 0)
+            try:
+                ed.append_text(text)
+            finally:
+                ed.SendScintilla(QsciScintillaBase.SCI_SETUNDOCOLLECTION, 1)
+        ed.adjust_scroll_bar_policy()
+        if ed.follow_tail:
+            ed.SendScintilla(QsciScintillaBase.SCI_DOCUMENTEND)
+        if ed is self.currentEditor():
+            self.updateStatusBar(after_save=True)
+
+    def _on_file_rewritten(self, ed):
+        path = getattr(ed, 'file_path', None)
+        if not path:
+            return
+        name = os.path.basename(path)
+        if getattr(ed, 'unsaved_changes', False):
+            reply = QMessageBox.question(self, "File Changed", f"{name} has changed on disk. Reload it and discard your changes?",
+                                         QMessageBox.Yes | QMessageBox.No, QMessageBox.No)
+            if reply != QMessageBox.Yes:
+                self._watch_file(ed)
+                return
+        encoding = getattr(ed, 'encoding', None) or 'utf-8'
+        try:
+            if os.path.getsize(path) > self._large_file_threshold():
+                self._start_file_load(ed, path, encoding, getattr(ed, 'newline', None))
+                return
+            with open(path, 'rb') as f:
+                raw = f.read()
+        except OSError as e:
+            self.statusBar.showMessage(f"Failed to reload {name}: {e}", 5000)
+            return
+        if codecs.lookup(encoding).name in ('utf-8', 'utf-8-sig'):
+            data = raw[len(codecs.BOM_UTF8):] if raw.startswith(codecs.BOM_UTF8) else raw
+            if not data.isascii():
+                try:
+                    data.decode('utf-8')
+                except UnicodeDecodeError:
+                    data = data.decode('utf-8', errors='replace').encode('utf-8')
+        else:
+            data = raw.decode(encoding, errors='replace').encode('utf-8')
+        first_line = ed.firstVisibleLine()
+        changed = ed.sync_bytes(data)
+        del data
+        if ed.follow_tail:
+            ed.SendScintilla(QsciScintillaBase.SCI_DOCUMENTEND)
+        else:
+            ed.setFirstVisibleLine(first_line)
+        ed.discard_journal()
+        setattr(ed, 'unsaved_changes', False)
+        self._watch_file(ed, len(raw), raw[-FileWatcher.tail_size:])
+        if ed is self.currentEditor():
+            self.updateStatusBar(after_save=True)
+        if changed:
+            self.statusBar.showMessage(f"Reloaded {name} from disk", 3000)
+
+    def toggleFollowTail(self, checked):
+        ed = self.currentEditor()
+        if not isinstance(ed, Editor):
+            return
+        ed.follow_tail = checked
+        if checked:
+            ed.SendScintilla(QsciScintillaBase.SCI_DOCUMENTEND)
+
+    def _on_file_save_failed(self, ed, encoding, error, encoding_error, wait):
+        if ed is self.currentEditor():
+            self.updateStatusBar()
+        if encoding_error:
+            if not wait:
+                self.tabWidget.setCurrentWidget(ed)
+                self.promptForEncoding(None)
+            return
+        QMessageBox.warning(self, "Error", f"Failed to save file with encoding '{encoding}': {error}")
+
+    def saveFileAs(self, content=None, wait=False):
         options = QFileDialog.Options()
         try:
             file_name, _ = QFileDialog.getSaveFileName(self, "Save File As", "", "Text Files (*.txt);;All Files (*)", options=options)
@@ -2012,15 +5766,17 @@ class Construct(QMainWindow):
                 ed = self.currentEditor()
                 if not ed:
                     return False
+                if getattr(ed, 'large_document', None) is not None:
+                    QMessageBox.information(self, "Large File", "Large files are opened read-only and cannot be saved.")
+                    return False
                 setattr(ed, 'file_path', file_name)
-                self._applySavedSyntaxOrDetect(file_name)
-                if content is None:
-                    content = ed.toPlainText()
+                setattr(ed, 'compression', compression_for_extension(file_name))
+                self._applySavedSyntaxOrDetect(file_name, ed)
                 enc = getattr(ed, 'encoding', None) or 'utf-8'
                 idx = self.tabWidget.indexOf(ed)
                 if idx != -1:
                     self.tabWidget.setTabText(idx, os.path.basename(file_name))
-                return self.saveFileWithEncoding(content, enc)
+                return self.saveFileWithEncoding(content, enc, wait)
             return False
         except Exception as e:
             QMessageBox.warning(self, "Error", f"Failed to save file: {e}")
@@ -2037,8 +5793,9 @@ class Construct(QMainWindow):
             self.column = cursor.columnNumber() + 1
         except Exception:
             self.line, self.column = 1, 1
+        doc = getattr(ed, 'large_document', None)
         try:
-            self.char_count = ed.length()
+            self.char_count = doc.size if doc is not None else ed.length()
         except Exception:
             try:
                 self.char_count = ed.textLength()
@@ -2047,7 +5804,14 @@ class Construct(QMainWindow):
         unsaved = getattr(ed, 'unsaved_changes', False)
         encoding = getattr(ed, 'encoding', 'UTF-8')
         asterisk = "" if after_save else ("*" if unsaved else "")
-        self.statusBar.showMessage(f"Line: {self.line} | Column: {self.column} | Characters: {self.char_count} | Encoding: {encoding.upper()} {asterisk}")
+        indexing = ""
+        if doc is not None and not doc.index.complete:
+            indexing = f" | Indexing: {doc.index.size * 100 // max(1, doc.size)}%"
+        try:
+            self.line_count = self._total_lines(ed)
+        except Exception:
+            self.line_count = 0
+        self.statusBar.showMessage(f"Line: {self.line} | Column: {self.column} | Lines: {self.line_count} | Characters: {self.char_count}{indexing} | Encoding: {encoding.upper()} {asterisk}")
     def loadRecentFiles(self):
         self.settings = QSettings("Construct", "ConstructApp")
         self.recent_files = self.settings.value("recentFiles", [], type=list)
@@ -2093,24 +5857,7 @@ class Construct(QMainWindow):
 
     def openRecentFile(self, file_path):
         if os.path.exists(file_path):
-            ed = self.currentEditor()
-            reuse = False
-            if ed is not None:
-                idx = self.tabWidget.indexOf(ed)
-                try:
-                    title = self.tabWidget.tabText(idx) if idx != -1 else ""
-                except Exception:
-                    title = ""
-                is_untitled = (title.strip().lower() == 'untitled') and not getattr(ed, 'file_path', None)
-                try:
-                    empty = not bool(ed.text())
-                except Exception:
-                    empty = True
-                reuse = is_untitled and empty
-            if not reuse:
-                ed = Editor(self)
-                ed.setEolMode(QsciScintilla.EolWindows)
-                self._attach_editor(ed, os.path.basename(file_path))
+            ed = self._editor_for_open(os.path.basename(file_path))
             self._start_file_load(ed, file_path)
         else:
             QMessageBox.warning(self, "File Not Found", f"File not found: {file_path}")
@@ -2119,6 +5866,110 @@ class Construct(QMainWindow):
                 self.settings.setValue("recentFiles", self.recent_files)
                 self.updateRecentFilesMenu()
                 
+    def _session_entry(self, ed):
+        entry = getattr(ed, 'session_entry', None)
+        if entry is not None:
+            return entry
+        path = getattr(ed, 'file_path', None)
+        if not path:
+            return None
+        if ed.hibernated is not None:
+            (line, index), first_line = ed.hibernated.cursor, ed.hibernated.first_line
+        else:
+            line, index = ed.getCursorPosition()
+            first_line = ed.firstVisibleLine()
+            if ed.large_document is not None:
+                line += ed.window_start
+                first_line += ed.window_start
+        entry = {"path": path, "line": line, "index": index, "first_line": first_line,
+                 "language": LEXERS.name_of(ed.lexer()),
+                 "encoding": getattr(ed, 'encoding', None), "newline": getattr(ed, 'newline', None)}
+        try:
+            st = os.stat(path)
+            entry["mtime"], entry["size"] = st.st_mtime_ns, st.st_size
+        except OSError:
+            pass
+        return entry
+
+    def saveSession(self):
+        if not self.session_enabled:
+            return
+        entries = []
+        current = 0
+        for i in range(self.tabWidget.count()):
+            ed = self.tabWidget.widget(i)
+            entry = self._session_entry(ed) if isinstance(ed, Editor) else None
+            if entry is None:
+                continue
+            if ed is self.currentEditor():
+                current = len(entries)
+            entries.append(entry)
+        self.settings.setValue("session/tabs", json.dumps(entries))
+        self.settings.setValue("session/current", current)
+
+    def restoreSession(self):
+        self.session_enabled = True
+        if not self.settings.value("session/restore", True, type=bool):
+            return
+        try:
+            entries = json.loads(self.settings.value("session/tabs", "", type=str) or "[]")
+        except ValueError:
+            return
+        entries = [e for e in entries if isinstance(e, dict) and os.path.isfile(e.get("path") or "")]
+        if not entries:
+            return
+        current = min(max(0, self.settings.value("session/current", 0, type=int)), len(entries) - 1)
+        placeholder = self.currentEditor()
+        if placeholder is not None and (getattr(placeholder, 'file_path', None) or placeholder.length()):
+            placeholder = None
+        self._restoring_session = True
+        try:
+            editors = []
+            for entry in entries:
+                ed = self.editorPool.take()
+                self._attach_editor(ed, os.path.basename(entry["path"]))
+                setattr(ed, 'file_path', entry["path"])
+                setattr(ed, 'session_entry', entry)
+                editors.append(ed)
+            if placeholder is not None:
+                self.tabWidget.removeTab(self.tabWidget.indexOf(placeholder))
+                placeholder.deleteLater()
+        finally:
+            self._restoring_session = False
+        if self.currentEditor() is editors[current]:
+            self._on_tab_changed(self.tabWidget.currentIndex())
+        else:
+            self.tabWidget.setCurrentWidget(editors[current])
+
+    def _load_session_tab(self, ed):
+        entry = ed.session_entry
+        setattr(ed, 'session_entry', None)
+        path = entry["path"]
+        encoding = newline = None
+        try:
+            st = os.stat(path)
+            if st.st_mtime_ns == entry.get("mtime") and st.st_size == entry.get("size"):
+                encoding, newline = entry.get("encoding"), entry.get("newline")
+        except OSError:
+            pass
+        setattr(ed, 'pending_view', (entry.get("line", 0), entry.get("index", 0), entry.get("first_line", 0), entry.get("language")))
+        self._start_file_load(ed, path, encoding, newline)
+        if ed.large_document is not None:
+            setattr(ed, 'pending_view', None)
+            ed.go_to_line(entry.get("line", 0))
+
+    def _apply_pending_view(self, ed):
+        view = getattr(ed, 'pending_view', None)
+        if view is None:
+            return
+        setattr(ed, 'pending_view', None)
+        line, index, first_line, language = view
+        if language and language != LEXERS.name_of(ed.lexer()) and (language == "Plain Text" or language in LEXERS.languages):
+            self._set_editor_lexer(ed, LEXERS.languages.get(language))
+        if line is not None:
+            ed.setCursorPosition(min(line, ed.lines() - 1), index)
+            ed.setFirstVisibleLine(first_line)
+
     def clearRecentFiles(self):
         self.recent_files = []
         self.settings.setValue("recentFiles", self.recent_files)
@@ -2127,11 +5978,24 @@ class Construct(QMainWindow):
 
 
 if __name__ == '__main__':
+    STARTUP_PROFILER.enabled = '--profile-startup' in sys.argv
+    STARTUP_PROFILER.mark("imports")
+    new_window = '--new-window' in sys.argv
+    args = [a for a in sys.argv[1:] if a not in ('--profile-startup', '--new-window')]
+    entries = [parse_file_argument(a) for a in args]
+    server_name = instance_server_name()
+    if not new_window and forward_to_instance(server_name, entries):
+        sys.exit(0)
     app = QApplication(sys.argv)
+    STARTUP_PROFILER.mark("QApplication")
     loadStyle()
-    file_to_open = None
-    if len(sys.argv) > 1:
-        file_to_open = sys.argv[1]
-    construct = Construct(file_to_open)
+    STARTUP_PROFILER.mark("loadStyle")
+    construct = Construct()
+    if not new_window:
+        construct.listen_for_instances(server_name)
+        construct.restoreSession()
+        construct.recoverJournals()
+    construct.open_files(entries)
     construct.show()
+    STARTUP_PROFILER.mark("show")
     sys.exit(app.exec_())